@@ -0,0 +1,159 @@
+"""Adaptive per-host concurrency limits (AIMD) with Retry-After support.
+
+Each host gets its own limit on in-flight requests. The limit grows by
+about one slot per round trip while responses stay fast and successful
+(additive increase) and is halved when the host answers 429/5xx, times
+out or slows down sharply (multiplicative decrease). Latency is the time to
+the response headers, so a busy client reading bodies or parsing pages is
+not mistaken for a congested host. A Retry-After header
+pauses every request to that host until the given time.
+
+The same controller gates the thread pool (blocking acquire) and the
+asyncio engine (try_acquire plus a change listener).
+"""
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+
+# Responses that mean "slow down"; 429 and 503 may carry Retry-After
+BACKOFF_STATUSES = {429, 500, 502, 503, 504}
+THROTTLE_STATUSES = {429, 503}
+
+
+def parse_retry_after(value, max_delay=300):
+    """Return the delay in seconds from a Retry-After header, or None."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            delay = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError, IndexError, OverflowError):
+            return None
+    return min(max(delay, 0.0), max_delay)
+
+
+class _HostState:
+    def __init__(self, limit):
+        self.limit = float(limit)
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.baseline = None  # fastest healthy latency seen
+        self.smoothed = None  # EWMA of latency
+        self.last_decrease = 0.0
+
+
+class AdaptiveConcurrency:
+    """AIMD limit on concurrent requests per host."""
+
+    def __init__(self, initial=5, minimum=1, maximum=32, increase=1.0, decrease=0.5,
+                 latency_tolerance=3.0, min_slowdown=0.05, smoothing=0.2):
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        # Congestion is a smoothed latency above latency_tolerance x the host's
+        # baseline and at least min_slowdown seconds above it, so scheduling
+        # jitter on a fast host does not count
+        self.latency_tolerance = latency_tolerance
+        self.min_slowdown = min_slowdown
+        self.smoothing = smoothing
+        self._hosts = {}
+        self._condition = threading.Condition()
+        self._listeners = []
+
+    def _state(self, host):
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(min(max(self.initial, self.minimum), self.maximum))
+        return state
+
+    def add_listener(self, callback):
+        """Call callback() whenever a slot may have become free."""
+        with self._condition:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        with self._condition:
+            self._listeners.remove(callback)
+
+    def try_acquire(self, host):
+        """Take a slot for host and return 0, or return how long to wait.
+
+        The wait is the remaining Retry-After pause, or None when the host
+        is at its limit and the caller should wait for a release.
+        """
+        with self._condition:
+            state = self._state(host)
+            pause = state.paused_until - time.monotonic()
+            if pause > 0:
+                return pause
+            if state.in_flight >= int(state.limit):
+                return None
+            state.in_flight += 1
+            return 0
+
+    def acquire(self, host):
+        """Block the calling thread until a slot for host is free."""
+        with self._condition:
+            while True:
+                wait = self.try_acquire(host)
+                if wait == 0:
+                    return
+                self._condition.wait(wait)
+
+    def release(self, host, latency, ok=True, retry_after=None):
+        """Return a slot and adjust the host's limit from the outcome.
+
+        latency is the time to first byte; ok is False for failed requests
+        and "slow down" responses; retry_after (seconds) pauses the host.
+        """
+        with self._condition:
+            state = self._state(host)
+            state.in_flight = max(0, state.in_flight - 1)
+            now = time.monotonic()
+            if retry_after:
+                state.paused_until = max(state.paused_until, now + retry_after)
+
+            if ok and latency is not None:
+                state.smoothed = (latency if state.smoothed is None else
+                                  state.smoothed + self.smoothing * (latency - state.smoothed))
+                if state.baseline is None or latency < state.baseline:
+                    state.baseline = latency
+                congested = state.smoothed > max(self.latency_tolerance * state.baseline,
+                                                 state.baseline + self.min_slowdown)
+            else:
+                congested = True
+
+            if congested:
+                # One decrease per round trip, so a burst of failures from
+                # requests sent at the same limit only halves it once
+                cooldown = state.smoothed or 1.0
+                if now - state.last_decrease >= cooldown:
+                    factor = self.decrease if not ok else (1 + self.decrease) / 2
+                    state.limit = max(self.minimum, state.limit * factor)
+                    state.last_decrease = now
+            else:
+                state.limit = min(self.maximum, state.limit + self.increase / state.limit)
+
+            self._condition.notify_all()
+            listeners = list(self._listeners)
+        for callback in listeners:
+            callback()
+
+    def limit(self, host=None):
+        """Current limit for host, or the sum over all hosts seen so far."""
+        with self._condition:
+            if host is not None:
+                return int(self._state(host).limit)
+            if not self._hosts:
+                return self.initial
+            return sum(int(state.limit) for state in self._hosts.values())
+
+    def in_flight(self):
+        with self._condition:
+            return sum(state.in_flight for state in self._hosts.values())
@@ -0,0 +1,258 @@
+"""Optional asyncio fetch engine for BursaryReportGenerator.
+
+Requires aiohttp. When it is not installed the generator falls back to the
+thread-pool path built on the shared requests.Session.
+"""
+import asyncio
+import concurrent.futures
+import importlib.util
+import logging
+import time
+from urllib.parse import urlparse
+
+from adaptive_concurrency import BACKOFF_STATUSES, parse_retry_after
+
+# aiohttp is optional and slow to import, so it is loaded on the first run()
+aiohttp = None
+
+
+def _load_aiohttp():
+    global aiohttp
+    if aiohttp is None:
+        import aiohttp as module
+        aiohttp = module
+    return aiohttp
+
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Marks the end of a streamed URL iterator
+_END = object()
+
+
+class HostRateLimiter:
+    """Spaces requests so each host sees at most `rate` requests per second."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0
+        self._next_slot = {}
+        self._lock = asyncio.Lock()
+
+    async def wait(self, host):
+        if not self.interval:
+            return
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class AsyncFetcher:
+    """Fetch many pages concurrently over a pooled keep-alive connector."""
+
+    def __init__(self, headers, concurrency=20, per_host_limit=10, rate_limit=None,
+                 timeout=10, retries=3, backoff_factor=1, metrics=None, controller=None,
+                 make_reader=None):
+        self.headers = headers
+        self.concurrency = concurrency
+        self.per_host_limit = per_host_limit
+        self.rate_limit = rate_limit
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        # Optional crawl_metrics.CrawlMetrics receiving DNS/connect/TTFB/body timings
+        self.metrics = metrics
+        # Optional adaptive_concurrency.AdaptiveConcurrency gating each attempt per host;
+        # `concurrency` then only caps the connection pool
+        self.controller = controller
+        # Optional make_reader(content_type, charset) returning a page_stream.PageReader,
+        # or None to skip the body; without it bodies are read whole
+        self.make_reader = make_reader
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def available():
+        return aiohttp is not None or importlib.util.find_spec('aiohttp') is not None
+
+    def run(self, urls, handler, request_headers=None):
+        """Fetch every URL and call handler(url, fetched) for each one.
+
+        fetched is a (status, text, headers, stopped) tuple, or None if the
+        fetch failed. stopped is None for a complete body, else why a
+        make_reader reader stopped early (see page_stream.PageBody).
+
+        request_headers, if given, maps a URL to extra headers for that
+        request (e.g. conditional validators); it may block, e.g. on a cache
+        server, so it runs on a thread pool of its own. The handler runs in
+        the event loop's default executor so parsing never blocks downloads.
+        urls may be a generator that blocks while discovering more URLs; it
+        is advanced on an executor thread and each URL is fetched as soon as
+        it is yielded.
+        """
+        _load_aiohttp()
+        asyncio.run(self._run(urls, handler, request_headers))
+
+    async def _run(self, urls, handler, request_headers):
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        limiter = HostRateLimiter(self.rate_limit)
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrency,
+            limit_per_host=self.per_host_limit,
+            keepalive_timeout=30
+        )
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        trace_configs = [self._trace_config()] if self.metrics else None
+
+        # Header lookups get their own threads so they never queue behind parsing
+        lookups = (concurrent.futures.ThreadPoolExecutor(max_workers=self.concurrency)
+                   if request_headers else None)
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                         headers=self.headers,
+                                         trace_configs=trace_configs) as session:
+            async def worker(url):
+                extra = None
+                if request_headers:
+                    extra = await loop.run_in_executor(lookups, request_headers, url)
+                async with semaphore:
+                    fetched = await self._fetch(session, limiter, url, extra)
+                await loop.run_in_executor(None, handler, url, fetched)
+
+            try:
+                if isinstance(urls, (list, tuple, dict)):
+                    await asyncio.gather(*(worker(url) for url in urls))
+                    return
+                iterator, workers = iter(urls), []
+                while True:
+                    url = await loop.run_in_executor(None, next, iterator, _END)
+                    if url is _END:
+                        break
+                    workers.append(asyncio.ensure_future(worker(url)))
+                await asyncio.gather(*workers)
+            finally:
+                if lookups:
+                    lookups.shutdown(wait=False)
+
+    def _trace_config(self):
+        """aiohttp trace hooks reporting DNS and connection setup time."""
+        metrics = self.metrics
+        trace = aiohttp.TraceConfig()
+
+        async def dns_start(session, context, params):
+            context.dns_start = time.perf_counter()
+
+        async def dns_end(session, context, params):
+            metrics.observe('dns', time.perf_counter() - context.dns_start)
+
+        async def connect_start(session, context, params):
+            context.connect_start = time.perf_counter()
+
+        async def connect_end(session, context, params):
+            metrics.observe('connect', time.perf_counter() - context.connect_start)
+            metrics.increment('connections_opened')
+
+        trace.on_dns_resolvehost_start.append(dns_start)
+        trace.on_dns_resolvehost_end.append(dns_end)
+        trace.on_connection_create_start.append(connect_start)
+        trace.on_connection_create_end.append(connect_end)
+        return trace
+
+    async def _acquire(self, host):
+        """Wait for an adaptive concurrency slot for host."""
+        loop = asyncio.get_running_loop()
+        changed = asyncio.Event()
+
+        def notify():
+            loop.call_soon_threadsafe(changed.set)
+
+        self.controller.add_listener(notify)
+        try:
+            while True:
+                changed.clear()
+                wait = self.controller.try_acquire(host)
+                if wait == 0:
+                    return
+                try:
+                    await asyncio.wait_for(changed.wait(), wait or 1.0)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self.controller.remove_listener(notify)
+
+    async def _fetch(self, session, limiter, url, extra_headers=None):
+        """Fetch a single page, retrying 429/5xx responses and connection errors.
+
+        A Retry-After header on a retried response replaces the exponential
+        backoff delay.
+        """
+        host = urlparse(url).netloc
+        start = time.perf_counter()
+        for attempt in range(self.retries + 1):
+            if self.controller:
+                await self._acquire(host)
+            await limiter.wait(host)
+            sent = time.perf_counter()
+            status, retry_after, error, result, ttfb = None, None, None, None, None
+            try:
+                async with session.get(url, headers=extra_headers) as response:
+                    ttfb = time.perf_counter() - sent
+                    status = response.status
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                    if status in RETRY_STATUSES and attempt < self.retries:
+                        error = f"HTTP {status}"
+                    elif status >= 400:
+                        self._count(f'http_status_{status}')
+                        self.logger.error(f"Error fetching {url}: HTTP {status}")
+                    else:
+                        headers_at = sent + ttfb
+                        text, stopped = await self._read_body(response)
+                        if self.metrics:
+                            done = time.perf_counter()
+                            self.metrics.observe('fetch', done - start)
+                            self.metrics.observe('ttfb', ttfb)
+                            self.metrics.observe('body', done - headers_at)
+                            self.metrics.increment('body_bytes', response.content.total_bytes)
+                            self.metrics.increment('http_requests')
+                            self.metrics.increment(f'http_status_{status}')
+                        result = status, text, response.headers, stopped
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = e
+            finally:
+                if self.controller:
+                    ok = status is not None and status not in BACKOFF_STATUSES
+                    self.controller.release(host, ttfb, ok, retry_after)
+
+            if error is None:
+                return result
+            if attempt < self.retries:
+                # The slot is released first, so other requests can use it while we back off
+                self._count('http_retries')
+                await asyncio.sleep(retry_after if retry_after is not None
+                                    else self.backoff_factor * (2 ** attempt))
+                continue
+            self._count('fetch_errors')
+            self.logger.error(f"Error fetching {url}: {error}")
+            return None
+        return None
+
+    async def _read_body(self, response):
+        """(text, stopped) for a response, streamed through make_reader if set."""
+        if response.status == 304:
+            return '', None
+        if not self.make_reader or response.status != 200:
+            return await response.text(), None
+        reader = self.make_reader(response.headers.get('Content-Type'), response.charset)
+        if reader is None:
+            return None, 'not_html'
+        async for chunk in response.content.iter_chunked(16384):
+            if not reader.feed(chunk):
+                break
+        return reader.finish()
+
+    def _count(self, name):
+        if self.metrics:
+            self.metrics.increment(name)
@@ -0,0 +1,157 @@
+"""Benchmark near-duplicate detection against exact-name dedup and all-pairs comparison.
+
+Builds synthetic bursaries in which some are re-listed under a variant name
+and lightly edited requirements (true duplicates) and some distinct
+programmes share a name. A labelled negative set adds programmes from
+different companies with identical boilerplate requirements and closing
+dates, which must never be merged. Reports time, pair precision/recall and
+false merges of the negative set for MinHash with LSH, for comparing the
+shingles of every pair, and for the old exact-name dedup. --check exits
+non-zero if MinHash with LSH merges any negative pair.
+
+    python benchmarks/bench_duplicates.py [--records 1000 10000] [--check]
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from near_duplicates import (  # noqa: E402
+    NearDuplicateDetector, identity_keys, jaccard, record_text, same_programme, shingles
+)
+
+
+WORDS = ('applicants must be south african citizens with a matric pass of at least seventy '
+         'percent in mathematics and physical science registered full time at a public '
+         'university studying engineering accounting law medicine computer science mining '
+         'financial need proven academic record work back agreement province rural').split()
+COMPANIES = ['Eskom', 'Sasol', 'Transnet', 'Anglo American', 'Old Mutual', 'Nedbank', 'Absa',
+             'Denel', 'Harmony', 'Telkom', 'Vodacom', 'Investec', 'Sanral', 'CSIR', 'Exxaro']
+DISCIPLINES = ['Engineering', 'Accounting', 'Law', 'Medicine', 'Mining', 'Computer Science']
+BOILERPLATE = ("Requirements:\n• Applicants must be South African citizens\n"
+               "• A matric pass with at least 70% in Mathematics and Physical Science\n"
+               "• Registered full time at a public university\n"
+               "• Proven financial need and a good academic record\n"
+               "• Willing to sign a work-back agreement")
+
+
+def boilerplate_records(count):
+    """Distinct programmes sharing requirements and closing date: all pairs are negatives."""
+    records = []
+    for i in range(count):
+        company = COMPANIES[i % len(COMPANIES)]
+        discipline = DISCIPLINES[i // len(COMPANIES) % len(DISCIPLINES)]
+        batch = i // (len(COMPANIES) * len(DISCIPLINES))
+        slug = f"{company}-{discipline}-bursary-{batch}".lower().replace(' ', '-')
+        records.append({'name': f"{company} {discipline} Bursary {batch}",
+                        'url': f"https://example.invalid/{slug}/",
+                        'closing_date': "31 March 2026", 'details': BOILERPLATE})
+    return records
+
+
+def synthetic_records(count, duplicate_share=0.1, shared_name_share=0.05, boilerplate_share=0.05,
+                      seed=1):
+    """Records, the set of true duplicate URL pairs, and the labelled negative pairs."""
+    rng = random.Random(seed)
+    records, copies = [], {}
+    for i in range(count):
+        bullets = [' '.join(rng.sample(WORDS, rng.randint(8, 14))) for _ in range(rng.randint(4, 7))]
+        name = f"{rng.choice(COMPANIES)} Bursary Programme {i}"
+        if records and rng.random() < shared_name_share:
+            # A different programme that happens to share a name
+            name = rng.choice(records)['name']
+        records.append({'name': name, 'url': f"https://example.invalid/bursary-{i}/",
+                        'closing_date': f"{rng.randint(1, 28)} March 2026",
+                        'details': "Requirements:\n• " + "\n• ".join(bullets)})
+    for i in range(int(count * duplicate_share)):
+        original = rng.choice(records[:count])
+        bullets = original['details'].split('\n• ')
+        words = bullets[-1].split()
+        words[rng.randrange(len(words))] = rng.choice(WORDS)
+        bullets[-1] = ' '.join(words)
+        url = f"https://example.invalid/bursary-{count + i}-apply-now/"
+        records.append({'name': original['name'] + ' 2026', 'url': url,
+                        'closing_date': original['closing_date'], 'details': '\n• '.join(bullets)})
+        copies.setdefault(original['url'], [original['url']]).append(url)
+    truth = {frozenset(pair) for urls in copies.values() for pair in itertools.combinations(urls, 2)}
+    boilerplate = boilerplate_records(int(count * boilerplate_share))
+    negatives = {frozenset((a['url'], b['url'])) for a, b in itertools.combinations(boilerplate, 2)}
+    records.extend(boilerplate)
+    rng.shuffle(records)
+    return records, truth, negatives
+
+
+def pairs_from_clusters(records, clusters):
+    return {frozenset((records[i]['url'], records[j]['url']))
+            for members in clusters for i, j in itertools.combinations(members, 2)}
+
+
+def all_pairs(records, detector):
+    """Compare every pair: the quadratic approach LSH avoids."""
+    sets = [shingles(record_text(r), detector.shingle_size) for r in records]
+    keys = [identity_keys(r) for r in records]
+    found = set()
+    for i, j in itertools.combinations(range(len(records)), 2):
+        if (records[i]['closing_date'] == records[j]['closing_date']
+                and same_programme(keys[i], keys[j])
+                and jaccard(sets[i], sets[j]) >= detector.threshold):
+            found.add(frozenset((records[i]['url'], records[j]['url'])))
+    return found
+
+
+def by_name(records):
+    groups = {}
+    for record in records:
+        groups.setdefault(record['name'], []).append(record['url'])
+    return {frozenset(pair) for urls in groups.values() for pair in itertools.combinations(urls, 2)}
+
+
+def score(found, truth):
+    hits = len(found & truth)
+    precision = hits / len(found) if found else 1.0
+    recall = hits / len(truth) if truth else 1.0
+    return precision, recall
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--records', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--all-pairs-limit', type=int, default=3000,
+                        help='skip the quadratic comparison above this many records')
+    parser.add_argument('--check', action='store_true',
+                        help='exit non-zero if minhash + lsh merges any labelled negative pair')
+    args = parser.parse_args(argv)
+
+    detector = NearDuplicateDetector()
+    false_merges = 0
+    print(f"{'method':<14} {'records':>8} {'seconds':>8} {'precision':>10} {'recall':>7} "
+          f"{'false merges':>13}")
+    for count in args.records:
+        records, truth, negatives = synthetic_records(count)
+        methods = [
+            ('minhash + lsh', lambda: pairs_from_clusters(records, detector.clusters(records))),
+            ('exact name', lambda: by_name(records)),
+        ]
+        if len(records) <= args.all_pairs_limit:
+            methods.append(('all pairs', lambda: all_pairs(records, detector)))
+        for label, method in methods:
+            start = time.perf_counter()
+            found = method()
+            elapsed = time.perf_counter() - start
+            precision, recall = score(found, truth)
+            merged = len(found & negatives)
+            if label == 'minhash + lsh':
+                false_merges += merged
+            print(f"{label:<14} {len(records):>8} {elapsed:>8.2f} {precision:>10.3f} {recall:>7.3f} "
+                  f"{merged:>13}")
+    if args.check and false_merges:
+        print(f"FAIL: {false_merges} labelled negative pairs merged")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
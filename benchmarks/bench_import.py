@@ -0,0 +1,70 @@
+"""Benchmark start-up: import time of the entry points and what they load.
+
+Imports each module in a fresh interpreter (best of --repeat runs) and
+reports the milliseconds spent. Fails if the cached-query path (cli) loads
+a heavy dependency or takes longer than --budget-ms, or if importing the
+crawler loads ReportLab or aiohttp before they are needed.
+
+    python benchmarks/bench_import.py [--repeat 5] [--budget-ms 100]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY = ('reportlab', 'bs4', 'lxml', 'requests', 'rich', 'aiohttp')
+
+# module -> heavy packages it must not import
+GUARDS = {
+    'cli': HEAVY,
+    'bursary_checker': ('reportlab', 'aiohttp'),
+    'service': ('reportlab', 'aiohttp'),
+}
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps([elapsed, sorted({{name.split('.')[0] for name in sys.modules}})]))
+"""
+
+
+def measure(module, repeat):
+    """Best import time in ms and the top-level packages loaded by the import."""
+    best, loaded = None, []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', PROBE.format(module=module)],
+                                cwd=ROOT, capture_output=True, text=True, check=True).stdout
+        elapsed, loaded = json.loads(output)
+        best = elapsed if best is None else min(best, elapsed)
+    return best, loaded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=100,
+                        help='import time allowed for the cli module')
+    args = parser.parse_args(argv)
+
+    failures = []
+    print(f"{'module':<18} {'import ms':>10}  heavy dependencies loaded")
+    for module, forbidden in GUARDS.items():
+        elapsed, loaded = measure(module, args.repeat)
+        heavy = [name for name in HEAVY if name in loaded]
+        print(f"{module:<18} {elapsed:>10.1f}  {', '.join(heavy) or '-'}")
+        failures += [f"{module} imports {name}" for name in forbidden if name in loaded]
+        if module == 'cli' and elapsed > args.budget_ms:
+            failures.append(f"cli import took {elapsed:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""Benchmark compound queries: BursaryIndex against a linear scan.
+
+Builds synthetic records spread over the fields, then runs a few typical
+queries both ways, checks the answers agree and reports milliseconds per
+query.
+
+    python benchmarks/bench_index.py [--records 10000 100000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fields import FIELDS  # noqa: E402
+from closing_dates import closing_date_to_date  # noqa: E402
+from record_index import BursaryIndex, tokenize  # noqa: E402
+
+
+WORDS = ['matric', 'engineering', 'citizen', 'financial', 'need', 'academic', 'merit',
+         'postgraduate', 'honours', 'masters', 'mining', 'science', 'average', 'province']
+
+
+def synthetic_records(count, seed=1):
+    rng = random.Random(seed)
+    today = date.today()
+    records = []
+    for i in range(count):
+        deadline = today + timedelta(days=rng.randint(-60, 300))
+        closing = deadline.strftime('%d %B %Y') if i % 5 else 'Open all year round'
+        details = "Requirements:\n" + "\n".join(
+            f"• {' '.join(rng.sample(WORDS, 4))}" for _ in range(rng.randint(2, 6)))
+        records.append(({
+            'name': f"Bursary Programme {i} {rng.choice(WORDS).title()}",
+            'url': f"https://example.invalid/bursary-{i}/",
+            'status': 'Open' if i % 4 else 'Closed',
+            'closing_date': closing,
+            'details': details,
+        }, rng.sample(FIELDS, rng.randint(1, 3))))
+    return records
+
+
+def linear_query(records, fields=None, all_fields=False, status=None, within_days=None, text=None):
+    """The list-comprehension approach the index replaces."""
+    today = date.today()
+    end = today + timedelta(days=within_days) if within_days is not None else None
+    words = tokenize(text)
+    results = []
+    for record, record_fields in records:
+        if fields:
+            matched = [f in record_fields for f in fields]
+            if not (all(matched) if all_fields else any(matched)):
+                continue
+        if status and record['status'] != status:
+            continue
+        if words and not words <= tokenize(record['name']) | tokenize(record['details']):
+            continue
+        deadline = closing_date_to_date(record['closing_date'])
+        if end and (deadline is None or not today <= deadline <= end):
+            continue
+        results.append((deadline.toordinal() if deadline else float('inf'), record['name'], record))
+    results.sort(key=lambda item: item[:2])
+    return [record for _, _, record in results]
+
+
+QUERIES = [
+    ('open, closing in 14 days', dict(status='Open', within_days=14)),
+    ('engineering + postgraduate', dict(fields=['Engineering', 'Postgraduate'], all_fields=True)),
+    ('engineering, "matric merit"', dict(fields=['Engineering'], text='matric merit')),
+    ('open law, 30 days, "citizen"', dict(fields=['Law'], status='Open', within_days=30, text='citizen')),
+]
+
+
+def timed(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--records', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    for count in args.records:
+        records = synthetic_records(count)
+        start = time.perf_counter()
+        index = BursaryIndex()
+        for record, fields in records:
+            index.upsert(record, fields)
+        print(f"{count} records: index built in {time.perf_counter() - start:.2f}s")
+        print(f"  {'query':<30} {'matches':>8} {'scan ms':>9} {'index ms':>9}")
+        for label, query in QUERIES:
+            scan_ms, expected = timed(lambda: linear_query(records, **query), max(1, args.repeat // 10))
+            index_ms, found = timed(lambda: index.query(**query), args.repeat)
+            assert [r['url'] for r in found] == [r['url'] for r in expected], label
+            print(f"  {label:<30} {len(found):>8} {scan_ms:>9.2f} {index_ms:>9.3f}")
+
+
+if __name__ == '__main__':
+    main()
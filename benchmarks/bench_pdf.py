@@ -0,0 +1,145 @@
+"""Benchmark PDF rendering of large synthetic reports.
+
+Compares the block-streamed builder in pdf_report with the old approach of
+one Table holding every row. Reports wall time and peak traced memory.
+
+With --batch FIELDS it instead renders a batch like generate_batch_report:
+one report per field, each bursary listed under two fields, plus the
+combined report. The batch is built one report at a time, with a shared
+ParagraphCache, and by build_pdf_reports with each --workers count.
+
+    python benchmarks/bench_pdf.py [--rows 1000 10000] [--legacy-max-rows 2000]
+    python benchmarks/bench_pdf.py --batch 15 --rows 3000 --workers 1 2 4
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.lib.pagesizes import letter  # noqa: E402
+from reportlab.lib.units import inch  # noqa: E402
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Table  # noqa: E402
+
+from pdf_report import (  # noqa: E402
+    COLUMN_WIDTHS, HEADER_ROW, TABLE_STYLE, ParagraphCache, build_pdf_report, build_pdf_reports,
+    bursary_cells, report_styles, unique_by_url
+)
+from renderers import report_row  # noqa: E402
+
+
+def synthetic_bursaries(count):
+    details = "Requirements:\n" + "\n".join(
+        f"• Requirement {n} for South African applicants" for n in range(4)
+    )
+    return [{
+        'name': f"Synthetic Bursary Programme {i}",
+        'url': f"https://example.invalid/bursary-{i}/",
+        'status': 'Open',
+        'closing_date': f"{i % 28 + 1} March 2026",
+        'details': details,
+        'last_updated': datetime.now(),
+    } for i in range(count)]
+
+
+def build_single_table(filename, title, bursaries):
+    """The previous builder: one Table with a Paragraph for every cell."""
+    styles = report_styles()
+    doc = SimpleDocTemplate(filename, pagesize=letter, topMargin=0.5*inch)
+    data = [list(HEADER_ROW)]
+    for bursary in unique_by_url(bursaries):
+        data.append([Paragraph(cell, styles['normal']) for cell in bursary_cells(bursary)])
+    table = Table(data, repeatRows=1, colWidths=COLUMN_WIDTHS)
+    table.setStyle(TABLE_STYLE)
+    doc.build([Paragraph(title, styles['title']), Paragraph("<br/>", styles['normal']), table])
+
+
+def measure(build, bursaries, trace_memory=True):
+    """Time one build, then (tracemalloc being slow) trace a second for peak memory."""
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, 'report.pdf')
+        start = time.perf_counter()
+        build(filename, 'Benchmark Report', bursaries)
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(filename)
+
+        peak = None
+        if trace_memory:
+            tracemalloc.start()
+            build(filename, 'Benchmark Report', bursaries)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+    return elapsed, peak, size
+
+
+def batch_jobs(directory, fields, rows):
+    """(filename, title, rows) jobs for fields reports plus the combined one."""
+    bursaries = [report_row(b) for b in synthetic_bursaries(rows)]
+    per_field = [[] for _ in range(fields)]
+    for i, bursary in enumerate(bursaries):
+        per_field[i % fields].append(bursary)
+        per_field[(i * 7 + 3) % fields].append(bursary)
+    reports = per_field + [bursaries]
+    return [(os.path.join(directory, f"report-{n}.pdf"), f"Benchmark Report {n}", report)
+            for n, report in enumerate(reports)]
+
+
+def run_batch(fields, rows, workers):
+    print(f"{fields} field reports + combined, {rows} bursaries, {os.cpu_count()} cores")
+    print(f"{'mode':<16} {'seconds':>9} {'reports/s':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs = batch_jobs(tmp, fields, rows)
+
+        def one_by_one():
+            for filename, title, bursaries in jobs:
+                build_pdf_report(filename, title, bursaries)
+
+        def shared_cache():
+            cache = ParagraphCache()
+            for filename, title, bursaries in jobs:
+                build_pdf_report(filename, title, bursaries, cache=cache)
+
+        modes = [('one by one', one_by_one), ('shared cache', shared_cache)]
+        modes += [(f"pool of {n}", lambda n=n: build_pdf_reports(jobs, n)) for n in workers]
+        for label, build in modes:
+            start = time.perf_counter()
+            build()
+            elapsed = time.perf_counter() - start
+            print(f"{label:<16} {elapsed:>9.2f} {len(jobs) / elapsed:>10.1f}", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--legacy-max-rows', type=int, default=2000,
+                        help='skip the single-table builder above this many rows (0 = never run it)')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc pass')
+    parser.add_argument('--batch', type=int, metavar='FIELDS',
+                        help='render a batch of FIELDS field reports plus the combined one')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4],
+                        help='with --batch: process pool sizes to try')
+    args = parser.parse_args(argv)
+
+    if args.batch:
+        run_batch(args.batch, args.rows[0], args.workers)
+        return
+
+    print(f"{'builder':<16} {'rows':>7} {'seconds':>9} {'rows/s':>9} {'peak MB':>9} {'PDF KB':>8}")
+    for rows in args.rows:
+        bursaries = synthetic_bursaries(rows)
+        builders = [('streamed blocks', build_pdf_report)]
+        if rows <= args.legacy_max_rows:
+            builders.append(('single table', build_single_table))
+        for label, build in builders:
+            elapsed, peak, size = measure(build, bursaries, not args.no_memory)
+            peak_mb = f"{peak / 1e6:>9.1f}" if peak is not None else f"{'-':>9}"
+            print(f"{label:<16} {rows:>7} {elapsed:>9.2f} {rows / elapsed:>9.0f} "
+                  f"{peak_mb} {size / 1024:>8.0f}", flush=True)
+
+
+if __name__ == '__main__':
+    main()
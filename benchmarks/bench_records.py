@@ -0,0 +1,103 @@
+"""Benchmark record memory and bulk (de)serialization.
+
+Compares the old per-bursary dicts (pickled as a list, like the former
+bursary_data_cache.pkl) with BursaryRecord objects and the RecordColumns
+bulk form. Reports the traced memory of the records loaded back from their
+serialized form, the serialized size and dump/load time.
+
+    python benchmarks/bench_records.py [--records 10000 100000]
+"""
+import argparse
+import gc
+import os
+import pickle
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bursary_record import BursaryRecord, RecordColumns  # noqa: E402
+from page_parsing import format_requirements, requirement_bullets  # noqa: E402
+
+
+BULLETS = [
+    "Applicants must be South African citizens",
+    "Must have passed matric with a minimum of 60% in Mathematics",
+    "Must be registered for a full-time undergraduate degree",
+    "Proven financial need",
+    "Must not hold another bursary",
+    "Good academic record",
+    "Willing to sign a work-back agreement",
+] + [f"Must be studying towards a qualification in field {n}" for n in range(40)]
+
+
+def synthetic_dicts(count, seed=1):
+    """Records as the parser used to return them: fresh strings per page."""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    records = []
+    for i in range(count):
+        items = [''.join(list(b)) for b in rng.sample(BULLETS, rng.randint(2, 8))]
+        records.append({
+            'name': f"Bursary Programme {i}",
+            'url': f"https://www.zabursaries.co.za/bursary-programme-{i}/",
+            'status': ''.join(list(rng.choice(['Open', 'Closed']))),
+            'closing_date': (start + timedelta(days=rng.randint(0, 365))).strftime('%d %B %Y'),
+            'details': format_requirements(items),
+            'last_updated': datetime.now(),
+        })
+    return records
+
+
+def as_records(dicts):
+    return [BursaryRecord(d['name'], d['url'], d['status'], d['closing_date'],
+                          requirement_bullets(d['details'].split('\n• ')[1:]),
+                          d['last_updated'].timestamp())
+            for d in dicts]
+
+
+def traced(build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--records', type=int, nargs='+', default=[10000, 100000])
+    args = parser.parse_args(argv)
+
+    print(f"{'form':<16} {'records':>8} {'memory MB':>10} {'bytes MB':>9} {'dump ms':>8} {'load ms':>8}")
+    for count in args.records:
+        dicts = synthetic_dicts(count)
+        records = as_records(dicts)
+        columns = RecordColumns.from_records(records)
+        assert [dict(r) for r in columns] == [dict(r) for r in records]
+
+        forms = [
+            ('dicts + pickle', lambda: pickle.dumps(dicts), pickle.loads),
+            ('records+pickle', lambda: pickle.dumps(records), pickle.loads),
+            ('RecordColumns', columns.to_bytes, RecordColumns.from_bytes),
+        ]
+        for label, dump, load in forms:
+            data, dump_ms = timed(dump)
+            _, load_ms = timed(lambda: load(data))
+            _, memory = traced(lambda: load(data))
+            print(f"{label:<16} {count:>8} {memory / 1e6:>10.1f} {len(data) / 1e6:>9.2f} "
+                  f"{dump_ms:>8.0f} {load_ms:>8.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark requirement extraction against the old whole-document search.
+
+Pages come from the HTTP response cache (http_cache/*.html by default), so
+run the checker once first. If the cache is empty, synthetic pages are used.
+
+    python benchmarks/bench_requirements.py [--corpus http_cache] [--repeat 5]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from page_parsing import extract_requirement_items, parse_detail_page  # noqa: E402
+
+
+def legacy_requirement_items(soup):
+    """The previous lookup: the first tag whose full text mentions a term."""
+    requirements = []
+    req_section = soup.find(lambda tag: tag.name and
+                            any(term in tag.get_text().lower()
+                                for term in ['eligibility', 'requirements', 'criteria']))
+    if req_section:
+        for bullet in req_section.find_all(['li', 'p']):
+            text = bullet.get_text().strip()
+            if text and len(text) > 5:
+                requirements.append(text)
+    return requirements
+
+
+def synthetic_page(i, depth=12, paragraphs=150):
+    """A deeply nested page shaped like a typical WordPress bursary post.
+
+    Every other page has no requirements section, which is the worst case for
+    the old search: it calls get_text() on every tag in the document.
+    """
+    body = ''.join(f'<p>Paragraph {n} about bursary {i} and how to apply online.</p>'
+                   for n in range(paragraphs))
+    section = ''
+    if i % 2 == 0:
+        section = ('<h2>Eligibility Requirements</h2><ul>'
+                   + ''.join(f'<li>Requirement {n} for applicants</li>' for n in range(8))
+                   + '</ul>')
+    article = (f'<article><h1>Bursary {i}</h1>{body}{section}'
+               '<h2>How to Apply</h2><p>Apply online.</p></article>')
+    return ('<html><body>' + '<div class="wrap">' * depth + article
+            + '</div>' * depth + '</body></html>')
+
+
+def load_corpus(directory):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.html'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            pages.append(f.read())
+    return pages
+
+
+def time_extraction(extract, soups, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for soup in soups:
+            extract(soup)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus', default='http_cache', help='directory of cached .html pages')
+    parser.add_argument('--synthetic', type=int, default=50, help='synthetic pages if the corpus is empty')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--parser', default='auto', help='BeautifulSoup backend')
+    args = parser.parse_args(argv)
+
+    pages = load_corpus(args.corpus)
+    source = args.corpus
+    if not pages:
+        pages = [synthetic_page(i) for i in range(args.synthetic)]
+        source = 'synthetic'
+
+    soups = [parse_detail_page(page, args.parser) for page in pages]
+    legacy = time_extraction(legacy_requirement_items, soups, args.repeat)
+    current = time_extraction(extract_requirement_items, soups, args.repeat)
+
+    print(f"corpus: {source} ({len(pages)} pages)")
+    print(f"legacy search:  {legacy * 1000:9.1f} ms  ({legacy / len(pages) * 1000:.2f} ms/page)")
+    print(f"heading scan:   {current * 1000:9.1f} ms  ({current / len(pages) * 1000:.2f} ms/page)")
+    print(f"speedup:        {legacy / current:9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
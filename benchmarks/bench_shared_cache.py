@@ -0,0 +1,103 @@
+"""Benchmark several checker processes with private and shared response caches.
+
+The fields are split between --processes checker processes that run at the
+same time against the stand-in server. Bursaries listed under several fields
+are fetched by every process that meets them when each process has its own
+cache, and once in total with a shared cache directory or a cache server.
+Reports wall time, pages checked per second and requests that reached the
+site.
+
+    python benchmarks/corpus.py synthesize          # once, if no corpus yet
+    python benchmarks/bench_shared_cache.py --processes 1 2 4 --latency 0.05
+"""
+import argparse
+import concurrent.futures
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from corpus import DEFAULT_CORPUS  # noqa: E402
+from run_benchmarks import corpus_fields  # noqa: E402
+from standin_server import StandInServer  # noqa: E402
+
+MODES = ('private', 'shared', 'server')
+
+
+def crawl_share(base_url, fields, cache_dir, store_path, mode, cache_server, start_at):
+    """One checker process: crawl its fields; returns (records, finished at)."""
+    from rich.console import Console
+    from bursary_checker import BursaryReportGenerator
+
+    generator = BursaryReportGenerator(
+        base_url, http_cache_dir=cache_dir, store_path=store_path, journal_path=None,
+        metrics_path=None, shared_cache=mode == 'shared',
+        cache_server=cache_server if mode == 'server' else None
+    )
+    generator.console = Console(quiet=True)
+    # Start every process together, after the interpreters have loaded
+    time.sleep(max(0.0, start_at - time.time()))
+    _, records = generator.crawl_fields(fields)
+    return len(records), time.time()
+
+
+def run(base_url, fields, processes, mode, cache_server_url, tmp):
+    shares = [fields[i::processes] for i in range(processes)]
+    context = multiprocessing.get_context('spawn')
+    start_at = time.time() + 2.0
+    with concurrent.futures.ProcessPoolExecutor(max_workers=processes, mp_context=context) as pool:
+        futures = []
+        for i, share in enumerate(shares):
+            private = os.path.join(tmp, f"{mode}-{processes}-{i}")
+            cache_dir = private if mode == 'private' else os.path.join(tmp, f"{mode}-{processes}-cache")
+            store_path = os.path.join(private if mode == 'private' else tmp, f"{mode}-{processes}.db")
+            os.makedirs(os.path.dirname(store_path), exist_ok=True)
+            futures.append(pool.submit(crawl_share, base_url, share, cache_dir, store_path,
+                                       mode, cache_server_url, start_at))
+        results = [future.result() for future in futures]
+    return sum(count for count, _ in results), max(end for _, end in results) - start_at
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS)
+    parser.add_argument('--processes', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    parser.add_argument('--latency', type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(os.path.join(args.corpus, 'manifest.json')):
+        parser.error(f"no corpus in {args.corpus}; run benchmarks/corpus.py first")
+    fields = corpus_fields(args.corpus)
+
+    from cache_server import CacheServer
+
+    with tempfile.TemporaryDirectory() as tmp, \
+            StandInServer(args.corpus, latency=args.latency, not_modified=True) as site:
+        print(f"stand-in at {site.base_url}, {len(fields)} fields, latency {args.latency}s")
+        print(f"{'cache':<8} {'processes':>9} {'seconds':>8} {'records':>8} {'pages/s':>8} "
+              f"{'site requests':>14}")
+        for mode in args.modes:
+            for processes in args.processes:
+                cache_server = None
+                if mode == 'server':
+                    cache_server = CacheServer(os.path.join(tmp, f"server-{processes}"), port=0)
+                    threading.Thread(target=cache_server.httpd.serve_forever, daemon=True).start()
+                before = site.requests
+                records, elapsed = run(site.base_url, fields, processes, mode,
+                                       cache_server.base_url if cache_server else None, tmp)
+                if cache_server:
+                    cache_server.httpd.shutdown()
+                    cache_server.httpd.server_close()
+                print(f"{mode:<8} {processes:>9} {elapsed:>8.2f} {records:>8} "
+                      f"{records / elapsed:>8.1f} {site.requests - before:>14}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""Benchmark streamed page reading against reading whole bodies.
+
+Serves synthetic bursary pages from a local server: ordinary pages, pages
+with a long comment thread after the article, pages whose header names an
+outdated year, and oversized pages. Each configuration checks every page on
+one worker and reports seconds, bytes downloaded, and the peak memory
+(tracemalloc) of checking a single page of each kind.
+
+    python benchmarks/bench_streaming.py [--pages 40] [--huge-mb 5]
+"""
+import argparse
+import http.server
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+KINDS = ('normal', 'comments', 'outdated', 'huge')
+
+ARTICLE = (
+    "<article><h2>Eligibility Requirements</h2><ul>"
+    + "".join(f"<li>Requirement number {i}: a South African citizen with a matric pass</li>"
+              for i in range(12))
+    + "</ul><h2>How to apply</h2><p>Closing date: 30 March 2026.</p></article>"
+)
+COMMENT = "<div class='comment'><p>Is this bursary still open for 2026 applicants? Thanks!</p></div>"
+
+
+def page(kind, i, huge_bytes):
+    year = 2019 if kind == 'outdated' else 2026
+    head = (f"<html><head><title>Bursary {i}</title></head><body><header><h1>Bursary {i} "
+            f"{year}</h1></header><main>{ARTICLE}</main>")
+    if kind == 'normal':
+        tail = COMMENT * 20
+    elif kind == 'huge':
+        tail = COMMENT * (huge_bytes // len(COMMENT))
+    else:
+        tail = COMMENT * 6000
+    return (head + f"<section class='comments'>{tail}</section><footer>Footer</footer>"
+            "</body></html>").encode('utf-8')
+
+
+class PageServer:
+    def __init__(self, huge_bytes):
+        self.huge_bytes = huge_bytes
+        self.bodies = {kind: page(kind, 0, huge_bytes) for kind in KINDS}
+        bodies = self.bodies
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                kind = self.path.strip('/').split('-')[0]
+                body = bodies.get(kind)
+                if body is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                try:
+                    for start in range(0, len(body), 65536):
+                        self.wfile.write(body[start:start + 65536])
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # the client stopped reading early
+
+        self.httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+
+def make_generator(base_url, stream, scope):
+    from rich.console import Console
+    from bursary_checker import BursaryReportGenerator
+
+    generator = BursaryReportGenerator(
+        base_url, max_workers=1, adaptive_concurrency=False, http_cache_dir=None,
+        store_path=':memory:', journal_path=None, metrics_path=None, duplicate_threshold=None,
+        stream_pages=stream, detail_scope=scope
+    )
+    generator.console = Console(quiet=True)
+    return generator
+
+
+def peak_mb(generator, url):
+    """Peak traced memory of fetching and parsing one page."""
+    tracemalloc.start()
+    content, _ = generator.fetch_page(url, detail_page=True)
+    if content:
+        generator.parse_bursary_page(content, url, 'Bursary')
+    del content
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=40, help='pages of each kind')
+    parser.add_argument('--huge-mb', type=float, default=5, help='size of an oversized page')
+    args = parser.parse_args(argv)
+
+    server = PageServer(int(args.huge_mb * 1e6))
+    links = [(f"Bursary {i}", f"{server.base_url}/{kind}-{i}/")
+             for i in range(args.pages) for kind in KINDS]
+    print(f"{len(links)} pages; page sizes (KB): "
+          + ", ".join(f"{kind} {len(body) / 1e3:.0f}" for kind, body in server.bodies.items()))
+    print(f"{'mode':<14} {'scope':<8} {'seconds':>8} {'MB read':>8}  "
+          + "  ".join(f"{'peak ' + kind:>14}" for kind in KINDS))
+    for stream in (False, True):
+        for scope in ('page', 'article'):
+            generator = make_generator(server.base_url, stream, scope)
+            peaks = [peak_mb(generator, f"{server.base_url}/{kind}-0/") for kind in KINDS]
+            generator.metrics.counters.clear()
+            start = time.perf_counter()
+            generator.crawl_links(links)
+            elapsed = time.perf_counter() - start
+            read = generator.metrics.counters.get('body_bytes', 0) / 1e6
+            mode = 'streamed' if stream else 'whole body'
+            print(f"{mode:<14} {scope:<8} {elapsed:>8.2f} {read:>8.1f}  "
+                  + "  ".join(f"{peak:>11.1f} MB" for peak in peaks))
+    server.httpd.shutdown()
+
+
+if __name__ == '__main__':
+    main()
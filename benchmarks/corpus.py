@@ -0,0 +1,157 @@
+"""Record or synthesize an HTML corpus for offline benchmarks.
+
+A corpus is a directory with manifest.json and a pages/ folder. The manifest
+records the site the pages came from and maps each URL path to a page file:
+
+    {"base_url": "https://www.zabursaries.co.za",
+     "pages": {"/engineering-bursaries-south-africa/": "pages/00000.html", ...}}
+
+    python benchmarks/corpus.py record --fields all --limit 40 --out benchmarks/corpus
+    python benchmarks/corpus.py synthesize --bursaries 60 --out benchmarks/corpus
+"""
+import argparse
+import json
+import os
+import random
+import sys
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus')
+SITE_URL = "https://www.zabursaries.co.za"
+
+
+class CorpusWriter:
+    """Write pages and the manifest for one corpus directory."""
+
+    def __init__(self, directory, base_url):
+        self.directory = directory
+        self.base_url = base_url.rstrip('/')
+        self.pages = {}
+        os.makedirs(os.path.join(directory, 'pages'), exist_ok=True)
+
+    def add(self, url, content):
+        path = urlparse(url).path or '/'
+        if path in self.pages:
+            return
+        relative = os.path.join('pages', f"{len(self.pages):05d}.html")
+        with open(os.path.join(self.directory, relative), 'w', encoding='utf-8') as f:
+            f.write(content)
+        self.pages[path] = relative
+
+    def close(self):
+        with open(os.path.join(self.directory, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump({'base_url': self.base_url, 'pages': self.pages}, f, indent=1)
+
+
+def load_manifest(directory):
+    with open(os.path.join(directory, 'manifest.json'), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def record_corpus(directory, fields, base_url=SITE_URL, limit=None):
+    """Fetch category pages and their bursary pages from the live site."""
+    from bursary_checker import BursaryReportGenerator
+
+    generator = BursaryReportGenerator(base_url, http_cache_dir=None, store_path=':memory:')
+    writer = CorpusWriter(directory, base_url)
+    for field in fields:
+        category_url = generator.get_category_url(field)
+        content = generator.get_page_content(category_url)
+        if not content:
+            print(f"skipped {field}: category page could not be fetched")
+            continue
+        writer.add(category_url, content)
+        links = generator.extract_bursary_links(category_url)
+        for _, url in links[:limit]:
+            page = generator.get_page_content(url)
+            if page:
+                writer.add(url, page)
+        print(f"recorded {field}: {min(len(links), limit or len(links))} bursary pages")
+    writer.close()
+    return len(writer.pages)
+
+
+def synthetic_bursary_page(i, rng):
+    year = 2022 if i % 17 == 0 else 2026
+    schedule = rng.choice([
+        f"Closing date: {rng.randint(1, 28)} {rng.choice(['March', 'June', 'September'])} 2025",
+        "Applications are open all year round.",
+        "Applications are open between January and March each year.",
+        "Deadline: to be confirmed.",
+    ])
+    closed = " Applications closed." if i % 9 == 0 else ""
+    filler = ''.join(
+        f"<p>Paragraph {n}: this programme supports students with tuition, "
+        f"accommodation and book allowances.</p>" for n in range(rng.randint(8, 30))
+    )
+    requirements = ''.join(
+        f"<li>Requirement {n}: applicants must meet criterion {n}.</li>" for n in range(rng.randint(3, 9))
+    )
+    return (
+        f"<!DOCTYPE html><html><head><title>Synthetic Bursary {i} {year}</title></head><body>"
+        f"<nav><a href=\"{SITE_URL}/\">Home</a></nav>"
+        f"<header><h1 class=\"entry-title\">Synthetic Bursary {i} {year}</h1></header>"
+        f"<div class=\"wrap\"><div class=\"content\"><article>{filler}"
+        f"<h2>Eligibility Requirements</h2><ul>{requirements}</ul>"
+        f"<h2>How to Apply</h2><p>{schedule}{closed}</p></article>"
+        f"<aside><p>Sidebar links and adverts.</p></aside></div></div>"
+        f"<footer><p>Footer text</p></footer></body></html>"
+    )
+
+
+def synthetic_category_page(links):
+    items = ''.join(f'<li><a href="{url}">{name}</a></li>' for name, url in links)
+    return (
+        "<!DOCTYPE html><html><body><nav>"
+        f"<a href=\"{SITE_URL}/news/latest\">Bursary news</a>"
+        f"<a href=\"{SITE_URL}/sassa-payment-dates/\">SASSA payment dates</a></nav>"
+        f"<article><ul>{items}</ul></article></body></html>"
+    )
+
+
+def synthesize_corpus(directory, fields, bursaries_per_field=40, overlap=0.3, seed=1):
+    """Write a synthetic corpus; `overlap` of each field's links are shared bursaries."""
+    from bursary_checker import BursaryReportGenerator
+
+    rng = random.Random(seed)
+    generator = BursaryReportGenerator(SITE_URL, http_cache_dir=None, store_path=':memory:')
+    writer = CorpusWriter(directory, SITE_URL)
+    shared = list(range(int(bursaries_per_field * overlap)))
+    next_id = len(shared)
+    for field in fields:
+        ids = list(shared)
+        while len(ids) < bursaries_per_field:
+            ids.append(next_id)
+            next_id += 1
+        links = [(f"Synthetic Bursary {i} Programme", f"{SITE_URL}/synthetic-bursary-{i}/") for i in ids]
+        writer.add(generator.get_category_url(field), synthetic_category_page(links))
+        for i, (_, url) in zip(ids, links):
+            writer.add(url, synthetic_bursary_page(i, rng))
+    writer.close()
+    return len(writer.pages)
+
+
+def main(argv=None):
+    from bursary_checker import FIELDS, resolve_fields
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('mode', choices=['record', 'synthesize'])
+    parser.add_argument('--out', default=DEFAULT_CORPUS)
+    parser.add_argument('--fields', default='all')
+    parser.add_argument('--limit', type=int, default=None, help='bursary pages per field (record)')
+    parser.add_argument('--bursaries', type=int, default=40, help='bursaries per field (synthesize)')
+    parser.add_argument('--base-url', default=SITE_URL)
+    args = parser.parse_args(argv)
+
+    fields = resolve_fields(args.fields) if args.fields else FIELDS
+    if args.mode == 'record':
+        count = record_corpus(args.out, fields, args.base_url, args.limit)
+    else:
+        count = synthesize_corpus(args.out, fields, args.bursaries)
+    print(f"wrote {count} pages to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
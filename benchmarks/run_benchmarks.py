@@ -0,0 +1,173 @@
+"""Per-stage crawl benchmarks against the local stand-in server.
+
+Each configuration (fetch engine x worker count) runs in a fresh process
+against the same StandInServer. The runner measures link extraction, a cold
+crawl, a warm crawl answered with 304s, PDF rendering and a full
+generate_batch_report run. It reports seconds, pages/s and the process's
+peak RSS after each stage. --concurrency compares the adaptive per-host
+limit with a fixed pool of --workers.
+
+    python benchmarks/corpus.py synthesize          # once, if no corpus yet
+    python benchmarks/run_benchmarks.py --workers 1 5 10 --latency 0.05
+    python benchmarks/run_benchmarks.py --workers 5 --latency 0.01 --concurrency fixed adaptive
+    python benchmarks/run_benchmarks.py --json results.json
+"""
+import argparse
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from corpus import DEFAULT_CORPUS, load_manifest  # noqa: E402
+from standin_server import StandInServer  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere
+    return peak / 1e6 if sys.platform == 'darwin' else peak / 1e3
+
+
+def corpus_fields(corpus_dir):
+    """Return the FIELDS whose category page is in the corpus."""
+    from bursary_checker import FIELDS, BursaryReportGenerator
+    from urllib.parse import urlparse
+
+    pages = load_manifest(corpus_dir)['pages']
+    generator = BursaryReportGenerator('http://corpus', http_cache_dir=None, store_path=':memory:')
+    return [f for f in FIELDS if urlparse(generator.get_category_url(f)).path in pages]
+
+
+def run_config(base_url, fields, engine, workers, parse_workers, adaptive=True):
+    """Run every stage for one configuration; executed in a child process."""
+    from rich.console import Console
+    from bursary_checker import BursaryReportGenerator
+    from pdf_report import build_pdf_report
+
+    results = []
+
+    def stage(name, pages, start):
+        elapsed = time.perf_counter() - start
+        results.append({
+            'stage': name,
+            'seconds': elapsed,
+            'pages': pages,
+            'pages_per_second': pages / elapsed if elapsed else None,
+            'peak_rss_mb': peak_rss_mb(),
+        })
+
+    def make_generator(tmp):
+        generator = BursaryReportGenerator(
+            base_url, fetch_engine=engine, max_workers=workers, async_concurrency=workers,
+            http_cache_dir=os.path.join(tmp, 'http_cache'),
+            store_path=os.path.join(tmp, 'bursary_data.db'), parse_workers=parse_workers,
+            adaptive_concurrency=adaptive
+        )
+        generator.console = Console(quiet=True)
+        return generator
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        generator = make_generator(tmp)
+
+        start = time.perf_counter()
+        links_by_field = {f: generator.extract_bursary_links(generator.get_category_url(f))
+                          for f in fields}
+        stage('extract links', len(fields), start)
+
+        unique = {}
+        for links in links_by_field.values():
+            for name, url in links:
+                unique.setdefault(url, name)
+        links = [(name, url) for url, name in unique.items()]
+
+        start = time.perf_counter()
+        records = list(generator.crawl_links(links))
+        stage('crawl (cold)', len(links), start)
+
+        start = time.perf_counter()
+        generator.crawl_links(links)
+        stage('crawl (304)', len(links), start)
+
+        open_records = [r for r in records if r['status'] == 'Open']
+        start = time.perf_counter()
+        build_pdf_report(os.path.join(tmp, 'bench.pdf'), 'Benchmark', open_records)
+        stage('render pdf', len(open_records), start)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        generator = make_generator(tmp)
+        start = time.perf_counter()
+        generator.generate_batch_report(fields)
+        stage('full batch run', len(fields) + len(links), start)
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS)
+    parser.add_argument('--fields', default=None, help='comma-separated fields (default: all in corpus)')
+    parser.add_argument('--engines', nargs='+', default=['threads', 'async'])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 5, 10, 20])
+    parser.add_argument('--parse-workers', type=int, default=0)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--no-304', action='store_true')
+    parser.add_argument('--max-in-flight', type=int, default=None,
+                        help='server answers 429 above this many concurrent requests')
+    parser.add_argument('--concurrency', nargs='+', choices=('adaptive', 'fixed'), default=['adaptive'],
+                        help='adaptive per-host limit, fixed pool of --workers, or both')
+    parser.add_argument('--json', help='also write results to this file')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(os.path.join(args.corpus, 'manifest.json')):
+        parser.error(f"no corpus in {args.corpus}; run benchmarks/corpus.py first")
+
+    from bursary_checker import resolve_fields
+    fields = resolve_fields(args.fields) if args.fields else corpus_fields(args.corpus)
+
+    all_results = []
+    context = multiprocessing.get_context('spawn')
+    with StandInServer(args.corpus, latency=args.latency, jitter=args.jitter,
+                       error_rate=args.error_rate, not_modified=not args.no_304,
+                       max_in_flight=args.max_in_flight) as server:
+        print(f"stand-in at {server.base_url}, {len(fields)} fields, latency {args.latency}s")
+        print(f"{'engine':<8} {'mode':<8} {'workers':>7}  {'stage':<15} {'seconds':>8} {'pages':>6} "
+              f"{'pages/s':>8} {'peak RSS MB':>12}")
+        for engine in args.engines:
+            for mode in args.concurrency:
+                for workers in args.workers:
+                    with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                        results = pool.submit(run_config, server.base_url, fields, engine, workers,
+                                              args.parse_workers, mode == 'adaptive').result()
+                    for r in results:
+                        rate = f"{r['pages_per_second']:.1f}" if r['pages_per_second'] else '-'
+                        rss = f"{r['peak_rss_mb']:.0f}" if r['peak_rss_mb'] else '-'
+                        print(f"{engine:<8} {mode:<8} {workers:>7}  {r['stage']:<15} {r['seconds']:>8.2f} "
+                              f"{r['pages']:>6} {rate:>8} {rss:>12}")
+                        all_results.append(dict(r, engine=engine, workers=workers, concurrency=mode))
+        print(f"server responses: {server.responses}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(all_results, f, indent=1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+"""Local HTTP stand-in for the bursary site, served from a recorded corpus.
+
+Links to the original site are rewritten to point at the stand-in. Latency,
+random 5xx errors, 429 throttling with Retry-After and ETag/Last-Modified
+revalidation (304) can be configured so fetch paths can be benchmarked
+offline and repeatably.
+
+    python benchmarks/standin_server.py --corpus benchmarks/corpus --port 8800 --latency 0.05
+"""
+import argparse
+import hashlib
+import http.server
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import DEFAULT_CORPUS, load_manifest  # noqa: E402
+
+
+LAST_MODIFIED = 'Wed, 01 Jan 2025 00:00:00 GMT'
+
+
+class StandInServer:
+    """Serve a corpus on 127.0.0.1 with configurable latency, errors and 304s."""
+
+    def __init__(self, corpus_dir=DEFAULT_CORPUS, port=0, latency=0.0, jitter=0.0,
+                 error_rate=0.0, not_modified=True, seed=1, max_in_flight=None,
+                 retry_after=1):
+        self.corpus_dir = corpus_dir
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.not_modified = not_modified
+        # Above max_in_flight concurrent requests, answer 429 with Retry-After
+        self.max_in_flight = max_in_flight
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self.requests = 0
+        self.responses = {}
+        self._counter_lock = threading.Lock()
+
+        manifest = load_manifest(corpus_dir)
+        self._origin = manifest['base_url'].rstrip('/')
+        self._files = manifest['pages']
+        self._bodies = {}
+        self.httpd = http.server.ThreadingHTTPServer(('127.0.0.1', port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self._thread = None
+
+    def _body(self, path):
+        """Return (body bytes, etag) for path, rewriting links to the stand-in."""
+        if path not in self._bodies:
+            with open(os.path.join(self.corpus_dir, self._files[path]), 'r', encoding='utf-8') as f:
+                body = f.read().replace(self._origin, self.base_url).encode('utf-8')
+            self._bodies[path] = (body, '"%s"' % hashlib.sha1(body).hexdigest())
+        return self._bodies[path]
+
+    def _count(self, status):
+        with self._counter_lock:
+            self.requests += 1
+            self.responses[status] = self.responses.get(status, 0) + 1
+
+    def _enter(self):
+        """Count a request in flight; False if it is over max_in_flight."""
+        with self._counter_lock:
+            self.in_flight += 1
+            return not self.max_in_flight or self.in_flight <= self.max_in_flight
+
+    def _leave(self):
+        with self._counter_lock:
+            self.in_flight -= 1
+
+    def _delay_and_fail(self):
+        with self._random_lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+            fail = self._random.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+        return fail
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status, body=b'', headers=None):
+                server._count(status)
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if body and self.command != 'HEAD':
+                    self.wfile.write(body)
+
+            def do_GET(self):
+                try:
+                    if not server._enter():
+                        self._send(429, b'Too Many Requests', {'Retry-After': str(server.retry_after)})
+                        return
+                    self._get()
+                finally:
+                    server._leave()
+
+            def _get(self):
+                path = self.path.split('?', 1)[0]
+                if server._delay_and_fail():
+                    self._send(503, b'Service Unavailable')
+                    return
+                if path not in server._files:
+                    self._send(404, b'Not Found')
+                    return
+                body, etag = server._body(path)
+                validators = {'ETag': etag, 'Last-Modified': LAST_MODIFIED}
+                if server.not_modified and (
+                        self.headers.get('If-None-Match') == etag
+                        or self.headers.get('If-Modified-Since') == LAST_MODIFIED):
+                    self._send(304, headers=validators)
+                    return
+                headers = dict(validators, **{'Content-Type': 'text/html; charset=utf-8'})
+                self._send(200, body, headers)
+
+            do_HEAD = do_GET
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS)
+    parser.add_argument('--port', type=int, default=8800)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='random extra latency, up to this many seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with 503')
+    parser.add_argument('--no-304', action='store_true', help='ignore conditional request headers')
+    parser.add_argument('--max-in-flight', type=int, default=None,
+                        help='answer 429 with Retry-After above this many concurrent requests')
+    parser.add_argument('--retry-after', type=int, default=1, help='Retry-After seconds sent with 429')
+    args = parser.parse_args(argv)
+
+    server = StandInServer(args.corpus, args.port, args.latency, args.jitter,
+                           args.error_rate, not args.no_304, max_in_flight=args.max_in_flight,
+                           retry_after=args.retry_after)
+    print(f"Serving {len(server._files)} pages from {args.corpus} at {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,175 +1,359 @@
 import requests
-from bs4 import BeautifulSoup
-import re
-from datetime import datetime, timedelta
+import hashlib
+from datetime import timedelta, date
 import os
-import pickle
 import concurrent.futures
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
-from reportlab.lib import colors
-from reportlab.lib.units import inch
-from reportlab.lib.styles import getSampleStyleSheet
-from rich.progress import Progress, SpinnerColumn, TimeElapsedColumn, TextColumn, BarColumn
+import functools
+import itertools
+import argparse
 from rich.console import Console
 from rich.panel import Panel
-from rich.table import Table as RichTable
 from rich import print as rprint
+import threading
 import time
 import logging
+from urllib.parse import urlparse
 from urllib3.util.retry import Retry
-from requests.adapters import HTTPAdapter
+from adaptive_concurrency import (
+    BACKOFF_STATUSES, THROTTLE_STATUSES, AdaptiveConcurrency, parse_retry_after
+)
+from async_fetcher import AsyncFetcher
+from parse_pipeline import ParsePipeline
+from classifier import RuleClassifier
+from http_cache import HTTPResponseCache
+from bursary_store import BursaryStore
+from closing_dates import closing_date_to_date, deadline_sort_key
+from crawl_journal import CrawlJournal
+from crawl_metrics import CrawlMetrics, TimedHTTPAdapter
+from fields import FIELDS, resolve_fields
+from link_discovery import UrlDeduper, iter_category_links, iter_sitemap_links, normalize_url
+from near_duplicates import NearDuplicateDetector
+from page_parsing import (
+    PARSERS, extract_requirement_items, format_requirements, parse_bursary_page,
+    parse_bursary_page_timed, resolve_parser
+)
+from page_stream import PageBody, PageReader, is_html
+from renderers import WRITERS, ConsoleTableWriter, make_writer, output_filename, render, report_row
+from shared_cache import SharedResponseCache
 
 class BursaryReportGenerator:
-    def __init__(self, base_url):
+    def __init__(self, base_url, fetch_engine='threads', max_workers=5,
+                 async_concurrency=20, per_host_rate=None, http_cache_dir='http_cache',
+                 store_path='bursary_data.db', record_ttl=86400, near_deadline_days=7,
+                 parser_backend='html.parser', detail_scope='page', parse_workers=0, parse_queue_size=32,
+                 rules=None, metrics_path='bursary_metrics.jsonl', prometheus_path=None,
+                 adaptive_concurrency=True, max_concurrency=32, throttle_retries=3,
+                 sitemap_url=None, dedup_window=100000, journal_path='bursary_journal.jsonl',
+                 output_formats=('pdf',), output_dir='.', duplicate_threshold=0.8,
+                 alias_ttl=7 * 86400, persist_aliases=False, shared_cache=False, cache_server=None,
+                 stream_pages=True, max_page_bytes=2 * 1024 * 1024, render_workers=None):
         self.base_url = base_url
+        # Sitemap (or sitemap index) enumerated by discover_links(include_sitemap=True)
+        self.sitemap_url = sitemap_url or f"{base_url.rstrip('/')}/sitemap_index.xml"
+        # How many normalized URLs link discovery remembers to drop repeats
+        self.dedup_window = dedup_window
+        # 'threads' uses the shared requests.Session, 'async' uses aiohttp
+        self.fetch_engine = fetch_engine
+        self.max_workers = max_workers
+        self.async_concurrency = async_concurrency
+        self.per_host_rate = per_host_rate
+        # AIMD limit on in-flight requests per host, starting from max_workers
+        # (threads) or async_concurrency (async) and never above max_concurrency.
+        # The learned limit carries over between reports from the same generator.
+        self.max_concurrency = max_concurrency
+        initial = async_concurrency if fetch_engine == 'async' else max_workers
+        self.concurrency = (AdaptiveConcurrency(initial=initial, maximum=max_concurrency)
+                            if adaptive_concurrency else None)
+        # 429 / 503 responses are retried here, after waiting for Retry-After
+        self.throttle_retries = throttle_retries
         self.console = Console()
+        # Report formats written for each field (see renderers.WRITERS) and where
+        self.output_formats = tuple(output_formats)
+        self.output_dir = output_dir
+        # Processes rendering a batch's PDF reports side by side (None: one per core)
+        self.render_workers = render_workers
+        # Per-stage timings for the current run; each report appends a summary
+        # line to metrics_path and optionally rewrites a Prometheus textfile
+        self.metrics = CrawlMetrics()
+        self.metrics_path = metrics_path
+        self.prometheus_path = prometheus_path
         self.setup_session()
         self.setup_logging()
-        self.cache_file = 'bursary_data_cache.pkl'
-        self.bursary_data = self.load_cached_data() or []
+        # Records are loaded from the store per category when needed, not at startup
+        self.store = BursaryStore(store_path, default_ttl=record_ttl)
+        self.bursary_data = []
+        # Incremental runs always re-check bursaries closing within this many days
+        self.near_deadline_days = near_deadline_days
+        # BeautifulSoup tree builder (lxml is faster but opt-in: it can read malformed
+        # pages differently) and how much of a bursary page to parse
+        self.parser_backend = resolve_parser(parser_backend)
+        self.detail_scope = detail_scope
+        # parse_workers > 0 moves parsing into a process pool fed by a bounded queue
+        self.parse_workers = parse_workers
+        self.parse_queue_size = parse_queue_size
+        # Read page bodies incrementally: stop at max_page_bytes, and on bursary
+        # pages as soon as the rest cannot change the result (see page_stream)
+        self.stream_pages = stream_pages
+        self.max_page_bytes = max_page_bytes
+        # Per-URL response store for ETag / Last-Modified revalidation. A shared
+        # cache (a directory several processes use, or a cache_server URL) also
+        # leases each URL to one worker, so the others reuse its body
+        if cache_server:
+            from cache_server import RemoteResponseCache
+            self.http_cache = RemoteResponseCache(cache_server)
+        elif http_cache_dir and shared_cache:
+            self.http_cache = SharedResponseCache(http_cache_dir)
+        else:
+            self.http_cache = HTTPResponseCache(http_cache_dir) if http_cache_dir else None
+        self._previous_records = {}
+        # Finished records and queued links of the running crawl, so an
+        # interrupted run resumes instead of starting over (None disables)
+        self.journal_path = journal_path
+        self.journal = None
+        self.last_journal_path = None
+        # Records of the same programme whose text is at least duplicate_threshold
+        # similar are reported once (duplicate_threshold=None disables this).
+        # With persist_aliases the duplicate URLs are not fetched again for
+        # alias_ttl seconds
+        self.duplicate_detector = (NearDuplicateDetector(duplicate_threshold)
+                                   if duplicate_threshold else None)
+        self.persist_aliases = persist_aliases
+        self.alias_ttl = alias_ttl
+        self.duplicate_of = {}
         self.total_links = 0
         self.processed_links = 0
-        # Updated excluded terms to be more specific
-        self.excluded_terms = [
-            'sassa payment dates',
-            'srd grant payment',
-            'post office payment',
-            'cash point location'
-        ]
+        # Link exclusions, keywords and closed indicators live in classifier.DEFAULT_RULES;
+        # `rules` overrides any of those tables
+        self.classifier = RuleClassifier(rules)
         self.category_mapping = {
             'arts': 'music-and-performing-arts',
             'computer science & it': 'computer-science-it',
             'construction & built environment': 'built-environment'
         }
         self.progress = None
+        self._crawl_started = None
     
-    def _display_console_summary(self, bursaries):
-        """Display a summary of bursaries in a rich formatted table."""
-        table = RichTable(title="Open Bursaries Summary", show_header=True, header_style="bold magenta")
-        
-        # Add columns
-        table.add_column("Bursary Name", style="cyan", no_wrap=False)
-        table.add_column("Closing Date", style="green")
-        table.add_column("Status", style="yellow")
-        
-        # Add rows
-        for bursary in bursaries:
-            closing_date = (bursary['closing_date'].strftime('%d %B %Y') 
-                          if bursary['closing_date'] else 'Not specified')
-            table.add_row(
-                bursary['name'],
-                closing_date,
-                bursary['status']
-            )
-        
-        self.console.print("\n[bold]Summary of Open Bursaries[/bold]")
-        self.console.print(table)
-        self.console.print(f"\nTotal open bursaries found: [green]{len(bursaries)}[/green]") 
-
-    def _generate_pdf_report(self, field, bursaries):
-        """Generate PDF report with improved formatting and links."""
+    def _write_reports(self, field, bursaries, summary=False, formats=None):
+        """Render bursaries once into every output format, plus the console summary."""
+        title = f"Open Bursaries Report - {field}"
+        writers = []
+        for fmt in self.output_formats if formats is None else formats:
+            try:
+                path = os.path.join(self.output_dir, output_filename(field, fmt))
+                writers.append(make_writer(fmt, path, title))
+            except (ValueError, ImportError) as e:
+                self.logger.error(f"Skipping {fmt} output: {e}")
+                self.console.print(f"[red]Skipping {fmt} output: {e}")
+        files = len(writers)
+        if summary:
+            writers.append(ConsoleTableWriter(self.console))
         try:
-            filename = f"{field.lower().replace(' ', '_')}_bursaries_report.pdf"
-            doc = SimpleDocTemplate(filename, pagesize=letter, topMargin=0.5*inch)
-            styles = getSampleStyleSheet()
-            elements = []
-
-            # Title
-            title_style = styles['Heading1']
-            title_style.alignment = 1
-            elements.append(Paragraph(f"Open Bursaries Report - {field}", title_style))
-            elements.append(Paragraph("<br/>", styles['Normal']))
-
-            # Create table data with links
-            data = [['Bursary Name', 'Closing Date', 'Status', 'Requirements']]
-            
-            # Remove duplicates while preserving order
-            seen = set()
-            unique_bursaries = []
-            for b in bursaries:
-                if b['name'] not in seen:
-                    seen.add(b['name'])
-                    unique_bursaries.append(b)
-
-            for bursary in unique_bursaries:
-                # Create clickable link
-                name_with_link = f'<link href="{bursary["url"]}">{bursary["name"]}</link>'
-                
-                # Format requirements text
-                details = bursary['details'].replace('\n', '<br/>')
-                
-                data.append([
-                    Paragraph(name_with_link, styles['Normal']),
-                    Paragraph(str(bursary['closing_date']), styles['Normal']),
-                    Paragraph(bursary['status'], styles['Normal']),
-                    Paragraph(details, styles['Normal'])
-                ])
-
-            # Table styling
-            col_widths = [3*inch, 1.5*inch, 1*inch, 3.5*inch]
-            table = Table(data, repeatRows=1, colWidths=col_widths)
-            
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#333333')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 10),
-                ('TOPPADDING', (0, 0), (-1, -1), 6),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f5f5f5')]),
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ]))
-
-            elements.append(table)
-            doc.build(elements)
-            
-            self.console.print(f"[green]Report generated successfully: {filename}")
-            
+            with self.metrics.span('render'):
+                paths = render(bursaries, writers)
+            for path in paths:
+                self.console.print(f"[green]Report generated successfully: {path}")
+            if len(paths) < files:
+                self.console.print("[red]Some reports could not be generated. Check the log file for details.")
+        except Exception as e:
+            self.logger.error(f"Error generating reports: {e}")
+            self.console.print("[red]Error generating reports. Check the log file for details.")
+
+    def _write_batch_reports(self, reports):
+        """Write (field, bursaries, summary) reports, building all the PDFs in one pool.
+
+        Other formats and the console summary go through _write_reports as
+        usual; the PDFs are independent, so pdf_report.build_pdf_reports
+        renders them across render_workers processes.
+        """
+        others = tuple(fmt for fmt in self.output_formats if fmt != 'pdf')
+        jobs = []
+        for field, bursaries, summary in reports:
+            if others or summary:
+                self._write_reports(field, bursaries, summary, formats=others)
+            if 'pdf' in self.output_formats:
+                jobs.append((os.path.join(self.output_dir, output_filename(field, 'pdf')),
+                             f"Open Bursaries Report - {field}",
+                             [report_row(b) for b in bursaries]))
+        if not jobs:
+            return
+        try:
+            from pdf_report import build_pdf_reports
+            with self.metrics.span('render'):
+                results = build_pdf_reports(jobs, self.render_workers)
         except Exception as e:
-            self.logger.error(f"Error generating PDF report: {e}")
-            self.console.print("[red]Error generating PDF report. Check the log file for details.")
+            self.logger.error(f"Error generating PDF reports: {e}")
+            self.console.print("[red]Error generating reports. Check the log file for details.")
+            return
+        for path, error in results:
+            if error:
+                self.logger.error(f"Error generating {path}: {error}")
+                self.console.print(f"[red]Could not generate {path}. Check the log file for details.")
+            else:
+                self.console.print(f"[green]Report generated successfully: {path}")
+
+    def _write_metrics(self, mode, fields):
+        """Write the run summary to the JSON lines file and Prometheus textfile."""
+        try:
+            if self.metrics_path:
+                self.metrics.write_jsonl(self.metrics_path, mode=mode, fields=fields,
+                                         fetch_engine=self.fetch_engine)
+            if self.prometheus_path:
+                self.metrics.write_prometheus(self.prometheus_path)
+        except Exception as e:
+            self.logger.error(f"Error writing metrics: {e}")
 
-    def load_cached_data(self):
-        """Load cached bursary data from file if it exists and is not expired."""
+    def load_cached_data(self, field=None):
+        """Load unexpired bursary records from the store, optionally for one field."""
         try:
-            if os.path.exists(self.cache_file):
-                # Check if cache is older than 24 hours
-                if time.time() - os.path.getmtime(self.cache_file) < 86400:  # 24 hours in seconds
-                    with open(self.cache_file, 'rb') as f:
-                        return pickle.load(f)
-                else:
-                    self.logger.info("Cache expired, will fetch fresh data")
-            return []
+            return self.store.load(category=field)
         except Exception as e:
             self.logger.error(f"Error loading cache: {e}")
             return []
 
-    def save_cached_data(self):
-        """Save current bursary data to cache file."""
+    def save_cached_data(self, field=None):
+        """Upsert current bursary data into the store, filed under field."""
         try:
-            with open(self.cache_file, 'wb') as f:
-                pickle.dump(self.bursary_data, f)
+            self.store.upsert_many(self.bursary_data, category=field)
         except Exception as e:
             self.logger.error(f"Error saving cache: {e}")
 
     def get_page_content(self, url):
         """Fetch page content with retry logic."""
+        content, _ = self.fetch_page(url)
+        return content
+
+    def fetch_page(self, url, detail_page=False):
+        """Fetch a page, revalidating against the HTTP cache when possible.
+
+        Returns (content, not_modified); not_modified is True when the server
+        answered 304 and content came from the stored body. With
+        detail_page=True a streamed bursary page may stop downloading early.
+
+        With a shared cache, a body another worker fetched recently is used
+        as is, and only the worker holding a URL's lease fetches it; the
+        others wait for its body.
+        """
+        cache = self.http_cache
+        if not (cache and cache.shared):
+            return self._fetch_page(url, detail_page)
+        content = None
+        leased = cache.acquire(url)
+        if not leased:
+            # Fetched recently, or being fetched now, by another worker
+            content = cache.wait(url)
+        self.metrics.cache_event('shared_cache', content is not None)
+        if content is not None:
+            return content, False
+        try:
+            return self._fetch_page(url, detail_page)
+        finally:
+            if leased:
+                cache.release(url)
+
+    def _fetch_page(self, url, detail_page=False):
+        """Request url (conditionally, when cached); returns (content, not_modified)."""
         try:
-            response = self.session.get(url, headers=self.headers, timeout=10)
+            headers = dict(self.headers)
+            if self.http_cache:
+                headers.update(self.http_cache.conditional_headers(url))
+            for attempt in range(self.throttle_retries + 1):
+                response, body, retry_after = self._get(url, headers, detail_page)
+                if response.status_code not in THROTTLE_STATUSES or attempt == self.throttle_retries:
+                    break
+                self.metrics.increment('http_throttled')
+                # With adaptive concurrency the host is already paused for Retry-After
+                if retry_after is None or not self.concurrency:
+                    time.sleep(retry_after if retry_after is not None else 2 ** attempt)
             response.raise_for_status()
-            return response.text
+            if body.stopped:
+                # Partial bodies are parsed but never cached
+                self.metrics.increment(f'stream_stopped_{body.stopped}')
+                return body.text, False
+            return self._resolve_response(url, response.status_code, body.text, response.headers)
         except Exception as e:
+            self.metrics.increment('fetch_errors')
             self.logger.error(f"Error fetching {url}: {e}")
+            return None, False
+
+    def _get(self, url, headers, detail_page=False):
+        """One GET through the session, holding an adaptive concurrency slot.
+
+        Returns (response, body, retry_after seconds or None); body is a
+        page_stream.PageBody.
+        """
+        host = urlparse(url).netloc
+        if self.concurrency:
+            self.concurrency.acquire(host)
+        response, retry_after, ok, ttfb = None, None, False, None
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, headers=headers, timeout=10, stream=self.stream_pages)
+            # Time to the response headers: the body read and parse threads
+            # competing for the GIL say nothing about the host's load
+            ttfb = response.elapsed.total_seconds()
+            body, size = self._read_body(response, detail_page)
+            elapsed = time.perf_counter() - start
+            self.metrics.record_response(response, elapsed, size)
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            # urllib3 retries 5xx itself; any retry means the host is struggling
+            retries = getattr(getattr(response.raw, 'retries', None), 'history', ())
+            ok = response.status_code not in BACKOFF_STATUSES and not retries
+            return response, body, retry_after
+        finally:
+            if self.concurrency:
+                self.concurrency.release(host, ttfb, ok, retry_after)
+
+    def _page_reader(self, content_type, encoding, detail_page):
+        """PageReader for a streamed body, or None to skip a non-HTML page."""
+        if not is_html(content_type):
             return None
+        return PageReader(encoding, self.max_page_bytes,
+                          self.classifier.is_outdated if detail_page else None,
+                          stop_at_section=detail_page and self.detail_scope == 'article')
+
+    def _read_body(self, response, detail_page):
+        """Read a response body; returns (PageBody, bytes read)."""
+        if not self.stream_pages or response.status_code != 200:
+            return PageBody(response.text, None), len(response.content)
+        reader = self._page_reader(response.headers.get('Content-Type'), response.encoding, detail_page)
+        if reader is None:
+            response.close()
+            return PageBody(None, 'not_html'), 0
+        for chunk in response.iter_content(chunk_size=16384):
+            if not reader.feed(chunk):
+                # Drops the connection rather than downloading the rest
+                response.close()
+                break
+        return reader.finish(), reader.bytes_read
+
+    def _concurrency_label(self):
+        if not self.concurrency:
+            return f"{self.max_workers} workers"
+        return f"{self.concurrency.in_flight()}/{self.concurrency.limit()} in flight"
+
+    def _advance(self, task):
+        """Advance the progress bar and refresh the concurrency column."""
+        started, self._crawl_started = self._crawl_started, None
+        if started is not None:
+            # Discovery and fetching overlap, so this is the time to the first result
+            self.metrics.observe('first_result', time.perf_counter() - started)
+        self.progress.update(task, advance=1, concurrency=self._concurrency_label())
+
+    def _resolve_response(self, url, status, text, headers):
+        """Store a fresh response or answer a 304 from the HTTP cache."""
+        if not self.http_cache:
+            return text, False
+        if status == 304:
+            cached = self.http_cache.load_body(url)
+            self.metrics.cache_event('http_cache', cached is not None)
+            if cached is None:
+                self.logger.error(f"Got 304 for {url} but no cached body is stored")
+                return None, False
+            self.http_cache.touch(url)
+            return cached, True
+        self.metrics.cache_event('http_cache', False)
+        self.http_cache.store(url, text, headers)
+        return text, False
 
     def setup_logging(self):
         logging.basicConfig(
@@ -184,10 +368,14 @@ class BursaryReportGenerator:
         retry_strategy = Retry(
             total=3,
             backoff_factor=1,
-            status_forcelist=[500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "OPTIONS"]
+            status_forcelist=[500, 502, 504],
+            allowed_methods=["HEAD", "GET", "OPTIONS"],
+            # 429 and 503 are retried in fetch_page so Retry-After can pause the whole host
+            respect_retry_after_header=False,
+            raise_on_status=False
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Reports connect/TLS time of new connections to the current run's metrics
+        adapter = TimedHTTPAdapter(lambda: self.metrics, max_retries=retry_strategy)
         self.session.mount("https://", adapter)
         self.session.mount("http://", adapter)
         self.headers = {
@@ -196,82 +384,15 @@ class BursaryReportGenerator:
         }
 
     def is_valid_bursary_link(self, href, text):
-        # Check if the link contains excluded terms
-        if any(term in (href + text).lower() for term in self.excluded_terms):
-            return False
-        
-        # Verify it's a bursary/scholarship link
-        if not any(keyword in (href.lower() + text.lower()) 
-                  for keyword in ['bursary', 'scholarship', 'fellowship']):
-            return False
-            
-        # Additional validation
-        if 'view-all' in href.lower() or 'news' in href.lower():
-            return False
-            
-        return True
+        return self.classifier.is_valid_bursary_link(href, text)
 
     def parse_closing_date(self, text_content):
         """Enhanced closing date parsing with special cases handling."""
-        # Convert to lowercase and remove extra whitespace
-        text = ' '.join(text_content.lower().split())
-        
-        # Check for year-round applications
-        year_round_patterns = [
-            r'open all year round',
-            r'open throughout the year',
-            r'applications are open all year'
-        ]
-        if any(pattern in text for pattern in year_round_patterns):
-            return "Open all year round"
-            
-        # Check for specific application windows
-        window_pattern = r'applications are open between ([A-Za-z]+) and ([A-Za-z]+) each year'
-        window_match = re.search(window_pattern, text)
-        if window_match:
-            return f"Opens annually {window_match.group(1)}-{window_match.group(2)}"
-        
-        # Look for explicit dates
-        date_patterns = [
-            r'closing date[:\s]*(\d{1,2}(?:st|nd|rd|th)?\s+[a-zA-Z]+\s+202[45])',
-            r'deadline[:\s]*(\d{1,2}(?:st|nd|rd|th)?\s+[a-zA-Z]+\s+202[45])',
-            r'applications? close[:\s]*(\d{1,2}(?:st|nd|rd|th)?\s+[a-zA-Z]+\s+202[45])'
-        ]
-        
-        for pattern in date_patterns:
-            match = re.search(pattern, text)
-            if match:
-                return match.group(1)
-                
-        return "Not specified"
-    
+        return self.classifier.classify_page(text_content).closing_date
+
     def extract_requirements(self, soup):
         """Extract and format eligibility requirements."""
-        requirements = []
-        
-        # Look for requirements section
-        req_section = soup.find(lambda tag: tag.name and 
-                            any(term in tag.get_text().lower() 
-                                for term in ['eligibility', 'requirements', 'criteria']))
-        
-        if req_section:
-            # Extract bullet points
-            bullets = req_section.find_all(['li', 'p'])
-            if bullets:
-                for bullet in bullets:
-                    text = bullet.get_text().strip()
-                    if text and len(text) > 5:  # Filter out empty or too short items
-                        requirements.append(text)
-        
-        if not requirements:
-            return "No specific requirements listed"
-            
-        # Format requirements nicely
-        formatted_reqs = "Requirements:\n" + "\n".join(f"• {req}" for req in requirements[:5])
-        if len(requirements) > 5:
-            formatted_reqs += "\n• ..."
-            
-        return formatted_reqs
+        return format_requirements(extract_requirement_items(soup))
 
 
     def get_category_url(self, field):
@@ -285,155 +406,563 @@ class BursaryReportGenerator:
         return f"{self.base_url.rstrip('/')}/{category_slug}-bursaries-south-africa/"
 
     def extract_bursary_links(self, category_url):
-        """Extracts bursary links from the category page."""
-        try:
-            content = self.get_page_content(category_url)
-            if not content:
-                return []
+        """Extracts bursary links from every page of a category listing."""
+        return list(self.iter_bursary_links(category_url))
 
-            soup = BeautifulSoup(content, 'html.parser')
-            bursary_links = []
+    def iter_bursary_links(self, category_url):
+        """Yield (name, url) bursary links page by page as the listing is fetched."""
+        try:
+            yield from iter_category_links(self.get_page_content, category_url,
+                                           self.is_valid_bursary_link, self.parser_backend)
+        except Exception as e:
+            self.logger.error(f"Error extracting bursary links from {category_url}: {e}")
 
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                text = link.text.strip()
-                if self.is_valid_bursary_link(href, text):
-                    full_url = href if href.startswith('http') else self.base_url + href
-                    bursary_links.append((text, full_url))
+    def _stream_body(self, url):
+        """Yield a response body in chunks as it downloads."""
+        with self.session.get(url, headers=self.headers, timeout=10, stream=True) as response:
+            response.raise_for_status()
+            yield from response.iter_content(chunk_size=16384)
 
-            return bursary_links
+    def iter_sitemap_links(self, sitemap_url=None):
+        """Yield (name, url) for the bursary pages listed in the site's sitemap."""
+        sitemap_url = sitemap_url or self.sitemap_url
+        try:
+            yield from iter_sitemap_links(self._stream_body, sitemap_url, self.is_valid_bursary_link)
         except Exception as e:
-            self.logger.error(f"Error extracting bursary links from {category_url}: {e}")
-            return []
+            self.logger.error(f"Error reading sitemap {sitemap_url}: {e}")
+
+    def discover_links(self, fields, include_sitemap=False, links_by_field=None):
+        """Yield each bursary link once, across fields and the optional sitemap.
+
+        Every (name, url) listed under a field is also appended to
+        links_by_field[field], repeats included, so callers can file records
+        under each field that lists them.
+        """
+        seen = UrlDeduper(self.dedup_window)
+        # URLs found to be near-duplicates on earlier runs are replaced by their canonical URL
+        aliases = self.store.load_aliases() if self.duplicate_detector and self.persist_aliases else {}
+        sources = [(field, self.iter_bursary_links(self.get_category_url(field))) for field in fields]
+        if include_sitemap:
+            sources.append((None, self.iter_sitemap_links()))
+        for field, links in sources:
+            for name, url in links:
+                url = normalize_url(url)
+                if url in aliases:
+                    self.metrics.increment('duplicate_urls_skipped')
+                    url = aliases[url]
+                if field is not None and links_by_field is not None:
+                    links_by_field.setdefault(field, []).append((name, url))
+                if seen.add(url):
+                    yield name, url
         
     def check_bursary_status(self, url, name, task):
         """Improved bursary status checking with better data extraction."""
         try:
-            content = self.get_page_content(url)
-            if not content:
-                self.progress.update(task, advance=1)
-                return None
-
-            soup = BeautifulSoup(content, 'html.parser')
-            text_content = soup.get_text()
-            
-            # Check for outdated bursaries
-            year_pattern = r'202[0-3]'  # Matches years 2020-2023
-            if re.search(year_pattern, soup.find('header').get_text() if soup.find('header') else ''):
-                self.progress.update(task, advance=1)
-                return None
-
-            # Get closing date
-            closing_date = self.parse_closing_date(text_content)
-            
-            # Determine status
-            status = "Open"
-            if any(indicator in text_content.lower() for indicator in [
-                'applications closed',
-                'deadline has passed',
-                'no longer accepting'
-            ]):
-                status = "Closed"
-                
-            # Extract requirements
-            requirements = self.extract_requirements(soup)
-
-            result = {
-                'name': name,
-                'url': url,  # Include the URL for linking
-                'status': status,
-                'closing_date': closing_date,
-                'details': requirements,
-                'last_updated': datetime.now()
-            }
-
-            self.progress.update(task, advance=1)
-            return result
-
+            content, not_modified = self.fetch_page(url, detail_page=True)
+            if not_modified:
+                previous = self._reuse_previous_record(url, name)
+                if previous:
+                    return previous
+            return self.parse_bursary_page(content, url, name) if content else None
         except Exception as e:
             self.logger.error(f"Error processing {name} at {url}: {e}")
-            self.progress.update(task, advance=1)
             return None
+        finally:
+            self._advance(task)
+
+    def parse_bursary_page(self, content, url, name):
+        """Turn a fetched bursary page into a result record, or None if outdated."""
+        timings = {}
+        record = parse_bursary_page(content, url, name, self.parser_backend, self.detail_scope,
+                                    self.classifier, timings)
+        self.metrics.observe_many(timings)
+        return record
+
+    def _reuse_previous_record(self, url, name):
+        """Return the record from the previous run for an unchanged page."""
+        previous = self._previous_records.get(url)
+        self.metrics.cache_event('parsed_record', bool(previous))
+        if not previous:
+            return None
+        return previous.replace(name=name, updated_at=time.time())
 
-    def generate_report(self, field):
-        """Enhanced report generation with Rich formatting and better error handling."""
+    def _is_fresh(self, record, now, today, soon):
+        """True if a stored record can be served without re-checking the page.
+
+        New URLs, URLs whose stored record has expired and bursaries closing
+        between today and soon are re-checked; everything else is reused.
+        Bursaries whose deadline has passed wait for their record to expire.
+        """
+        if not record or record['expires_at'] <= now:
+            return False
+        deadline = closing_date_to_date(record['closing_date'])
+        return not (deadline and today <= deadline <= soon)
+
+    def _queue_links(self, bursary_links, task, incremental, reused):
+        """Yield the links to fetch as they arrive, growing the progress total.
+
+        Stored records are looked up per link (or taken from a prefetch), so
+        bursary_links may be a generator that is still discovering links.
+        With incremental=True fresh stored records go to reused instead.
+        """
+        now = time.time()
+        today = date.today()
+        soon = today + timedelta(days=self.near_deadline_days)
+        queued = 0
+        for name, url in bursary_links:
+            if self.journal and url in self.journal.records:
+                # Checked before the previous run was interrupted
+                self.bursary_data.append(self.journal.records[url].replace(name=name))
+                continue
+            if url not in self._previous_records:
+                record = self.store.get(url, include_expired=True)
+                if record:
+                    self._previous_records[url] = record
+            record = self._previous_records.get(url)
+            if incremental:
+                if self._is_fresh(record, now, today, soon):
+                    self.metrics.increment('record_store_hits')
+                    reused.append(record.replace(name=name))
+                    continue
+                self.metrics.increment('record_store_misses')
+            if self.journal:
+                self.journal.queued(name, url)
+            queued += 1
+            self.progress.update(task, total=queued)
+            yield name, url
+
+    def _add_result(self, record):
+        """Keep a finished record and journal it straight away."""
+        self.bursary_data.append(record)
+        if self.journal:
+            self.journal.done(record)
+
+    def _process_links_threaded(self, bursary_links, task):
+        """Check bursaries on a thread pool sharing the requests.Session."""
+        def check(name, url):
+            result = self.check_bursary_status(url, name, task)
+            if result:
+                self._add_result(result)
+
+        workers = self.max_concurrency if self.concurrency else self.max_workers
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        futures = []
+        try:
+            futures.extend(executor.submit(check, name, url) for name, url in bursary_links)
+
+            # Surface errors as checks complete
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    self.logger.error(f"Error processing bursary: {str(e)}")
+        finally:
+            # On an interrupt, drop the queued checks instead of running them all
+            # (by hand: shutdown(cancel_futures=True) needs Python 3.9)
+            for future in futures:
+                future.cancel()
+            executor.shutdown()
+
+    def _fetch_for_parse(self, job):
+        """Fetch stage of the parse pipeline for one (name, url) link."""
+        name, url = job
+        content, not_modified = self.fetch_page(url, detail_page=True)
+        if not_modified:
+            previous = self._reuse_previous_record(url, name)
+            if previous:
+                return 'record', (previous, None)
+        if not content:
+            return 'record', None
+        return 'parse', (content, url, name, self.parser_backend, self.detail_scope, self.classifier)
+
+    def _process_links_pipeline(self, bursary_links, task):
+        """Fetch on I/O threads and parse in a process pool."""
+        def on_result(job, result):
+            # Parse workers return (record, timings); failures arrive as None
+            record, timings = result or (None, None)
+            if timings:
+                self.metrics.observe_many(timings)
+            if record:
+                self._add_result(record)
+            self._advance(task)
+
+        pipeline = ParsePipeline(
+            io_workers=self.max_concurrency if self.concurrency else self.max_workers,
+            parse_workers=self.parse_workers,
+            queue_size=self.parse_queue_size
+        )
+        pipeline.run(bursary_links, self._fetch_for_parse, parse_bursary_page_timed, on_result)
+
+    def _process_links_async(self, bursary_links, task):
+        """Check bursaries with the asyncio engine, feeding the same parse path."""
+        names_by_url = {}
+        names_lock = threading.Lock()
+
+        def unique_urls():
+            # Links may still be arriving; each URL is fetched once for all the
+            # names queued before its page is handled. A name arriving after
+            # that fetches the URL again, as the other engines do
+            for name, url in bursary_links:
+                with names_lock:
+                    names = names_by_url.setdefault(url, [])
+                    names.append(name)
+                    if len(names) > 1:
+                        continue
+                yield url
+
+        def handle(url, fetched):
+            content, not_modified = None, False
+            if fetched:
+                status, text, headers, stopped = fetched
+                if stopped:
+                    # Partial bodies are parsed but never cached
+                    self.metrics.increment(f'stream_stopped_{stopped}')
+                    content = text
+                else:
+                    content, not_modified = self._resolve_response(url, status, text, headers)
+            with names_lock:
+                names = names_by_url.pop(url)
+            for name in names:
+                try:
+                    result = self._reuse_previous_record(url, name) if not_modified else None
+                    if not result and content:
+                        if parse_pool:
+                            result, timings = parse_pool.submit(
+                                parse_bursary_page_timed, content, url, name,
+                                self.parser_backend, self.detail_scope, self.classifier
+                            ).result()
+                            self.metrics.observe_many(timings)
+                        else:
+                            result = self.parse_bursary_page(content, url, name)
+                    if result:
+                        self._add_result(result)
+                except Exception as e:
+                    self.logger.error(f"Error processing {name} at {url}: {e}")
+                finally:
+                    self._advance(task)
+
+        pool_size = self.max_concurrency if self.concurrency else self.async_concurrency
+        fetcher = AsyncFetcher(
+            self.headers,
+            concurrency=pool_size,
+            per_host_limit=pool_size if self.concurrency else 10,
+            rate_limit=self.per_host_rate,
+            metrics=self.metrics,
+            controller=self.concurrency,
+            make_reader=functools.partial(self._page_reader, detail_page=True)
+            if self.stream_pages else None
+        )
+        request_headers = self.http_cache.conditional_headers if self.http_cache else None
+        parse_pool = None
+        if self.parse_workers:
+            parse_pool = concurrent.futures.ProcessPoolExecutor(max_workers=self.parse_workers)
+        try:
+            fetcher.run(unique_urls(), handle, request_headers)
+        finally:
+            if parse_pool:
+                parse_pool.shutdown()
+
+    def _journal_path_for(self, resume_key):
+        """journal_path with a suffix per resume key, e.g. bursary_journal-1a2b3c4d5e.jsonl.
+
+        One file per key, so a run for other fields (or a parallel worker)
+        never replaces the journal of an interrupted run.
+        """
+        root, ext = os.path.splitext(self.journal_path)
+        return f"{root}-{hashlib.sha1(resume_key.encode('utf-8')).hexdigest()[:10]}{ext}"
+
+    def crawl_links(self, bursary_links, incremental=False, resume_key=None):
+        """Check each (name, url) link and return the resulting records.
+
+        bursary_links may be a generator (see discover_links); each link is
+        queued for fetching as soon as it is yielded. With incremental=True
+        only new, stale or near-deadline bursaries are fetched; the rest are
+        served from the record store.
+
+        With a resume_key the crawl is journaled: if a crawl with the same
+        key was interrupted, its finished records are reused and its pending
+        links are queued first.
+        """
+        self._previous_records = {}
+        if isinstance(bursary_links, (list, tuple)):
+            # Stored records for a known list of URLs are read in one query
+            self._previous_records = self.store.get_many(
+                [url for _, url in bursary_links], include_expired=True
+            )
+        self.bursary_data = []
+        reused = []
+        self._crawl_started = time.perf_counter()
+
+        if self.journal_path and resume_key:
+            self.last_journal_path = self._journal_path_for(resume_key)
+            self.journal = CrawlJournal(self.last_journal_path, resume_key,
+                                        max_age=self.store.default_ttl)
+            if self.journal.resumed:
+                pending = self.journal.pending()
+                self.console.print(
+                    f"Resuming interrupted run: [green]{len(self.journal.records)}[/green] bursaries "
+                    f"already checked, [green]{len(pending)}[/green] pending"
+                )
+                requeued = {url for _, url in pending}
+                bursary_links = itertools.chain(
+                    pending, (link for link in bursary_links if link[1] not in requeued)
+                )
+
+        finished = False
         try:
-            category_url = self.get_category_url(field)
-            self.console.print(Panel(f"[bold]Checking bursaries for: [cyan]{field}"))
-            self.console.print(f"Category URL: [link={category_url}]{category_url}[/link]")
-            
-            bursary_links = self.extract_bursary_links(category_url)
-            
-            if not bursary_links:
-                self.console.print("[red]No bursary links found. Please check if the category exists.")
-                return
-                
-            self.console.print(f"Found [green]{len(bursary_links)}[/green] potential bursary links")
-            
-            # Clear previous data
-            self.bursary_data = []
-            
             # Create a single Progress instance
+            from rich.progress import Progress, SpinnerColumn, TimeElapsedColumn, TextColumn, BarColumn
             with Progress(
                 SpinnerColumn(),
                 TextColumn("[progress.description]{task.description}"),
                 BarColumn(),
                 TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
                 TimeElapsedColumn(),
+                TextColumn("[magenta]{task.fields[concurrency]}"),
                 console=self.console
             ) as progress:
                 self.progress = progress
-                task = progress.add_task("[cyan]Processing bursaries...", total=len(bursary_links))
-                
+                # The total grows as links are discovered
+                task = progress.add_task("[cyan]Processing bursaries...", total=None,
+                                         concurrency=self._concurrency_label())
+                links = self._queue_links(bursary_links, task, incremental, reused)
+
                 # Process bursaries with improved error handling
-                with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-                    futures = []
-                    for name, url in bursary_links:
-                        future = executor.submit(self.check_bursary_status, url, name, task)
-                        futures.append(future)
-                    
-                    # Handle results as they complete
-                    for future in concurrent.futures.as_completed(futures):
-                        try:
-                            result = future.result()
-                            if result:
-                                self.bursary_data.append(result)
-                        except Exception as e:
-                            self.logger.error(f"Error processing bursary: {str(e)}")
+                if self.fetch_engine == 'async' and AsyncFetcher.available():
+                    self._process_links_async(links, task)
+                else:
+                    if self.fetch_engine == 'async':
+                        self.logger.warning("aiohttp is not installed, falling back to thread pool")
+                    if self.parse_workers:
+                        self._process_links_pipeline(links, task)
+                    else:
+                        self._process_links_threaded(links, task)
+            finished = True
+        finally:
+            # Save to cache, even if interrupted
+            self.save_cached_data()
+            if self.journal:
+                # An unfinished crawl keeps its journal for the next run
+                if finished:
+                    self.journal.complete()
+                else:
+                    self.journal.close()
+                self.journal = None
+
+        if incremental:
+            checked = len(self.bursary_data)
+            self.console.print(
+                f"Re-checked [green]{checked}[/green] bursaries, "
+                f"[green]{len(reused)}[/green] unchanged served from cache"
+            )
+
+        self.bursary_data.extend(reused)
+        self._collapse_duplicates()
+        return self.bursary_data
+
+    def _collapse_duplicates(self):
+        """Drop near-duplicate records from bursary_data, remembering their URLs if asked."""
+        self.duplicate_of = {}
+        if not self.duplicate_detector:
+            return
+        with self.metrics.span('dedup'):
+            aliases = self.duplicate_detector.duplicates(self.bursary_data)
+        if not aliases:
+            return
+        if self.persist_aliases:
+            self.store.set_aliases(aliases, ttl=self.alias_ttl)
+        self.metrics.increment('near_duplicates', len(aliases))
+        self.bursary_data = [r for r in self.bursary_data if r['url'] not in aliases]
+        self.duplicate_of = aliases
+
+    def generate_report(self, field, incremental=False):
+        """Enhanced report generation with Rich formatting and better error handling.
+
+        With incremental=True only new, stale or near-deadline bursaries are
+        fetched; the rest are served from the record store.
+        """
+        self.metrics = CrawlMetrics()
+        try:
+            category_url = self.get_category_url(field)
+            self.console.print(Panel(f"[bold]Checking bursaries for: [cyan]{field}"))
+            self.console.print(f"Category URL: [link={category_url}]{category_url}[/link]")
             
-            # Filter valid and open bursaries
-            open_bursaries = [b for b in self.bursary_data if b and b['status'] == 'Open']
+            # Detail pages are fetched while later listing pages are still being read
+            links_by_field = {}
+            self.crawl_links(self.discover_links([field], links_by_field=links_by_field), incremental,
+                             resume_key=f"report:{field}")
+
+            if not links_by_field:
+                self.console.print("[red]No bursary links found. Please check if the category exists.")
+                return
+
+            self.console.print(f"Found [green]{len(links_by_field[field])}[/green] potential bursary links")
+            self.store.add_category([b['url'] for b in self.bursary_data], field)
+
+            # Filter valid and open bursaries, closing soonest first
+            open_bursaries = sorted((b for b in self.bursary_data if b and b['status'] == 'Open'),
+                                    key=deadline_sort_key)
             
             if not open_bursaries:
                 self.console.print("[yellow]No open bursaries found for this category.")
                 return
 
-            # Generate PDF report
-            self._generate_pdf_report(field, open_bursaries)
-            
-            # Save to cache
-            self.save_cached_data()
-            
-            # Display console summary
-            self._display_console_summary(open_bursaries)
+            # Reports and the console summary come from one pass over the records
+            self._write_reports(field, open_bursaries, summary=True)
 
         except Exception as e:
             self.logger.error(f"Error in generate_report: {str(e)}")
             self.console.print(f"[red]An error occurred: {str(e)}")
             self.console.print("[red]Please check the log file for details.")
-    
+        finally:
+            self._write_metrics('single', [field])
+
+    def crawl_fields(self, fields, incremental=False, include_sitemap=False):
+        """Crawl several fields, fetching each bursary URL only once.
+
+        Returns ({field: records}, records); a bursary listed under several
+        fields appears in each field's list under that field's link text.
+        With include_sitemap=True bursaries found only in the sitemap are
+        crawled too; they appear in records but under no field.
+        """
+        self.console.print(Panel(f"[bold]Checking [cyan]{len(fields)}[/cyan] categories"))
+
+        # Listing pages are read while detail pages are already being fetched
+        links_by_field = {}
+        resume_key = f"fields:{','.join(fields)}" + (':sitemap' if include_sitemap else '')
+        records = self.crawl_links(
+            self.discover_links(fields, include_sitemap, links_by_field), incremental, resume_key
+        )
+        for field in fields:
+            if field not in links_by_field:
+                self.console.print(f"[yellow]No bursary links found for {field}")
+        if not records and not links_by_field:
+            return {}, []
+
+        total_links = sum(len(links) for links in links_by_field.values())
+        self.console.print(
+            f"Checked [green]{len(records)}[/green] unique bursaries from {total_links} category links"
+        )
+        records_by_url = {r['url']: r for r in records}
+
+        records_by_field = {}
+        for field, links in links_by_field.items():
+            field_records, listed = [], set()
+            for name, url in links:
+                url = self.duplicate_of.get(url, url)
+                if url in records_by_url and url not in listed:
+                    listed.add(url)
+                    field_records.append(records_by_url[url].replace(name=name))
+            self.store.add_category([r['url'] for r in field_records], field)
+            records_by_field[field] = field_records
+        return records_by_field, records
+
+    def refresh_fields(self, fields, incremental=True):
+        """Crawl fields without writing reports; returns {field: records}.
+
+        Used by the service mode; each call writes its own metrics line.
+        """
+        self.metrics = CrawlMetrics()
+        try:
+            records_by_field, _ = self.crawl_fields(fields, incremental)
+            return records_by_field
+        finally:
+            self._write_metrics('refresh', list(fields))
+
+    def generate_batch_report(self, fields, incremental=False, include_sitemap=False):
+        """Crawl several fields in one run, fetching each bursary URL only once.
+
+        Writes one report per field plus a combined 'All Categories' report,
+        which also holds sitemap-only bursaries when include_sitemap=True.
+        The PDFs are rendered together, in parallel (see _write_batch_reports).
+        """
+        self.metrics = CrawlMetrics()
+        try:
+            records_by_field, records = self.crawl_fields(fields, incremental, include_sitemap)
+            if not records_by_field:
+                self.console.print("[red]No bursary links found in any category.")
+                return
 
-def main():
+            reports = []
+            for field, field_records in records_by_field.items():
+                open_bursaries = sorted((b for b in field_records if b['status'] == 'Open'),
+                                        key=deadline_sort_key)
+                if open_bursaries:
+                    reports.append((field, open_bursaries, False))
+                else:
+                    self.console.print(f"[yellow]No open bursaries found for {field}.")
+
+            all_open = sorted((b for b in records if b['status'] == 'Open'), key=deadline_sort_key)
+            if all_open:
+                reports.append(('All Categories', all_open, True))
+            else:
+                self.console.print("[yellow]No open bursaries found in any category.")
+            self._write_batch_reports(reports)
+
+        except Exception as e:
+            self.logger.error(f"Error in generate_batch_report: {str(e)}")
+            self.console.print(f"[red]An error occurred: {str(e)}")
+            self.console.print("[red]Please check the log file for details.")
+        finally:
+            self._write_metrics('batch', list(fields))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Find open bursaries in South Africa.")
+    parser.add_argument('--batch', metavar='FIELDS',
+                        help='non-interactive: "all" or a comma-separated list of fields '
+                             '(with --serve: the fields to serve)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='only re-check new, stale or near-deadline bursaries')
+    parser.add_argument('--formats', default='pdf',
+                        help='comma-separated report formats: pdf, csv, jsonl, json, html, parquet '
+                             '(default pdf)')
+    parser.add_argument('--sitemap', action='store_true',
+                        help='with --batch: also check bursaries listed only in the site sitemap')
+    parser.add_argument('--parser', default='html.parser', choices=PARSERS,
+                        help='HTML parser backend: html.parser (default), lxml (faster; may read '
+                             'malformed pages differently) or html5lib')
+    parser.add_argument('--shared-cache', action='store_true',
+                        help='share http_cache/ with other checker processes running at the same time')
+    parser.add_argument('--cache-server', metavar='URL',
+                        help='share the response cache through a cache_server.py at URL')
+    parser.add_argument('--serve', action='store_true',
+                        help='run as a service answering JSON queries, refreshing in the background')
+    parser.add_argument('--host', default='127.0.0.1', help='service address (default 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8080, help='service port (default 8080)')
+    parser.add_argument('--refresh-hours', type=float, default=6,
+                        help='hours between background refreshes in service mode (default 6)')
+    args = parser.parse_args(argv)
+    formats = [fmt.strip() for fmt in args.formats.split(',') if fmt.strip()]
+    unknown = [fmt for fmt in formats if fmt not in WRITERS]
+    if unknown:
+        parser.error(f"unknown report format: {', '.join(unknown)}")
+
+    console = Console()  # Initialize console for main function
+    generator = None
     try:
         base_url = "https://www.zabursaries.co.za"
-        generator = BursaryReportGenerator(base_url)
-        console = Console()  # Initialize console for main function
+        generator = BursaryReportGenerator(base_url, output_formats=formats, parser_backend=args.parser,
+                                           shared_cache=args.shared_cache,
+                                           cache_server=args.cache_server)
+
+        if args.serve:
+            from service import BursaryService
+            # Progress bars would only clutter the service's output
+            generator.console = Console(quiet=True)
+            fields = resolve_fields(args.batch) if args.batch else FIELDS
+            service = BursaryService(generator, fields, refresh_interval=args.refresh_hours * 3600,
+                                     host=args.host, port=args.port)
+            service.serve_forever()
+            return
+
+        if args.batch:
+            generator.generate_batch_report(resolve_fields(args.batch), incremental=args.incremental,
+                                            include_sitemap=args.sitemap)
+            return
 
         console.print("[bold cyan]Select a field of study:")
-        fields = ["Accounting", "Arts", "Commerce", "Computer Science & IT", 
-                 "Construction & Built Environment", "Education", "Engineering", 
-                 "General", "Government", "International", "Law", "Medical", 
-                 "Postgraduate", "Science"]
+        fields = FIELDS
         
         for i, field in enumerate(fields, start=1):
             console.print(f"{i}. {field}")
@@ -449,10 +978,12 @@ def main():
                 console.print("[red]Please enter a valid number")
 
         field_of_study = fields[choice - 1]
-        generator.generate_report(field_of_study)
+        generator.generate_report(field_of_study, incremental=args.incremental)
 
     except KeyboardInterrupt:
         console.print("\n[yellow]Operation cancelled by user")
+        if generator and generator.last_journal_path and os.path.exists(generator.last_journal_path):
+            console.print("[yellow]Checked bursaries were saved; run the same command again to resume.")
     except Exception as e:
         logging.error(f"Unexpected error: {e}")
         console.print("[red]An error occurred. Please check the log file for details.")
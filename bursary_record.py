@@ -0,0 +1,305 @@
+"""Compact bursary records and their columnar bulk form.
+
+BursaryRecord replaces the per-bursary dict. It uses __slots__, interns
+status and closing-date strings, and keeps requirements as a tuple of
+bullets drawn from a shared pool, so a bullet that appears on many pages
+is stored once. last_updated is a float timestamp and the parsed deadline
+is cached as a date ordinal. Records still support record['name'],
+record.get(...) and dict(record), so report and store code read them like
+the old dicts.
+
+RecordColumns holds many records as parallel lists and arrays with small
+integer codes for repeated values, and serializes them to one bytes blob
+without pickling individual objects.
+"""
+import json
+import math
+import struct
+import sys
+from array import array
+from datetime import datetime
+
+from closing_dates import closing_date_to_date
+
+
+NO_REQUIREMENTS = "No specific requirements listed"
+REQUIREMENTS_PREFIX = "Requirements:\n• "
+BULLET_SEPARATOR = "\n• "
+
+# Bullet texts seen since the last new_bullet_pool(), so equal bullets share one string
+_bullets = {}
+
+
+def intern_text(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def shared_bullet(text):
+    return _bullets.setdefault(text, text)
+
+
+def new_bullet_pool():
+    """Start an empty bullet pool.
+
+    Long-running processes call this once per refresh, so the pool holds the
+    bullets of the current records, not of every page ever scraped. Older
+    records keep their strings until they are dropped themselves.
+    """
+    global _bullets
+    _bullets = {}
+
+
+def split_details(details):
+    """Turn a formatted details string into a tuple of shared bullets.
+
+    Text that is not a bullet list is kept as-is (interned) and returned as
+    a str, so details always round-trip exactly.
+    """
+    if not details or details == NO_REQUIREMENTS:
+        return ()
+    if details.startswith(REQUIREMENTS_PREFIX):
+        return tuple(shared_bullet(b) for b in details[len(REQUIREMENTS_PREFIX):].split(BULLET_SEPARATOR))
+    return intern_text(details)
+
+
+def join_details(requirements):
+    if isinstance(requirements, str):
+        return requirements
+    if not requirements:
+        return NO_REQUIREMENTS
+    return REQUIREMENTS_PREFIX + BULLET_SEPARATOR.join(requirements)
+
+
+def _timestamp(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).timestamp()
+    return float(value)
+
+
+class BursaryRecord:
+    """One checked bursary, readable like the dicts it replaces."""
+
+    __slots__ = ('name', 'url', 'status', 'closing_date', 'requirements', 'updated_at',
+                 'expires_at', '_deadline')
+
+    KEYS = ('name', 'url', 'status', 'closing_date', 'details', 'last_updated')
+
+    def __init__(self, name, url, status, closing_date=None, requirements=(), updated_at=None,
+                 expires_at=None):
+        self.name = name
+        self.url = url
+        self.status = intern_text(status)
+        self.closing_date = intern_text(closing_date)
+        self.requirements = (requirements if isinstance(requirements, str)
+                             else tuple(shared_bullet(b) for b in requirements))
+        self.updated_at = updated_at
+        self.expires_at = expires_at
+        self._deadline = -1
+
+    @classmethod
+    def from_dict(cls, record):
+        return cls(
+            record['name'], record['url'], record.get('status'),
+            None if record.get('closing_date') is None else str(record['closing_date']),
+            split_details(record.get('details')),
+            _timestamp(record.get('last_updated')),
+            record.get('expires_at'),
+        )
+
+    @property
+    def details(self):
+        return join_details(self.requirements)
+
+    @property
+    def last_updated(self):
+        return None if self.updated_at is None else datetime.fromtimestamp(self.updated_at)
+
+    @property
+    def deadline(self):
+        """Closing date as a date ordinal, 0 if there is none; parsed once."""
+        if self._deadline < 0:
+            parsed = closing_date_to_date(self.closing_date)
+            self._deadline = parsed.toordinal() if parsed else 0
+        return self._deadline
+
+    def replace(self, **changes):
+        """Return a copy with some fields changed (dict keys accepted)."""
+        if 'details' in changes:
+            changes['requirements'] = split_details(changes.pop('details'))
+        if 'last_updated' in changes:
+            changes['updated_at'] = _timestamp(changes.pop('last_updated'))
+        values = {slot: getattr(self, slot) for slot in self.__slots__ if slot != '_deadline'}
+        values.update(changes)
+        record = BursaryRecord(**values)
+        if 'closing_date' not in changes:
+            record._deadline = self._deadline
+        return record
+
+    # Mapping-style access, so dict(record) and record['status'] keep working
+    def keys(self):
+        return self.KEYS + (('expires_at',) if self.expires_at is not None else ())
+
+    def __getitem__(self, key):
+        if key not in self.KEYS and key != 'expires_at':
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return key in self.keys()
+
+    def to_dict(self):
+        return {key: self[key] for key in self.keys()}
+
+    def __eq__(self, other):
+        if not isinstance(other, BursaryRecord):
+            return NotImplemented
+        return all(getattr(self, s) == getattr(other, s) for s in self.__slots__ if s != '_deadline')
+
+    def __repr__(self):
+        return f"BursaryRecord({self.name!r}, {self.url!r}, {self.status!r}, {self.closing_date!r})"
+
+    def __reduce__(self):
+        # Rebuild through __init__ so the receiving process interns and shares bullets
+        return (BursaryRecord, (self.name, self.url, self.status, self.closing_date,
+                                self.requirements, self.updated_at, self.expires_at))
+
+
+class _Codes:
+    """Assigns small integer codes to repeated values."""
+
+    def __init__(self, values=()):
+        self.values = list(values)
+        self.codes = {value: i for i, value in enumerate(self.values)}
+
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class RecordColumns:
+    """Column-oriented bulk form of many BursaryRecords.
+
+    Repeated strings (status, closing date, bullets, free-text details) are
+    stored once and referenced by code; numbers live in typed arrays.
+    """
+
+    MAGIC = b'BRC1'
+    ARRAYS = (('status', 'I'), ('closing', 'I'), ('deadline', 'i'), ('updated', 'd'),
+              ('expires', 'd'), ('req_offsets', 'I'), ('req_codes', 'I'), ('raw_details', 'i'),
+              ('field_offsets', 'I'), ('field_codes', 'I'))
+
+    def __init__(self):
+        self.names = []
+        self.urls = []
+        self.strings = _Codes([None])  # status / closing-date / field / raw-details table
+        self.bullets = _Codes()
+        self.columns = {name: array(code) for name, code in self.ARRAYS}
+        self.columns['req_offsets'].append(0)
+        self.columns['field_offsets'].append(0)
+
+    def __len__(self):
+        return len(self.urls)
+
+    def append(self, record, fields=()):
+        """Add a record, optionally with the fields of study it is listed under."""
+        if not isinstance(record, BursaryRecord):
+            record = BursaryRecord.from_dict(record)
+        columns = self.columns
+        self.names.append(record.name)
+        self.urls.append(record.url)
+        columns['status'].append(self.strings.code(record.status))
+        columns['closing'].append(self.strings.code(record.closing_date))
+        columns['deadline'].append(record.deadline)
+        columns['updated'].append(math.nan if record.updated_at is None else record.updated_at)
+        columns['expires'].append(math.nan if record.expires_at is None else record.expires_at)
+        if isinstance(record.requirements, str):
+            columns['raw_details'].append(self.strings.code(record.requirements))
+        else:
+            columns['raw_details'].append(-1)
+            columns['req_codes'].extend(self.bullets.code(b) for b in record.requirements)
+        columns['req_offsets'].append(len(columns['req_codes']))
+        columns['field_codes'].extend(self.strings.code(field) for field in fields)
+        columns['field_offsets'].append(len(columns['field_codes']))
+
+    @classmethod
+    def from_records(cls, records, fields_for=None):
+        """Build columns from records; fields_for(record) gives each record's fields."""
+        columns = cls()
+        for record in records:
+            columns.append(record, fields_for(record) if fields_for else ())
+        return columns
+
+    def fields(self, i):
+        start, end = self.columns['field_offsets'][i], self.columns['field_offsets'][i + 1]
+        return [self.strings.values[code] for code in self.columns['field_codes'][start:end]]
+
+    def record(self, i):
+        columns = self.columns
+        strings = self.strings.values
+        raw = columns['raw_details'][i]
+        if raw >= 0:
+            requirements = strings[raw]
+        else:
+            bullets = self.bullets.values
+            start, end = columns['req_offsets'][i], columns['req_offsets'][i + 1]
+            requirements = tuple(bullets[code] for code in columns['req_codes'][start:end])
+        updated, expires = columns['updated'][i], columns['expires'][i]
+        record = BursaryRecord(
+            self.names[i], self.urls[i], strings[columns['status'][i]],
+            strings[columns['closing'][i]], requirements,
+            None if math.isnan(updated) else updated,
+            None if math.isnan(expires) else expires,
+        )
+        record._deadline = columns['deadline'][i]
+        return record
+
+    def __iter__(self):
+        return (self.record(i) for i in range(len(self)))
+
+    def to_bytes(self):
+        """Serialize as MAGIC, a length-prefixed JSON string table, then the raw arrays.
+
+        Arrays are written in native byte order; snapshots are a local cache,
+        not an exchange format.
+        """
+        header = json.dumps({
+            'names': self.names, 'urls': self.urls,
+            'strings': self.strings.values, 'bullets': self.bullets.values,
+            'lengths': [len(self.columns[name]) for name, _ in self.ARRAYS],
+        }, ensure_ascii=False).encode('utf-8')
+        parts = [self.MAGIC, struct.pack('<I', len(header)), header]
+        parts.extend(self.columns[name].tobytes() for name, _ in self.ARRAYS)
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if data[:4] != cls.MAGIC:
+            raise ValueError("Not a bursary record snapshot")
+        size, = struct.unpack_from('<I', data, 4)
+        header = json.loads(data[8:8 + size].decode('utf-8'))
+        columns = cls()
+        columns.names = header['names']
+        columns.urls = header['urls']
+        columns.strings = _Codes(intern_text(s) for s in header['strings'])
+        columns.bullets = _Codes(shared_bullet(b) for b in header['bullets'])
+        offset = 8 + size
+        for (name, code), length in zip(cls.ARRAYS, header['lengths']):
+            column = array(code)
+            end = offset + length * column.itemsize
+            column.frombytes(data[offset:end])
+            columns.columns[name] = column
+            offset = end
+        return columns
@@ -0,0 +1,191 @@
+"""SQLite-backed store for bursary records.
+
+Records are keyed by URL and indexed by category and closing date. Each
+record carries its own expiry time, so stale entries age out one at a time
+instead of the whole cache expiring at once, and callers load only the
+records they need (one category, a set of URLs) rather than everything.
+"""
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from bursary_record import BursaryRecord, split_details
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bursaries (
+    url TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    status TEXT,
+    closing_date TEXT,
+    details TEXT,
+    last_updated TEXT,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS bursary_categories (
+    url TEXT NOT NULL REFERENCES bursaries(url) ON DELETE CASCADE,
+    category TEXT NOT NULL,
+    PRIMARY KEY (url, category)
+);
+CREATE TABLE IF NOT EXISTS bursary_aliases (
+    url TEXT PRIMARY KEY,
+    canonical_url TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_bursaries_closing_date ON bursaries(closing_date);
+CREATE INDEX IF NOT EXISTS idx_bursaries_expires_at ON bursaries(expires_at);
+CREATE INDEX IF NOT EXISTS idx_categories_category ON bursary_categories(category);
+"""
+
+COLUMNS = ('url', 'name', 'status', 'closing_date', 'details', 'last_updated', 'expires_at')
+
+
+class BursaryStore:
+    """Keyed bursary record store with per-record TTLs and partial loads."""
+
+    def __init__(self, path='bursary_data.db', default_ttl=86400):
+        self.path = path
+        self.default_ttl = default_ttl
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        # Other checker processes may hold the write lock; wait for it rather than fail
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA foreign_keys=ON')
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def _to_row(self, record, ttl):
+        last_updated = record.get('last_updated')
+        if isinstance(last_updated, datetime):
+            last_updated = last_updated.isoformat()
+        closing_date = record.get('closing_date')
+        return (
+            record['url'],
+            record['name'],
+            record.get('status'),
+            None if closing_date is None else str(closing_date),
+            record.get('details'),
+            last_updated,
+            time.time() + (self.default_ttl if ttl is None else ttl)
+        )
+
+    @staticmethod
+    def _from_row(row):
+        url, name, status, closing_date, details, last_updated, expires_at = row
+        return BursaryRecord(
+            name, url, status, closing_date, split_details(details),
+            datetime.fromisoformat(last_updated).timestamp() if last_updated else None,
+            expires_at
+        )
+
+    def upsert(self, record, category=None, ttl=None):
+        """Insert or replace one record, optionally tagging it with a category."""
+        self.upsert_many([record], category, ttl)
+
+    def upsert_many(self, records, category=None, ttl=None):
+        """Insert or replace records in a single transaction."""
+        rows = [self._to_row(r, ttl) for r in records if r]
+        if not rows:
+            return
+        with self._lock, self.conn:
+            self.conn.executemany(
+                'INSERT INTO bursaries (url, name, status, closing_date, details, last_updated, expires_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT(url) DO UPDATE SET name=excluded.name, status=excluded.status, '
+                'closing_date=excluded.closing_date, details=excluded.details, '
+                'last_updated=excluded.last_updated, expires_at=excluded.expires_at',
+                rows
+            )
+            if category:
+                self.conn.executemany(
+                    'INSERT OR IGNORE INTO bursary_categories (url, category) VALUES (?, ?)',
+                    [(row[0], category) for row in rows]
+                )
+
+    def add_category(self, urls, category):
+        """File already-stored URLs under an additional category."""
+        with self._lock, self.conn:
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO bursary_categories (url, category) '
+                'SELECT url, ? FROM bursaries WHERE url = ?',
+                [(category, url) for url in urls]
+            )
+
+    def get(self, url, include_expired=False):
+        """Return the record stored for url, or None."""
+        records = self.get_many([url], include_expired)
+        return records.get(url)
+
+    def get_many(self, urls, include_expired=False):
+        """Return a {url: record} dict for the given URLs that are stored."""
+        urls = list(dict.fromkeys(urls))
+        found = {}
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(urls), 500):
+            chunk = urls[start:start + 500]
+            query = f"SELECT {', '.join(COLUMNS)} FROM bursaries WHERE url IN ({', '.join('?' * len(chunk))})"
+            params = list(chunk)
+            if not include_expired:
+                query += ' AND expires_at > ?'
+                params.append(time.time())
+            with self._lock:
+                rows = self.conn.execute(query, params).fetchall()
+            for row in rows:
+                found[row[0]] = self._from_row(row)
+        return found
+
+    def load(self, category=None, include_expired=False):
+        """Load records, optionally only those filed under category."""
+        columns = ', '.join(f'b.{c}' for c in COLUMNS)
+        if category:
+            query = (f'SELECT {columns} FROM bursaries b '
+                     'JOIN bursary_categories c ON c.url = b.url WHERE c.category = ?')
+            params = [category]
+        else:
+            query = f'SELECT {columns} FROM bursaries b WHERE 1=1'
+            params = []
+        if not include_expired:
+            query += ' AND b.expires_at > ?'
+            params.append(time.time())
+        with self._lock:
+            rows = self.conn.execute(query, params).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def categories_for(self, url):
+        """Return the categories a URL has been filed under."""
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT category FROM bursary_categories WHERE url = ? ORDER BY category', (url,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def set_aliases(self, aliases, ttl=None):
+        """Record {duplicate_url: canonical_url} pairs found by near-duplicate detection."""
+        expires_at = time.time() + (self.default_ttl if ttl is None else ttl)
+        with self._lock, self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO bursary_aliases (url, canonical_url, expires_at) VALUES (?, ?, ?)',
+                [(url, canonical, expires_at) for url, canonical in aliases.items()]
+            )
+
+    def load_aliases(self):
+        """Return the unexpired {duplicate_url: canonical_url} map."""
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT url, canonical_url FROM bursary_aliases WHERE expires_at > ?', (time.time(),)
+            ).fetchall()
+        return dict(rows)
+
+    def delete_expired(self):
+        """Drop every record whose TTL has run out; returns how many were removed."""
+        with self._lock, self.conn:
+            cursor = self.conn.execute('DELETE FROM bursaries WHERE expires_at <= ?', (time.time(),))
+            self.conn.execute('DELETE FROM bursary_aliases WHERE expires_at <= ?', (time.time(),))
+        return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,267 @@
+"""A small HTTP server sharing one response cache between checker hosts.
+
+Workers on machines that do not share a filesystem point cache_server= at
+this server instead of a cache directory. It keeps entries and fetch leases
+in a SharedResponseCache on its own disk, so it behaves exactly like a
+shared directory, and RemoteResponseCache is the client side.
+
+    python cache_server.py --port 8790 --directory http_cache
+    python bursary_checker.py --batch Engineering --cache-server http://cachehost:8790
+
+    GET    /entry?url=U                  validators and fetch time, 404 if none
+    GET    /body?url=U[&max_age=S]       stored body (only if fresh, with max_age)
+    PUT    /body?url=U[&owner=W]         store a body; JSON {body, etag, last_modified}
+    POST   /touch?url=U[&owner=W]        mark an entry revalidated now
+    POST   /lease?url=U&owner=W          200 and the entry if leased to W, 409 if
+                                         already held or fresh
+    DELETE /lease?url=U&owner=W          end W's lease
+    GET    /wait?url=U&timeout=S         wait for the lease to end, then as /body
+
+Passing owner to PUT /body or POST /touch also ends W's lease, which saves
+the client a round trip per page.
+"""
+import argparse
+import http.server
+import json
+import logging
+from urllib.parse import parse_qs, urlparse
+
+from shared_cache import SharedResponseCache, worker_id
+
+
+class CacheServer:
+    """Serve a SharedResponseCache directory over HTTP."""
+
+    def __init__(self, directory='http_cache', host='127.0.0.1', port=8790, fresh_for=600,
+                 lease_ttl=60, max_wait=60):
+        self.cache = SharedResponseCache(directory, fresh_for=fresh_for, lease_ttl=lease_ttl)
+        # Longest a /wait request is held open; clients poll again after that
+        self.max_wait = max_wait
+        self.logger = logging.getLogger(__name__)
+        self.httpd = http.server.ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://{host}:{self.httpd.server_address[1]}"
+
+    def _handler_class(self):
+        server = self
+        cache = self.cache
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out in separate writes; with Nagle on, the
+            # body waits for the client's delayed ACK (~40 ms per call)
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status, body=b'', content_type='application/json'):
+                if not isinstance(body, bytes):
+                    body = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_body(self, body):
+                if body is None:
+                    self._send(404, {'error': 'not cached'})
+                else:
+                    self._send(200, body.encode('utf-8'), 'text/html; charset=utf-8')
+
+            def _route(self):
+                parsed = urlparse(self.path)
+                query = {name: values[0] for name, values in parse_qs(parsed.query).items()}
+                if 'url' not in query:
+                    raise ValueError("url is required")
+                return parsed.path.rstrip('/'), query
+
+            def _handle(self, method):
+                try:
+                    path, query = self._route()
+                    url = query['url']
+                    if method == 'GET' and path == '/entry':
+                        entry = cache.get(url)
+                        if entry:
+                            self._send(200, entry)
+                        else:
+                            self._send(404, {'error': 'not cached'})
+                    elif method == 'GET' and path == '/body':
+                        if 'max_age' in query:
+                            self._send_body(cache.fresh_body(url, float(query['max_age'])))
+                        else:
+                            self._send_body(cache.load_body(url) if cache.get(url) else None)
+                    elif method == 'PUT' and path == '/body':
+                        length = int(self.headers.get('Content-Length', 0))
+                        data = json.loads(self.rfile.read(length))
+                        cache.store(url, data['body'], {'ETag': data.get('etag'),
+                                                        'Last-Modified': data.get('last_modified')})
+                        if 'owner' in query:
+                            cache.release(url, query['owner'])
+                        self._send(204)
+                    elif method == 'POST' and path == '/touch':
+                        cache.touch(url)
+                        if 'owner' in query:
+                            cache.release(url, query['owner'])
+                        self._send(204)
+                    elif method == 'POST' and path == '/lease':
+                        if cache.acquire(url, query['owner']):
+                            # The validators the lease holder will revalidate with
+                            self._send(200, {'acquired': True, 'entry': cache.get(url)})
+                        else:
+                            self._send(409, {'acquired': False})
+                    elif method == 'DELETE' and path == '/lease':
+                        cache.release(url, query.get('owner'))
+                        self._send(204)
+                    elif method == 'GET' and path == '/wait':
+                        timeout = min(float(query.get('timeout', server.max_wait)), server.max_wait)
+                        self._send_body(cache.wait(url, timeout))
+                    else:
+                        self._send(404, {'error': 'not found'})
+                except (ValueError, KeyError) as e:
+                    self._send(400, {'error': str(e)})
+                except Exception as e:
+                    server.logger.error(f"Error handling {self.path}: {e}")
+                    self._send(500, {'error': 'internal error'})
+
+            def do_GET(self):
+                self._handle('GET')
+
+            def do_PUT(self):
+                self._handle('PUT')
+
+            def do_POST(self):
+                self._handle('POST')
+
+            def do_DELETE(self):
+                self._handle('DELETE')
+
+        return Handler
+
+    def serve_forever(self):
+        try:
+            self.httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.httpd.server_close()
+
+
+class RemoteResponseCache:
+    """Client for a CacheServer, with the same methods as SharedResponseCache.
+
+    If the server cannot be reached the error is logged and the worker
+    simply fetches the page itself.
+    """
+
+    shared = True
+
+    def __init__(self, base_url, fresh_for=600, lease_ttl=60, timeout=5):
+        import requests
+        self.base_url = base_url.rstrip('/')
+        self.fresh_for = fresh_for
+        self.lease_ttl = lease_ttl
+        self.timeout = timeout
+        self.owner = worker_id()
+        self.logger = logging.getLogger(__name__)
+        self.session = requests.Session()
+        # URLs this worker holds the lease on, and the entries sent with the leases
+        self._leases = set()
+        self._entries = {}
+
+    def _call(self, method, path, url, timeout=None, **kwargs):
+        """The response to one request, or None if the server could not be reached."""
+        params = dict(kwargs.pop('params', {}), url=url)
+        try:
+            return self.session.request(method, f"{self.base_url}{path}", params=params,
+                                        timeout=timeout or self.timeout, **kwargs)
+        except Exception as e:
+            self.logger.error(f"Error calling cache server {path} for {url}: {e}")
+            return None
+
+    def get(self, url):
+        if url in self._leases:
+            return self._entries.get(url)
+        response = self._call('GET', '/entry', url)
+        return response.json() if response is not None and response.status_code == 200 else None
+
+    def conditional_headers(self, url):
+        entry = self.get(url)
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    @staticmethod
+    def _text(response):
+        return response.text if response is not None and response.status_code == 200 else None
+
+    def load_body(self, url):
+        return self._text(self._call('GET', '/body', url))
+
+    def fresh_body(self, url, max_age=None):
+        max_age = self.fresh_for if max_age is None else max_age
+        return self._text(self._call('GET', '/body', url, params={'max_age': max_age}))
+
+    def _end_lease(self, url):
+        """Forget this worker's lease on url; returns the params that end it."""
+        if url not in self._leases:
+            return {}
+        self._leases.discard(url)
+        self._entries.pop(url, None)
+        return {'owner': self.owner}
+
+    def store(self, url, body, headers):
+        self._call('PUT', '/body', url, params=self._end_lease(url), json={
+            'body': body,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+        })
+
+    def touch(self, url):
+        self._call('POST', '/touch', url, params=self._end_lease(url))
+
+    def acquire(self, url):
+        response = self._call('POST', '/lease', url, params={'owner': self.owner})
+        if response is None:
+            # Without the server there is nobody to coordinate with: fetch
+            return True
+        if response.status_code != 200:
+            return False
+        self._entries[url] = response.json().get('entry')
+        self._leases.add(url)
+        return True
+
+    def release(self, url):
+        params = self._end_lease(url)
+        if params:
+            self._call('DELETE', '/lease', url, params=params)
+
+    def wait(self, url, timeout=None):
+        timeout = self.lease_ttl if timeout is None else timeout
+        return self._text(self._call('GET', '/wait', url, timeout=timeout + self.timeout,
+                                     params={'timeout': timeout}))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--directory', default='http_cache', help='cache directory (default http_cache)')
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on (default 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8790, help='port (default 8790)')
+    parser.add_argument('--fresh-for', type=float, default=600,
+                        help='seconds a fetched body is served without refetching (default 600)')
+    parser.add_argument('--lease-ttl', type=float, default=60,
+                        help='seconds before an unreleased fetch lease expires (default 60)')
+    args = parser.parse_args(argv)
+
+    server = CacheServer(args.directory, args.host, args.port, args.fresh_for, args.lease_ttl)
+    print(f"Serving the response cache in {args.directory} at {server.base_url}")
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+"""Compiled rule engine for bursary pages and category links.
+
+The keyword tables (excluded terms, link keywords, closed indicators, the
+closing-date phrases) are plain data in DEFAULT_RULES and can be overridden
+per generator. RuleClassifier compiles them once into combined regular
+expressions so each page or link is scanned in a single pass.
+"""
+import json
+import re
+from collections import namedtuple
+from datetime import date
+
+from closing_dates import MONTH_PATTERN, ROLLING_DEADLINE, parse_deadline
+
+
+DEFAULT_RULES = {
+    # Links whose href + text mention these are never bursaries
+    'excluded_terms': [
+        'sassa payment dates',
+        'srd grant payment',
+        'post office payment',
+        'cash point location'
+    ],
+    # A link must mention one of these to count as a bursary
+    'link_keywords': ['bursary', 'scholarship', 'fellowship'],
+    # Listing and news pages that mention bursaries in their href
+    'excluded_href_terms': ['view-all', 'news'],
+    'year_round_phrases': [
+        'open all year round',
+        'open throughout the year',
+        'applications are open all year'
+    ],
+    'window_pattern': r'applications are open between ([a-z]+) and ([a-z]+) each year',
+    # Phrases that introduce an explicit closing date, in priority order
+    'date_prefixes': [
+        r'closing date[:\s]*',
+        r'deadline[:\s]*',
+        r'applications? close[:\s]*'
+    ],
+    # "15th March 2025", "15 March" or "March 15, 2025"; a missing year is inferred
+    'date_value': (rf'\d{{1,2}}(?:st|nd|rd|th)?\s+{MONTH_PATTERN}\b(?:,?\s+\d{{4}})?'
+                   rf'|{MONTH_PATTERN}\s+\d{{1,2}}(?:st|nd|rd|th)?\b(?:,?\s+\d{{4}})?'),
+    'closed_indicators': [
+        'applications closed',
+        'deadline has passed',
+        'no longer accepting'
+    ],
+    # A page header naming a year more than this many years before the current
+    # one marks the post as outdated; set outdated_header_pattern to override
+    'outdated_header_age': 1,
+    'outdated_header_pattern': None
+}
+
+PageClassification = namedtuple('PageClassification',
+                                 ['closing_date', 'schedule', 'status', 'deadline'])
+
+
+def outdated_years_pattern(age, today=None):
+    """Regex matching the years 2000 up to (current year - age - 1)."""
+    last = (today or date.today()).year - age - 1
+    years = '|'.join(str(year) for year in range(2000, last + 1))
+    return rf'\b(?:{years})\b' if years else r'(?!)'
+
+
+
+def load_rules(path):
+    """Load rule overrides from a JSON file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+# Matches nothing; stands in for an empty rule table, since an empty
+# alternative would match at every position
+NEVER = r'(?!)'
+
+
+def _alternation(terms):
+    # Longest first so a longer term wins over a shorter one at the same position
+    terms = [t for t in terms if t]
+    if not terms:
+        return NEVER
+    return '|'.join(re.escape(t) for t in sorted(terms, key=len, reverse=True))
+
+
+class RuleClassifier:
+    """Classify pages and links with regexes compiled once from rule tables."""
+
+    def __init__(self, rules=None):
+        self.rules = dict(DEFAULT_RULES)
+        if rules:
+            self.rules.update(rules)
+        r = self.rules
+
+        date_groups = '|'.join(
+            f'(?P<date{i}>{prefix}(?P<value{i}>{r["date_value"]}))'
+            for i, prefix in enumerate(r['date_prefixes'])
+        ) or NEVER
+        self._date_count = len(r['date_prefixes'])
+        self._page_pattern = re.compile(
+            f'(?P<year_round>{_alternation(r["year_round_phrases"])})'
+            f'|(?P<window>{r["window_pattern"] or NEVER})'
+            f'|{date_groups}'
+            f'|(?P<closed>{_alternation(r["closed_indicators"])})'
+        )
+        self._window_pattern = re.compile(r['window_pattern'] or NEVER)
+        self._link_pattern = re.compile(
+            f'(?P<excluded>{_alternation(r["excluded_terms"])})'
+            f'|(?P<keyword>{_alternation(r["link_keywords"])})'
+            f'|(?P<href_excluded>{_alternation(r["excluded_href_terms"])})'
+        )
+        self._outdated_pattern = re.compile(
+            r['outdated_header_pattern'] or outdated_years_pattern(r['outdated_header_age']))
+
+    def classify_page(self, text_content, today=None):
+        """Return the closing date, schedule kind, open/closed status and Deadline of a page.
+
+        schedule is 'date', 'window', 'rolling' or 'unknown'. closing_date is
+        the deadline's canonical text, e.g. "15 March 2025" with the year
+        inferred when the page leaves it out.
+        """
+        # Convert to lowercase and remove extra whitespace
+        text = ' '.join(text_content.lower().split())
+
+        year_round = window = closed = None
+        dates = [None] * self._date_count
+        for match in self._page_pattern.finditer(text):
+            kind = match.lastgroup
+            if kind == 'year_round':
+                year_round = year_round or match
+            elif kind == 'window':
+                window = window or match
+            elif kind == 'closed':
+                closed = closed or match
+            else:
+                index = int(kind[len('date'):])
+                dates[index] = dates[index] or match.group(f'value{index}')
+
+        status = "Closed" if closed else "Open"
+        if year_round:
+            return PageClassification("Open all year round", 'rolling', status, ROLLING_DEADLINE)
+        if window:
+            months = self._window_pattern.match(window.group('window')).groups()
+            text = f"Opens annually {months[0]}-{months[1]}"
+            deadline = parse_deadline(text, today)
+            if deadline.schedule == 'window':
+                text = deadline.label()
+            return PageClassification(text, 'window', status, deadline)
+        for value in dates:
+            if value:
+                deadline = parse_deadline(value, today)
+                if deadline.schedule == 'date':
+                    return PageClassification(deadline.label(), 'date', status, deadline)
+        return PageClassification("Not specified", 'unknown', status, parse_deadline(None))
+
+    def is_outdated(self, header_text):
+        """True if the page header mentions an outdated year."""
+        return bool(self._outdated_pattern.search(header_text))
+
+    def is_valid_bursary_link(self, href, text):
+        """Decide in one pass whether a category-page link is a bursary."""
+        combined = (href + text).lower()
+        href_length = len(href)
+        has_keyword = False
+        for match in self._link_pattern.finditer(combined):
+            kind = match.lastgroup
+            if kind == 'excluded':
+                return False
+            if kind == 'keyword':
+                has_keyword = True
+            elif match.end() <= href_length:
+                # Listing/news terms only count inside the href itself
+                return False
+        return has_keyword
+
+
+_default_classifier = None
+
+
+def default_classifier():
+    """Return a shared classifier built from DEFAULT_RULES."""
+    global _default_classifier
+    if _default_classifier is None:
+        _default_classifier = RuleClassifier()
+    return _default_classifier
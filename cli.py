@@ -0,0 +1,114 @@
+"""Non-interactive command line for scripts and cron jobs.
+
+    python cli.py --field Engineering --format csv --output engineering.csv
+    python cli.py --field all --status any --format json
+    python cli.py --field "Law,Medical" --crawl --format pdf,csv,parquet --output reports/
+
+Answers come from the record store (bursary_data.db), so a query against
+cached data starts without loading the crawler. requests, BeautifulSoup and
+rich are only imported with --crawl, ReportLab only for pdf and pyarrow
+only for parquet.
+"""
+import argparse
+import os
+import sys
+
+from bursary_store import BursaryStore
+from closing_dates import deadline_sort_key
+from fields import resolve_fields
+from renderers import TEXT_FORMATS, WRITERS, make_writer, output_filename, render
+
+
+BASE_URL = "https://www.zabursaries.co.za"
+
+
+def crawl(fields, store_path):
+    """Re-check new, stale and near-deadline bursaries for fields."""
+    from rich.console import Console
+    from bursary_checker import BursaryReportGenerator
+
+    generator = BursaryReportGenerator(BASE_URL, store_path=store_path)
+    # Progress goes to stderr so stdout carries only the requested output
+    generator.console = Console(stderr=True)
+    generator.refresh_fields(fields, incremental=True)
+    generator.store.close()
+
+
+def load_records(store, fields, status=None, include_expired=True):
+    """Stored records listed under any of fields, closing soonest first."""
+    records = {}
+    for field in fields:
+        for record in store.load(category=field, include_expired=include_expired):
+            if status and record['status'].lower() != status.lower():
+                continue
+            records.setdefault(record['url'], record)
+    return sorted(records.values(), key=deadline_sort_key)
+
+
+def writers_for(formats, output, label, title):
+    """One writer per format: a single format may go to a file (text formats
+    also to stdout); otherwise each format gets its default filename in the
+    output directory."""
+    if len(formats) == 1 and output != '-' and not os.path.isdir(output):
+        return [make_writer(formats[0], output, title)]
+    if len(formats) == 1 and formats[0] in TEXT_FORMATS:
+        return [make_writer(formats[0], sys.stdout, title)]
+    directory = '.' if output == '-' else output
+    os.makedirs(directory, exist_ok=True)
+    return [make_writer(fmt, os.path.join(directory, output_filename(label, fmt)), title)
+            for fmt in formats]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query checked bursaries without prompts.")
+    parser.add_argument('--field', required=True,
+                        help='"all" or a comma-separated list of fields of study')
+    parser.add_argument('--format', default='text',
+                        help=f"comma-separated output formats: {', '.join(WRITERS)} (default text)")
+    parser.add_argument('--output', default='-',
+                        help='output file for a single format, "-" for stdout (default), '
+                             'or a directory for default-named files')
+    parser.add_argument('--status', default='Open', help='"Open", "Closed" or "any" (default Open)')
+    parser.add_argument('--crawl', action='store_true',
+                        help='re-check new, stale and near-deadline bursaries before answering')
+    parser.add_argument('--fresh-only', action='store_true',
+                        help='leave out stored records that have expired')
+    parser.add_argument('--store', default='bursary_data.db', help='record store (default bursary_data.db)')
+    args = parser.parse_args(argv)
+
+    try:
+        fields = resolve_fields(args.field)
+    except ValueError as e:
+        parser.error(str(e))
+    if not fields:
+        parser.error("no field of study given")
+    formats = [fmt.strip() for fmt in args.format.split(',') if fmt.strip()]
+    unknown = [fmt for fmt in formats if fmt not in WRITERS]
+    if unknown or not formats:
+        parser.error(f"unknown output format: {', '.join(unknown) or args.format}")
+
+    if args.crawl:
+        crawl(fields, args.store)
+
+    store = BursaryStore(args.store)
+    try:
+        status = None if args.status.lower() == 'any' else args.status
+        records = load_records(store, fields, status, include_expired=not args.fresh_only)
+    finally:
+        store.close()
+    if not records:
+        print(f"No stored bursaries for {', '.join(fields)}; run with --crawl to check them.",
+              file=sys.stderr)
+
+    label = fields[0] if len(fields) == 1 else 'All Categories'
+    try:
+        writers = writers_for(formats, args.output, label, f"Open Bursaries Report - {label}")
+    except (ValueError, ImportError) as e:
+        parser.error(str(e))
+    for path in render(records, writers):
+        print(f"Written: {path}", file=sys.stderr)
+    return 0 if records else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
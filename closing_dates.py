@@ -0,0 +1,158 @@
+"""Normalize scraped closing-date phrases into typed deadlines.
+
+A closing date is one of:
+
+- 'date': an exact day, e.g. "15th March 2025". A missing year is inferred
+  as the occurrence nearest to today.
+- 'window': a recurring yearly window such as "Opens annually January-March".
+- 'rolling': applications are accepted all year.
+- 'unknown': anything else, e.g. "Not specified".
+
+Parsing is memoized per (phrase, day), because the same phrases repeat across
+bursaries and runs. Sorting and range checks then compare date ordinals
+instead of parsing strings.
+"""
+import re
+from collections import namedtuple
+from datetime import date
+from functools import lru_cache
+
+
+MONTHS = {name: number for number, names in enumerate([
+    ('january', 'jan'), ('february', 'feb'), ('march', 'mar'), ('april', 'apr'),
+    ('may',), ('june', 'jun'), ('july', 'jul'), ('august', 'aug'),
+    ('september', 'sep', 'sept'), ('october', 'oct'), ('november', 'nov'), ('december', 'dec'),
+], start=1) for name in names}
+
+# Month names for use inside larger patterns, longest first
+MONTH_PATTERN = '(?:' + '|'.join(sorted(MONTHS, key=len, reverse=True)) + ')'
+
+DAY_MONTH_YEAR = re.compile(
+    rf'\b(\d{{1,2}})(?:st|nd|rd|th)?\s+({MONTH_PATTERN})\b\.?(?:,?\s+(\d{{4}}))?', re.IGNORECASE)
+MONTH_DAY_YEAR = re.compile(
+    rf'\b({MONTH_PATTERN})\.?\s+(\d{{1,2}})(?:st|nd|rd|th)?\b(?:,?\s+(\d{{4}}))?', re.IGNORECASE)
+WINDOW = re.compile(rf'\b({MONTH_PATTERN})[a-z]*\s*(?:-|–|to|and)\s*({MONTH_PATTERN})[a-z]*\b',
+                    re.IGNORECASE)
+ROLLING = re.compile(r'all year|year round|throughout the year|rolling', re.IGNORECASE)
+
+SCHEDULES = ('date', 'window', 'rolling', 'unknown')
+
+
+class Deadline(namedtuple('Deadline', ['schedule', 'date', 'start_month', 'end_month'])):
+    """A normalized closing date; see the module docstring for the schedules."""
+
+    __slots__ = ()
+
+    def closes_on(self, today=None):
+        """The next day applications close: the exact date, or the end of the
+        current or next window. None for rolling and unknown deadlines."""
+        if self.schedule == 'date':
+            return self.date
+        if self.schedule == 'window':
+            today = today or date.today()
+            year = today.year
+            if self.start_month > self.end_month and today.month > self.end_month:
+                year += 1  # window wraps the new year, e.g. November-February
+            end = _month_end(year, self.end_month)
+            return end if end >= today else _month_end(year + 1, self.end_month)
+        return None
+
+    def sort_key(self, today=None):
+        """Order soonest closing first, then rolling, then unknown."""
+        closes = self.closes_on(today)
+        if closes:
+            return (0, closes.toordinal())
+        return (1 if self.schedule == 'rolling' else 2, 0)
+
+    def label(self):
+        """Canonical display text."""
+        if self.schedule == 'date':
+            return f"{self.date.day} {self.date:%B %Y}"
+        if self.schedule == 'window':
+            return f"Opens annually {_month_name(self.start_month)}-{_month_name(self.end_month)}"
+        if self.schedule == 'rolling':
+            return "Open all year round"
+        return "Not specified"
+
+
+UNKNOWN = Deadline('unknown', None, None, None)
+ROLLING_DEADLINE = Deadline('rolling', None, None, None)
+
+
+def _month_name(month):
+    return date(2000, month, 1).strftime('%B')
+
+
+def _month_end(year, month):
+    if month == 12:
+        return date(year, 12, 31)
+    return date.fromordinal(date(year, month + 1, 1).toordinal() - 1)
+
+
+def infer_year(day, month, today):
+    """The year that puts day/month nearest to today."""
+    candidates = []
+    for year in (today.year - 1, today.year, today.year + 1):
+        try:
+            candidates.append(date(year, month, day))
+        except ValueError:  # 29 February
+            continue
+    if not candidates:
+        return None
+    return min(candidates, key=lambda d: abs(d.toordinal() - today.toordinal())).year
+
+
+def _exact_date(text, today):
+    match = DAY_MONTH_YEAR.search(text)
+    if match:
+        day, month, year = match.groups()
+    else:
+        match = MONTH_DAY_YEAR.search(text)
+        if not match:
+            return None
+        month, day, year = match.groups()
+    day, month = int(day), MONTHS[month.lower()]
+    year = int(year) if year else infer_year(day, month, today)
+    if year is None:
+        return None
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _parse(text, today):
+    exact = _exact_date(text, today)
+    if exact:
+        return Deadline('date', exact, None, None)
+    if ROLLING.search(text):
+        return ROLLING_DEADLINE
+    window = WINDOW.search(text)
+    if window:
+        start, end = (MONTHS[m.lower()] for m in window.groups())
+        return Deadline('window', None, start, end)
+    return UNKNOWN
+
+
+def parse_deadline(closing_date, today=None):
+    """Return the Deadline for a closing-date phrase (memoized)."""
+    if not closing_date:
+        return UNKNOWN
+    return _parse(' '.join(str(closing_date).split()), today or date.today())
+
+
+def closing_date_to_date(closing_date):
+    """Return the exact date in a string such as '15th March 2025', or None."""
+    return parse_deadline(closing_date).date
+
+
+def deadline_sort_key(record, today=None):
+    """Sort key putting the bursaries that close soonest first."""
+    return parse_deadline(record['closing_date'], today).sort_key(today) + (record['name'],)
+
+
+def parse_closing_date(text_content):
+    """Enhanced closing date parsing with special cases handling."""
+    from classifier import default_classifier
+    return default_classifier().classify_page(text_content).closing_date
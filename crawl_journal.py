@@ -0,0 +1,127 @@
+"""Append-only crawl journal so an interrupted crawl can resume.
+
+The journal is a JSON-lines file. The first line names the run (for example
+the fields being crawled). After that, every link queued for fetching and
+every finished record is appended as it happens. If the process stops early,
+the next run with the same key reloads the finished records, which are not
+fetched again, and re-queues the links that were still pending. A finished
+crawl deletes its journal.
+
+Lines are flushed on every write and fsynced at most every sync_interval
+seconds, so a crash loses at most the last moment of work. A torn final
+line is ignored on load, and a resumed journal is rewritten without it: the
+compacted copy is written beside the journal and renamed over it, so a crash
+during the rewrite leaves the old journal intact.
+
+Each key needs a file of its own; a journal for another key is replaced.
+"""
+import json
+import logging
+import os
+import threading
+import time
+
+from bursary_record import BursaryRecord, split_details
+from http_cache import write_atomic
+
+
+def _encode(record):
+    return {'name': record.name, 'url': record.url, 'status': record.status,
+            'closing_date': record.closing_date, 'details': record.details,
+            'updated_at': record.updated_at}
+
+
+def _decode(data):
+    return BursaryRecord(data['name'], data['url'], data['status'], data['closing_date'],
+                         split_details(data['details']), data['updated_at'])
+
+
+class CrawlJournal:
+    """Durable log of one crawl's queued links and finished records."""
+
+    def __init__(self, path, key, max_age=86400, sync_interval=1.0):
+        self.path = path
+        self.key = key
+        self.sync_interval = sync_interval
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._last_sync = time.monotonic()
+        self.records = {}  # url -> finished record
+        self._queued = {}  # url -> name, in queue order
+        self.started = time.time()
+        self.resumed = self._load(max_age)
+        # Rewriting on resume drops any torn line and compacts the file
+        entries = [{'run': key, 'started': self.started}]
+        entries.extend({'queued': [name, url]} for url, name in self._queued.items())
+        entries.extend({'done': _encode(record)} for record in self.records.values())
+        write_atomic(path, ''.join(json.dumps(entry, ensure_ascii=False) + '\n' for entry in entries),
+                     sync=True)
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def _load(self, max_age):
+        """Read an unfinished journal for the same key; False to start afresh."""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return False
+        entries = []
+        for line in lines:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                break  # torn write at the end of an interrupted run
+        if not entries or entries[0].get('run') != self.key:
+            return False
+        if time.time() - entries[0].get('started', 0) > max_age:
+            return False
+        self.started = entries[0]['started']
+        for entry in entries[1:]:
+            if 'queued' in entry:
+                name, url = entry['queued']
+                self._queued[url] = name
+            elif 'done' in entry:
+                record = _decode(entry['done'])
+                self.records[record['url']] = record
+        return True
+
+    def pending(self):
+        """(name, url) links queued by the interrupted run but not finished."""
+        return [(name, url) for url, name in self._queued.items() if url not in self.records]
+
+    def _write(self, entry):
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._file.flush()
+        now = time.monotonic()
+        if now - self._last_sync >= self.sync_interval:
+            os.fsync(self._file.fileno())
+            self._last_sync = now
+
+    def queued(self, name, url):
+        with self._lock:
+            if url in self._queued:
+                return
+            self._queued[url] = name
+            self._write({'queued': [name, url]})
+
+    def done(self, record):
+        with self._lock:
+            self.records[record['url']] = record
+            self._write({'done': _encode(record)})
+
+    def close(self):
+        """Sync and close, keeping the journal for the next run to resume."""
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+    def complete(self):
+        """Close and delete the journal after a finished crawl."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError as e:
+            self.logger.error(f"Error removing crawl journal {self.path}: {e}")
@@ -0,0 +1,197 @@
+"""Per-stage timing spans and counters for crawl runs.
+
+A CrawlMetrics instance collects latency samples per stage (fetch, connect,
+tls, ttfb, body, parse_html, classify, requirements, render, ...),
+counters (bytes, retries, errors) and cache hits and misses. At the end of a
+run it appends one JSON line with p50/p95/p99 per stage and can also write a
+Prometheus textfile-collector file.
+"""
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = min(len(sorted_values), max(1, math.ceil(q * len(sorted_values))))
+    return sorted_values[rank - 1]
+
+
+class CrawlMetrics:
+    """Thread-safe collector of stage latencies, counters and cache hit rates."""
+
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self._samples = defaultdict(list)
+        self.counters = defaultdict(int)
+        self._cache = defaultdict(lambda: [0, 0])  # name -> [hits, misses]
+
+    @contextmanager
+    def span(self, stage):
+        """Time the enclosed block as one sample of stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            self._samples[stage].append(seconds)
+
+    def observe_many(self, timings):
+        """Record a {stage: seconds} dict, e.g. one returned by a parse worker."""
+        with self._lock:
+            for stage, seconds in timings.items():
+                self._samples[stage].append(seconds)
+
+    def increment(self, name, amount=1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def cache_event(self, cache, hit):
+        with self._lock:
+            self._cache[cache][0 if hit else 1] += 1
+
+    def record_response(self, response, total_seconds, body_bytes=None):
+        """Record TTFB, body time, size and urllib3 retries for a requests response.
+
+        body_bytes is the size actually read from a streamed response.
+        """
+        ttfb = response.elapsed.total_seconds()
+        body = len(response.content) if body_bytes is None else body_bytes
+        retries = getattr(getattr(response.raw, 'retries', None), 'history', ()) or ()
+        with self._lock:
+            self._samples['fetch'].append(total_seconds)
+            self._samples['ttfb'].append(ttfb)
+            self._samples['body'].append(max(0.0, total_seconds - ttfb))
+            self.counters['body_bytes'] += body
+            self.counters['http_requests'] += 1
+            self.counters[f'http_status_{response.status_code}'] += 1
+            self.counters['http_retries'] += len(retries)
+
+    def summary(self):
+        """Return a JSON-serialisable summary of the run so far."""
+        with self._lock:
+            samples = {stage: sorted(values) for stage, values in self._samples.items()}
+            counters = dict(self.counters)
+            cache = {name: tuple(counts) for name, counts in self._cache.items()}
+        stages = {}
+        for stage, values in samples.items():
+            stages[stage] = {
+                'count': len(values),
+                'total': sum(values),
+                'max': values[-1],
+                **{f'p{int(q * 100)}': percentile(values, q) for q in self.QUANTILES}
+            }
+        return {
+            'started_at': self.started_at,
+            'duration': time.time() - self.started_at,
+            'stages': stages,
+            'counters': counters,
+            'cache': {
+                name: {'hits': hits, 'misses': misses,
+                       'hit_rate': hits / (hits + misses) if hits + misses else None}
+                for name, (hits, misses) in cache.items()
+            }
+        }
+
+    def write_jsonl(self, path, **run_info):
+        """Append this run's summary as one JSON line."""
+        line = dict(run_info, **self.summary())
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(line) + '\n')
+
+    def write_prometheus(self, path, prefix='bursary'):
+        """Write the summary in Prometheus text format, replacing path atomically."""
+        summary = self.summary()
+        lines = [
+            f'# HELP {prefix}_stage_seconds Per-stage latency of the last crawl run.',
+            f'# TYPE {prefix}_stage_seconds summary',
+        ]
+        for stage, stats in sorted(summary['stages'].items()):
+            for q in self.QUANTILES:
+                lines.append(f'{prefix}_stage_seconds{{stage="{stage}",quantile="{q}"}} '
+                             f'{stats[f"p{int(q * 100)}"]}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {stats["total"]}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {stats["count"]}')
+        lines.append(f'# TYPE {prefix}_events_total counter')
+        for name, value in sorted(summary['counters'].items()):
+            lines.append(f'{prefix}_events_total{{event="{name}"}} {value}')
+        lines.append(f'# TYPE {prefix}_cache_hit_ratio gauge')
+        for name, stats in sorted(summary['cache'].items()):
+            if stats['hit_rate'] is not None:
+                lines.append(f'{prefix}_cache_hit_ratio{{cache="{name}"}} {stats["hit_rate"]}')
+        lines.append(f'{prefix}_run_duration_seconds {summary["duration"]}')
+
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.prom.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp_path, path)
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose new connections report connect and TLS handshake time.
+
+    The connect span covers DNS resolution plus the TCP handshake; urllib3
+    resolves and connects in a single call, so the two are not separated.
+    Reused keep-alive connections record nothing, and the connections_opened
+    counter shows how often a new connection was needed. metrics_source is a
+    callable returning the CrawlMetrics of the run in progress.
+    """
+
+    def __init__(self, metrics_source, *args, **kwargs):
+        self.metrics_source = metrics_source
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        metrics = self.metrics_source
+
+        class TimedHTTPConnection(HTTPConnection):
+            def _new_conn(self):
+                start = time.perf_counter()
+                sock = super()._new_conn()
+                metrics().observe('connect', time.perf_counter() - start)
+                metrics().increment('connections_opened')
+                return sock
+
+        class TimedHTTPSConnection(HTTPSConnection):
+            def _new_conn(self):
+                start = time.perf_counter()
+                sock = super()._new_conn()
+                self._tcp_seconds = time.perf_counter() - start
+                metrics().observe('connect', self._tcp_seconds)
+                metrics().increment('connections_opened')
+                return sock
+
+            def connect(self):
+                start = time.perf_counter()
+                super().connect()
+                metrics().observe('tls', time.perf_counter() - start - getattr(self, '_tcp_seconds', 0))
+
+        class TimedHTTPConnectionPool(HTTPConnectionPool):
+            ConnectionCls = TimedHTTPConnection
+
+        class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+            ConnectionCls = TimedHTTPSConnection
+
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TimedHTTPConnectionPool,
+            'https': TimedHTTPSConnectionPool,
+        }
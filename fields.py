@@ -0,0 +1,26 @@
+"""Fields of study offered by zabursaries.co.za.
+
+Kept free of heavy imports so the CLI can validate field names without
+loading the crawler.
+"""
+
+FIELDS = ["Accounting", "Arts", "Commerce", "Computer Science & IT",
+          "Construction & Built Environment", "Education", "Engineering",
+          "General", "Government", "International", "Law", "Medical",
+          "Postgraduate", "Science"]
+
+
+def resolve_fields(spec):
+    """Turn 'all' or a comma-separated list of field names into FIELDS entries."""
+    if spec.strip().lower() == 'all':
+        return list(FIELDS)
+    by_name = {field.lower(): field for field in FIELDS}
+    fields = []
+    for name in spec.split(','):
+        name = name.strip()
+        if not name:
+            continue
+        if name.lower() not in by_name:
+            raise ValueError(f"Unknown field of study: {name}")
+        fields.append(by_name[name.lower()])
+    return fields
@@ -0,0 +1,120 @@
+"""On-disk HTTP response store used for conditional revalidation.
+
+Each URL gets a small JSON metadata file holding its validators (ETag and
+Last-Modified) next to the last body received for it. The next request for
+that URL sends If-None-Match / If-Modified-Since, and a 304 response is
+answered from the stored body.
+
+Files are written to a temporary name and renamed into place, so a reader
+(another thread or process) never sees a half-written entry.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+
+
+def write_atomic(path, text, sync=False):
+    """Write text to a temporary file beside path, then rename it over path.
+
+    sync=True fsyncs the data before the rename, for files that must survive a crash.
+    """
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class HTTPResponseCache:
+    """Per-URL store of page bodies and the validators that came with them."""
+
+    # Private to one process; see shared_cache for caches that coordinate fetches
+    shared = False
+
+    def __init__(self, directory='http_cache'):
+        self.directory = directory
+        self.logger = logging.getLogger(__name__)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _paths(self, url):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.directory, key)
+        return base + '.json', base + '.html'
+
+    def get(self, url):
+        """Return the metadata stored for url, or None."""
+        meta_path, body_path = self._paths(url)
+        if not (os.path.exists(meta_path) and os.path.exists(body_path)):
+            return None
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.error(f"Error reading HTTP cache entry for {url}: {e}")
+            return None
+
+    def conditional_headers(self, url):
+        """Build the If-None-Match / If-Modified-Since headers for url."""
+        entry = self.get(url)
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def load_body(self, url):
+        """Return the stored body for url, or None if there is none."""
+        _, body_path = self._paths(url)
+        try:
+            with open(body_path, 'r', encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def store(self, url, body, headers):
+        """Record a 200 response if it carries validators worth revalidating."""
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if not (etag or last_modified):
+            return
+        self._write_entry(url, body, etag, last_modified)
+
+    def _write_entry(self, url, body, etag, last_modified):
+        meta_path, body_path = self._paths(url)
+        try:
+            # Body first: metadata only ever points at a complete body
+            write_atomic(body_path, body)
+            write_atomic(meta_path, json.dumps({
+                'url': url,
+                'etag': etag,
+                'last_modified': last_modified,
+                'fetched_at': time.time()
+            }))
+        except OSError as e:
+            self.logger.error(f"Error writing HTTP cache entry for {url}: {e}")
+
+    def touch(self, url):
+        """Mark a stored entry as revalidated now (after a 304)."""
+        entry = self.get(url)
+        if not entry:
+            return
+        entry['fetched_at'] = time.time()
+        meta_path, _ = self._paths(url)
+        try:
+            write_atomic(meta_path, json.dumps(entry))
+        except OSError as e:
+            self.logger.error(f"Error updating HTTP cache entry for {url}: {e}")
@@ -68,7 +68,7 @@ def get_python_executable(venv_dir):
 def install_requirements(python_path):
     print_step("Installing Required Packages")
     requirements = [
-        "rich", "requests", "beautifulsoup4", "reportlab", "tqdm", "urllib3"
+        "rich", "requests", "beautifulsoup4", "lxml", "reportlab", "tqdm", "urllib3"
     ]
 
     # Upgrade pip first to ensure it's working correctly
@@ -0,0 +1,168 @@
+"""Streaming discovery of bursary links.
+
+Category listings are walked page by page, following rel="next" / "next"
+links or WordPress-style /page/N/ URLs, and the site's XML sitemap can be
+read as it downloads with an incremental parser. Both are generators that
+yield each (name, url) link as soon as it is found, so the fetch engines can
+start checking bursaries while discovery is still running. UrlDeduper keeps
+a bounded memory of normalized URLs to drop repeats.
+"""
+import logging
+import re
+import zlib
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+from xml.etree.ElementTree import ParseError, XMLPullParser
+
+from page_parsing import parse_category_page
+
+
+TRACKING_PARAMS = {'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', '_ga', 'ref'}
+TRACKING_PREFIXES = ('utm_',)
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+PAGE_NUMBER = re.compile(r'/page/(\d+)/?$')
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_url(url, base=None):
+    """Canonical form of url: absolute, lower-case host, no default port,
+    fragment or tracking parameters, remaining query parameters sorted."""
+    if base:
+        url = urljoin(base, url)
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{netloc}:{parts.port}"
+    query = sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if key.lower() not in TRACKING_PARAMS
+                   and not key.lower().startswith(TRACKING_PREFIXES))
+    return urlunsplit((scheme, netloc, parts.path or '/', urlencode(query), ''))
+
+
+class UrlDeduper:
+    """Remembers the most recent max_size normalized URLs.
+
+    Memory stays bounded on huge crawls; a URL evicted from the window and
+    seen again is simply queued once more.
+    """
+
+    def __init__(self, max_size=100000):
+        self.max_size = max_size
+        self._seen = OrderedDict()
+
+    def __len__(self):
+        return len(self._seen)
+
+    def __contains__(self, url):
+        return normalize_url(url) in self._seen
+
+    def add(self, url):
+        """Return the normalized URL if it is new, None if it is a repeat."""
+        url = normalize_url(url)
+        if url in self._seen:
+            self._seen.move_to_end(url)
+            return None
+        self._seen[url] = True
+        if len(self._seen) > self.max_size:
+            self._seen.popitem(last=False)
+        return url
+
+
+def next_page_url(soup, page_url):
+    """URL of the listing page after page_url, or None on the last page."""
+    for link in soup.find_all('a', href=True):
+        if 'next' in link.get('rel', ()) or 'next' in link.get('class', ()):
+            return normalize_url(link['href'], page_url)
+
+    # No marked link: look for a numbered link to the following page
+    parts = urlsplit(page_url)
+    match = PAGE_NUMBER.search(parts.path)
+    if match:
+        path = f"{parts.path[:match.start()]}/page/{int(match.group(1)) + 1}/"
+    else:
+        path = parts.path.rstrip('/') + '/page/2/'
+    expected = normalize_url(urlunsplit(parts._replace(path=path)))
+    for link in soup.find_all('a', href=True):
+        if normalize_url(link['href'], page_url) == expected:
+            return expected
+    return None
+
+
+def iter_category_links(fetch, category_url, is_valid_link, parser=None, max_pages=50):
+    """Yield (name, url) for each bursary link on a paginated category listing.
+
+    fetch(url) returns a page's HTML or None. Each page is fetched only after
+    the links of the previous one have been consumed.
+    """
+    listing = PAGE_NUMBER.sub('/', urlsplit(normalize_url(category_url)).path)
+    page_url, visited = normalize_url(category_url), set()
+    while page_url and page_url not in visited and len(visited) < max_pages:
+        visited.add(page_url)
+        content = fetch(page_url)
+        if not content:
+            return
+        soup = parse_category_page(content, parser)
+        for link in soup.find_all('a', href=True):
+            url = normalize_url(link['href'], page_url)
+            # Pagination links of the listing itself are not bursaries
+            if PAGE_NUMBER.sub('/', urlsplit(url).path) == listing:
+                continue
+            text = link.text.strip()
+            if is_valid_link(link['href'], text):
+                yield text, url
+        page_url = next_page_url(soup, page_url)
+
+
+def name_from_url(url):
+    """Readable name for a sitemap URL, taken from its last path segment."""
+    slug = urlsplit(url).path.rstrip('/').rsplit('/', 1)[-1]
+    return ' '.join(word.capitalize() for word in slug.split('-') if word) or url
+
+
+def _local_name(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def iter_sitemap_urls(open_stream, sitemap_url, max_depth=2):
+    """Yield every page URL listed in a sitemap, following sitemap indexes.
+
+    open_stream(url) yields the response body in byte chunks. Entries are
+    parsed and yielded as chunks arrive, and finished elements are cleared,
+    so large sitemaps never sit in memory whole. '.gz' sitemaps are
+    decompressed on the fly.
+    """
+    parser = XMLPullParser(events=('start', 'end'))
+    decompress = zlib.decompressobj(16 + zlib.MAX_WBITS) if sitemap_url.endswith('.gz') else None
+    root, children = None, []
+    try:
+        for chunk in open_stream(sitemap_url):
+            parser.feed(decompress.decompress(chunk) if decompress else chunk)
+            for event, element in parser.read_events():
+                name = _local_name(element.tag)
+                if event == 'start':
+                    root = root or name
+                    continue
+                if name == 'loc' and element.text:
+                    if root == 'sitemapindex':
+                        children.append(element.text.strip())
+                    else:
+                        yield element.text.strip()
+                elif name in ('url', 'sitemap'):
+                    element.clear()
+        parser.close()
+    except (ParseError, zlib.error) as e:
+        logger.error(f"Error parsing sitemap {sitemap_url}: {e}")
+
+    if max_depth > 0:
+        for child in children:
+            yield from iter_sitemap_urls(open_stream, child, max_depth - 1)
+
+
+def iter_sitemap_links(open_stream, sitemap_url, is_valid_link):
+    """Yield (name, url) for sitemap entries that look like bursary pages."""
+    for url in iter_sitemap_urls(open_stream, sitemap_url):
+        if is_valid_link(url, ''):
+            yield name_from_url(url), normalize_url(url)
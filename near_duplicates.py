@@ -0,0 +1,181 @@
+"""Near-duplicate detection for bursary records.
+
+The same bursary is often listed under several URLs with slightly different
+anchor text, while genuinely different programmes can share a name. Records
+are therefore compared by content. Each record's name and requirements are
+cut into word shingles. A one-permutation MinHash signature summarises each
+shingle set, and locality-sensitive hashing on bands of the signature only
+compares records that share a band bucket.
+Signing and bucketing are linear in the number of records; only candidate
+pairs are compared, using the exact Jaccard similarity of their shingles.
+
+One-permutation hashing hashes each shingle once and keeps the minimum per
+bin, instead of computing num_perm separate hashes. Empty bins are filled
+from the next non-empty bin ("rotation" densification).
+
+Requirements are often boilerplate shared by unrelated programmes ("Sasol
+Engineering Bursary" and "Eskom Engineering Bursary" can list the same
+criteria), so similar text alone is not enough: two records are only
+duplicates if their names or their URL slugs also identify the same
+programme (see identity_keys).
+"""
+import hashlib
+import re
+from urllib.parse import urlsplit
+
+
+WORD = re.compile(r'[a-z0-9]+')
+YEAR = re.compile(r'(?:19|20)\d\d')
+MAX_HASH = (1 << 64) - 1
+# Words that say nothing about which programme a name or slug refers to
+GENERIC_WORDS = frozenset((
+    'a', 'an', 'and', 'for', 'in', 'of', 'the', 'to', 'at', 'now', 'apply', 'application',
+    'applications', 'open', 'closed', 'bursary', 'bursaries', 'scholarship', 'scholarships',
+    'programme', 'programmes', 'program', 'programs', 'scheme', 'fund', 'funding', 'sa',
+    'south', 'africa', 'african',
+))
+
+
+def shingles(text, size=3):
+    """Set of 64-bit hashes of the word size-grams in text."""
+    words = WORD.findall(text.lower())
+    if len(words) < size:
+        grams = [' '.join(words)] if words else []
+    else:
+        grams = [' '.join(words[i:i + size]) for i in range(len(words) - size + 1)]
+    return {int.from_bytes(hashlib.blake2b(g.encode(), digest_size=8).digest(), 'little')
+            for g in grams}
+
+
+def signature(hashes, num_perm=64):
+    """One-permutation MinHash signature (tuple of num_perm ints) of a hash set."""
+    bins = [MAX_HASH] * num_perm
+    for h in hashes:
+        slot, value = h % num_perm, h // num_perm
+        if value < bins[slot]:
+            bins[slot] = value
+    if not hashes:
+        return tuple(bins)
+    # Densify: an empty bin borrows the next non-empty bin's value, offset by the distance
+    for i in range(num_perm):
+        if bins[i] == MAX_HASH:
+            distance = 1
+            while bins[(i + distance) % num_perm] == MAX_HASH:
+                distance += 1
+            bins[i] = bins[(i + distance) % num_perm] + distance * (MAX_HASH // num_perm)
+    return tuple(bins)
+
+
+def jaccard(first, second):
+    """Exact Jaccard similarity of two shingle sets."""
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+def distinctive_words(text):
+    """The words of text that name a programme: no generic words or years."""
+    return frozenset(word for word in WORD.findall(text.lower())
+                     if word not in GENERIC_WORDS and not YEAR.fullmatch(word))
+
+
+def url_slug(url):
+    """Last path segment of url, e.g. 'sasol-bursary-2026' ('' for the site root)."""
+    segments = [segment for segment in urlsplit(url).path.split('/') if segment]
+    return segments[-1].lower() if segments else ''
+
+
+def identity_keys(record):
+    """(name words, slug words) that identify which programme a record is."""
+    slug = url_slug(record['url']).replace('-', ' ')
+    return distinctive_words(record['name']), distinctive_words(slug)
+
+
+def same_programme(first, second):
+    """True if the records' names or URL slugs name the same programme."""
+    return any(a and a == b for a, b in zip(first, second))
+
+
+def record_text(record):
+    return f"{record['name']} {record.get('details') or ''}"
+
+
+class NearDuplicateDetector:
+    """Clusters records whose text is at least threshold-similar.
+
+    With bands of rows each, pairs above roughly (1/bands)**(1/rows)
+    similarity become candidates; each candidate pair's shingles are then
+    checked against threshold. Records must also share a closing date and
+    name the same programme (same_programme), and records with fewer than
+    min_shingles shingles are never matched: there is too little text to
+    tell two programmes apart.
+    """
+
+    def __init__(self, threshold=0.8, num_perm=64, bands=8, shingle_size=3, min_shingles=8):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.min_shingles = min_shingles
+
+    def candidate_pairs(self, signatures):
+        """Index pairs that share at least one LSH band bucket."""
+        pairs = set()
+        for band in range(self.bands):
+            buckets = {}
+            start = band * self.rows
+            for i, sig in enumerate(signatures):
+                if sig is not None:
+                    buckets.setdefault(sig[start:start + self.rows], []).append(i)
+            for members in buckets.values():
+                for j in range(1, len(members)):
+                    for i in members[:j]:
+                        pairs.add((i, members[j]))
+        return pairs
+
+    def clusters(self, records):
+        """Groups (lists of indexes into records) of two or more near-duplicates."""
+        shingle_sets, signatures = [], []
+        keys = [identity_keys(record) for record in records]
+        for record in records:
+            hashes = shingles(record_text(record), self.shingle_size)
+            shingle_sets.append(hashes)
+            signatures.append(signature(hashes, self.num_perm)
+                              if len(hashes) >= self.min_shingles else None)
+
+        parent = list(range(len(records)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for i, j in self.candidate_pairs(signatures):
+            if records[i]['closing_date'] != records[j]['closing_date']:
+                continue
+            if not same_programme(keys[i], keys[j]):
+                continue
+            if jaccard(shingle_sets[i], shingle_sets[j]) >= self.threshold:
+                parent[find(j)] = find(i)
+
+        groups = {}
+        for i in range(len(records)):
+            groups.setdefault(find(i), []).append(i)
+        return [members for members in groups.values() if len(members) > 1]
+
+    def duplicates(self, records):
+        """Map each duplicate URL to its cluster's canonical URL.
+
+        The canonical record is the one with the shortest URL (then the
+        alphabetically first), so the choice is stable between runs.
+        """
+        aliases = {}
+        for members in self.clusters(records):
+            urls = sorted({records[i]['url'] for i in members}, key=lambda url: (len(url), url))
+            for url in urls[1:]:
+                aliases[url] = urls[0]
+        return aliases
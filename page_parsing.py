@@ -0,0 +1,189 @@
+"""HTML parsing backends for category and bursary pages.
+
+BeautifulSoup is always used so the extraction code stays the same, but the
+tree builder is pluggable. html.parser is the default. lxml is much faster
+but repairs malformed markup differently, so a broken page can give a
+different status or closing date; it is opt-in ('lxml', or 'auto' to use it
+when installed). Category pages are parsed with a SoupStrainer so only their
+anchors are built into a tree.
+"""
+import importlib.util
+import time
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from bursary_record import BursaryRecord, join_details
+from classifier import default_classifier
+
+DEFAULT_PARSER = 'html.parser'
+
+PARSERS = ('lxml', 'html.parser', 'html5lib')
+
+# Category pages only need their links
+CATEGORY_STRAINER = SoupStrainer('a', href=True)
+
+# Optional restriction of bursary pages to the header and article region
+ARTICLE_STRAINER = SoupStrainer(['header', 'article', 'main'])
+
+DETAIL_SCOPES = ('page', 'article')
+
+
+def resolve_parser(parser=None):
+    """Return the BeautifulSoup tree builder name for a backend.
+
+    None means html.parser; 'auto' means lxml when it is installed.
+    """
+    if parser is None:
+        return DEFAULT_PARSER
+    if parser == 'auto':
+        return 'lxml' if importlib.util.find_spec('lxml') else DEFAULT_PARSER
+    if parser not in PARSERS:
+        raise ValueError(f"Unknown parser backend: {parser}")
+    return parser
+
+
+def parse_category_page(content, parser=None):
+    """Parse a category page, building only its <a href> tags."""
+    return BeautifulSoup(content, resolve_parser(parser), parse_only=CATEGORY_STRAINER)
+
+
+def parse_detail_page(content, parser=None, scope='page'):
+    """Parse a bursary page.
+
+    scope='page' builds the whole document, which the status and closing-date
+    rules scan. scope='article' keeps only header/article/main, which is
+    faster but ignores text in sidebars and footers.
+    """
+    if scope not in DETAIL_SCOPES:
+        raise ValueError(f"Unknown detail scope: {scope}")
+    parse_only = ARTICLE_STRAINER if scope == 'article' else None
+    return BeautifulSoup(content, resolve_parser(parser), parse_only=parse_only)
+
+
+REQUIREMENT_TERMS = ('eligibility', 'requirements', 'criteria')
+HEADING_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+EMPHASIS_TAGS = ('strong', 'b')
+
+
+def _mentions_requirements(tag):
+    text = tag.get_text().lower()
+    return any(term in text for term in REQUIREMENT_TERMS)
+
+
+def _section_anchor(tag):
+    """Return the block element a requirements label starts its section from."""
+    if tag.name in EMPHASIS_TAGS:
+        # <p><strong>Requirements:</strong></p> style labels
+        parent = tag.parent
+        if parent is not None and parent.name == 'p':
+            return parent
+    return tag
+
+
+def _ends_section(tag, level):
+    """True if tag starts the next section after a heading of the given level."""
+    if tag.name in HEADING_TAGS:
+        return int(tag.name[1]) <= level
+    if level == 7 and tag.name == 'p':
+        # A following bold-only paragraph is the next label
+        children = [c for c in tag.children if getattr(c, 'name', None) or c.strip()]
+        return len(children) == 1 and getattr(children[0], 'name', None) in EMPHASIS_TAGS
+    return False
+
+
+def find_requirements_section(soup):
+    """Locate the eligibility/requirements label in one pass over the headings.
+
+    Only headings and bold labels are inspected, so the cost is linear in the
+    document size. Returns the tag the section starts from and its heading
+    level (7 for bold labels), or (None, None).
+    """
+    for tag in soup.find_all(HEADING_TAGS + EMPHASIS_TAGS):
+        if _mentions_requirements(tag):
+            level = int(tag.name[1]) if tag.name in HEADING_TAGS else 7
+            return _section_anchor(tag), level
+    return None, None
+
+
+def extract_requirement_items(soup):
+    """Return the text of the <li>/<p> items in the requirements section."""
+    anchor, level = find_requirements_section(soup)
+    if anchor is None:
+        return []
+
+    items = []
+    for sibling in anchor.next_siblings:
+        if not getattr(sibling, 'name', None):
+            continue
+        if _ends_section(sibling, level):
+            break
+        if sibling.name in ('li', 'p'):
+            elements = [sibling]
+        else:
+            elements = sibling.find_all(['li', 'p'])
+        for element in elements:
+            text = element.get_text().strip()
+            if text and len(text) > 5:  # Filter out empty or too short items
+                items.append(text)
+    return items
+
+
+def requirement_bullets(requirements):
+    """The bullets shown in reports: the first five items, then '...' if there are more."""
+    bullets = list(requirements[:5])
+    if len(requirements) > 5:
+        bullets.append("...")
+    return bullets
+
+
+def format_requirements(requirements):
+    """Format requirement items as the bullet list shown in reports."""
+    return join_details(requirement_bullets(requirements))
+
+
+def parse_bursary_page(content, url, name, parser=None, scope='page', classifier=None,
+                       timings=None):
+    """Turn a fetched bursary page into a BursaryRecord, or None if outdated.
+
+    This is a module-level function so it can run in a process pool. If a
+    timings dict is given, the seconds spent building the tree, classifying
+    the text and extracting requirements are stored in it.
+    """
+    classifier = classifier or default_classifier()
+    start = time.perf_counter()
+    soup = parse_detail_page(content, parser, scope)
+    parsed = time.perf_counter()
+
+    # Check for outdated bursaries
+    header = soup.find('header')
+    if classifier.is_outdated(header.get_text() if header else ''):
+        if timings is not None:
+            timings['parse_html'] = parsed - start
+        return None
+
+    # Closing date and open/closed status in a single pass over the text
+    classification = classifier.classify_page(soup.get_text())
+    classified = time.perf_counter()
+
+    # Extract requirements
+    requirements = requirement_bullets(extract_requirement_items(soup))
+
+    if timings is not None:
+        timings['parse_html'] = parsed - start
+        timings['classify'] = classified - parsed
+        timings['requirements'] = time.perf_counter() - classified
+
+    return BursaryRecord(
+        name,
+        url,  # Include the URL for linking
+        classification.status,
+        classification.closing_date,
+        requirements,
+        time.time()
+    )
+
+
+def parse_bursary_page_timed(*args):
+    """Process-pool variant of parse_bursary_page returning (record, timings)."""
+    timings = {}
+    return parse_bursary_page(*args, timings=timings), timings
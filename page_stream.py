@@ -0,0 +1,114 @@
+"""Read page bodies incrementally, with a size cap and early stops.
+
+Reading response.text holds the whole page in memory before parsing starts,
+however large the page is and however little of it is needed. A PageReader
+is fed the body chunk by chunk as it downloads. The caller stops reading as
+soon as feed() returns False:
+
+- after max_bytes, so an oversized page costs at most that much;
+- on a bursary page, once the first <header> has closed and names an
+  outdated year (the page is dropped anyway);
+- on a bursary page parsed with detail_scope='article', once the first
+  </article> or </main> has arrived, since nothing after it is parsed.
+
+Markers are searched only in newly decoded text (plus a few characters of
+overlap), so reading stays linear in the page size.
+"""
+import codecs
+import re
+from collections import namedtuple
+
+
+HTML_TYPES = ('text/html', 'application/xhtml+xml')
+HEADER_START = re.compile(r'<header[\s>]', re.IGNORECASE)
+HEADER_END = re.compile(r'</header\s*>', re.IGNORECASE)
+SECTION_END = re.compile(r'</(?:article|main)\s*>', re.IGNORECASE)
+TAG = re.compile(r'<[^>]*>')
+# Longest marker that can straddle two chunks
+OVERLAP = 16
+
+# text is None when the page was skipped; stopped is None for a complete body,
+# else 'size', 'outdated', 'section' or 'not_html'
+PageBody = namedtuple('PageBody', 'text stopped')
+
+
+def is_html(content_type):
+    """True for an HTML Content-Type, or when the server sent none."""
+    if not content_type:
+        return True
+    return content_type.split(';', 1)[0].strip().lower() in HTML_TYPES
+
+
+class PageReader:
+    """Accumulates one page body chunk by chunk and decides when to stop.
+
+    is_outdated, if given, is called with the text of the first <header>
+    and stops reading when it returns True. stop_at_section stops after the
+    first </article> or </main>.
+    """
+
+    def __init__(self, encoding=None, max_bytes=2 * 1024 * 1024, is_outdated=None,
+                 stop_at_section=False):
+        try:
+            decoder = codecs.getincrementaldecoder(encoding or 'utf-8')
+        except LookupError:
+            decoder = codecs.getincrementaldecoder('utf-8')
+        self._decoder = decoder(errors='replace')
+        self.max_bytes = max_bytes
+        self.is_outdated = is_outdated
+        self.stop_at_section = stop_at_section
+        self.bytes_read = 0
+        self.stopped = None
+        self._parts = []
+        self._length = 0
+        self._header_checked = is_outdated is None
+        self._tail = ''
+
+    def feed(self, chunk):
+        """Add a chunk of the body; returns False once reading should stop."""
+        if self.stopped:
+            return False
+        if self.max_bytes is not None and self.bytes_read + len(chunk) > self.max_bytes:
+            chunk = chunk[:self.max_bytes - self.bytes_read]
+            self.stopped = 'size'
+        self.bytes_read += len(chunk)
+        text = self._decoder.decode(chunk)
+        if not text:
+            return not self.stopped
+        self._parts.append(text)
+        window = self._tail + text
+        offset = self._length - len(self._tail)
+        self._length += len(text)
+        self._tail = window[-OVERLAP:]
+
+        if not self._header_checked:
+            end = HEADER_END.search(window)
+            if end:
+                self._header_checked = True
+                if self._check_header(offset + end.end()):
+                    self.stopped = 'outdated'
+                    return False
+        if self.stop_at_section and SECTION_END.search(window):
+            self.stopped = self.stopped or 'section'
+        return not self.stopped
+
+    def _check_header(self, end):
+        """Run is_outdated on the text of the first header, which ends at end."""
+        page = self.text()
+        start = HEADER_START.search(page)
+        if not start or start.start() >= end:
+            return False
+        return self.is_outdated(TAG.sub('', page[start.start():end]))
+
+    def text(self):
+        """The body read so far."""
+        if len(self._parts) > 1:
+            self._parts = [''.join(self._parts)]
+        return self._parts[0] if self._parts else ''
+
+    def finish(self):
+        """The PageBody once reading has stopped or the body has ended."""
+        rest = self._decoder.decode(b'', final=True)
+        if rest:
+            self._parts.append(rest)
+        return PageBody(self.text(), self.stopped)
@@ -0,0 +1,111 @@
+"""Two-stage crawl pipeline: I/O threads fetch, a process pool parses.
+
+Fetch workers put raw pages on a bounded queue and block when it is full.
+The main thread hands queued pages to a ProcessPoolExecutor and keeps at
+most `max_in_flight` parse jobs outstanding, so memory stays bounded no
+matter how far the network stage runs ahead. BeautifulSoup work then runs
+on every core instead of competing with the fetch threads for the GIL.
+
+If on_result or a parse raises, the pipeline stops fetching and drains the
+queue so the fetch threads can exit, then re-raises.
+"""
+import concurrent.futures
+import logging
+import queue
+import threading
+
+
+_DONE = object()
+
+
+class ParsePipeline:
+    """Run fetch(job) on I/O threads and parse jobs on a process pool."""
+
+    def __init__(self, io_workers=5, parse_workers=None, queue_size=32, max_in_flight=None):
+        self.io_workers = io_workers
+        self.parse_workers = parse_workers
+        self.queue_size = queue_size
+        self.max_in_flight = max_in_flight or 2 * (parse_workers or 4)
+        self.logger = logging.getLogger(__name__)
+
+    def run(self, jobs, fetch, parse, on_result):
+        """Process every job and call on_result(job, record) from this thread.
+
+        fetch(job) runs on an I/O thread and returns either ('record', record)
+        when no parsing is needed (record may be None) or ('parse', args), in
+        which case parse(*args) runs in the process pool. parse must be a
+        picklable module-level function.
+        """
+        pages = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+
+        def fetch_one(job):
+            if stop.is_set():
+                return
+            try:
+                kind, payload = fetch(job)
+            except Exception as e:
+                self.logger.error(f"Error fetching {job}: {e}")
+                kind, payload = 'record', None
+            pages.put((job, kind, payload))
+
+        def produce():
+            try:
+                with concurrent.futures.ThreadPoolExecutor(max_workers=self.io_workers) as io_pool:
+                    futures = []
+                    for job in jobs:
+                        if stop.is_set():
+                            break
+                        futures.append(io_pool.submit(fetch_one, job))
+                    for future in futures:
+                        future.result()
+            finally:
+                pages.put(_DONE)
+
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+
+        in_flight = {}
+        finished = False
+        try:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=self.parse_workers) as parse_pool:
+                def drain(return_when):
+                    done, _ = concurrent.futures.wait(in_flight, return_when=return_when)
+                    for future in done:
+                        job = in_flight.pop(future)
+                        try:
+                            record = future.result()
+                        except Exception as e:
+                            self.logger.error(f"Error parsing {job}: {e}")
+                            record = None
+                        on_result(job, record)
+
+                try:
+                    while True:
+                        item = pages.get()
+                        if item is _DONE:
+                            finished = True
+                            break
+                        job, kind, payload = item
+                        if kind != 'parse':
+                            on_result(job, payload)
+                            continue
+                        # Backpressure: wait for a parse slot before taking more pages
+                        while len(in_flight) >= self.max_in_flight:
+                            drain(concurrent.futures.FIRST_COMPLETED)
+                        in_flight[parse_pool.submit(parse, *payload)] = job
+
+                    if in_flight:
+                        drain(concurrent.futures.ALL_COMPLETED)
+                except BaseException:
+                    for future in in_flight:
+                        future.cancel()
+                    raise
+        finally:
+            if not finished:
+                # Unblock the fetch threads: no new fetches, and empty the
+                # queue until the producer signals it has stopped
+                stop.set()
+                while pages.get() is not _DONE:
+                    pass
+            producer.join()
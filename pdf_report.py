@@ -0,0 +1,243 @@
+"""Streaming PDF report builder.
+
+A single ReportLab Table holding every bursary is re-split on every page,
+which makes the build time grow quadratically with the number of rows, and
+all of its Paragraphs live in memory until the build finishes. Here rows are
+grouped into small table blocks, and the blocks are created lazily while
+ReportLab lays out the document. Only a few blocks are alive at any time.
+
+build_pdf_reports renders a batch of independent reports (one per field
+plus the combined one) in a process pool. Each process sets up the styles
+once and keeps a ParagraphCache, so a bursary listed under several fields
+is parsed and wrapped once per process instead of once per report.
+"""
+import concurrent.futures
+import os
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Table, TableStyle
+
+
+HEADER_ROW = ['Bursary Name', 'Closing Date', 'Status', 'Requirements']
+COLUMN_WIDTHS = [3*inch, 1.5*inch, 1*inch, 3.5*inch]
+
+TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#333333')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+    ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 10),
+    ('TOPPADDING', (0, 0), (-1, -1), 6),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f5f5f5')]),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+])
+
+_styles = None
+
+
+def report_styles():
+    """Return the paragraph styles used by reports, built once per process."""
+    global _styles
+    if _styles is None:
+        sample = getSampleStyleSheet()
+        _styles = {
+            # A copy, so the shared sample Heading1 is never modified
+            'title': ParagraphStyle('ReportTitle', parent=sample['Heading1'], alignment=TA_CENTER),
+            'normal': sample['Normal'],
+        }
+    return _styles
+
+
+def report_filename(field):
+    return f"{field.lower().replace(' ', '_')}_bursaries_report.pdf"
+
+
+def unique_by_url(bursaries):
+    """Drop repeated bursary URLs while preserving order.
+
+    Different programmes may share a name, so names are not compared;
+    near-duplicate pages are collapsed before reporting (see near_duplicates).
+    """
+    seen = set()
+    for b in bursaries:
+        if b['url'] not in seen:
+            seen.add(b['url'])
+            yield b
+
+
+def bursary_cells(bursary):
+    """Return the escaped Paragraph markup for one report row."""
+    url = escape(bursary['url'], {'"': '&quot;'})
+    return (
+        f'<link href="{url}">{escape(bursary["name"])}</link>',
+        escape(str(bursary['closing_date'])),
+        escape(bursary['status']),
+        escape(bursary['details'] or '').replace('\n', '<br/>'),
+    )
+
+
+class CellParagraph(Paragraph):
+    """A Paragraph that only re-breaks its lines when the width changes.
+
+    Every split of a table block recalculates the row heights of the rows
+    that remain, which re-wraps each cell several times at the same width.
+    """
+
+    _wrapped_width = None
+
+    def wrap(self, availWidth, availHeight):
+        if availWidth != self._wrapped_width:
+            self._wrapped_size = super().wrap(availWidth, availHeight)
+            self._wrapped_width = availWidth
+        return self._wrapped_size
+
+
+class ParagraphCache:
+    """Cell paragraphs shared by the reports that one process renders in turn.
+
+    Keyed by the cell markup, so a bursary that appears in several reports
+    is parsed once and, all columns having fixed widths, wrapped once. Use
+    one cache per thread: two documents must not lay out the same
+    paragraph at the same time.
+    """
+
+    def __init__(self):
+        self._rows = {}
+        self.hits = 0
+        self.misses = 0
+
+    def row(self, cells, style):
+        row = self._rows.get(cells)
+        if row is None:
+            row = self._rows[cells] = [CellParagraph(cell, style) for cell in cells]
+            self.misses += 1
+        else:
+            self.hits += 1
+        return row
+
+
+def table_blocks(bursaries, rows_per_block=25, cache=None):
+    """Yield Table flowables of at most rows_per_block bursaries each."""
+    normal = report_styles()['normal']
+    # The header stays plain strings so TABLE_STYLE's header font and colours apply
+    header = list(HEADER_ROW)
+    rows = []
+    for bursary in bursaries:
+        cells = bursary_cells(bursary)
+        if cache is not None:
+            rows.append(cache.row(cells, normal))
+        else:
+            rows.append([CellParagraph(cell, normal) for cell in cells])
+        if len(rows) == rows_per_block:
+            yield _block(header, rows)
+            rows = []
+    if rows:
+        yield _block(header, rows)
+
+
+def _block(header, rows):
+    table = Table([header] + rows, repeatRows=1, colWidths=COLUMN_WIDTHS)
+    table.setStyle(TABLE_STYLE)
+    return table
+
+
+class StreamedFlowables(list):
+    """A flowable list that ReportLab fills from an iterator as it consumes it.
+
+    BaseDocTemplate.build loops on len(flowables) and pops from the front, so
+    topping the list up in __len__ keeps only `lookahead` items in memory.
+    """
+
+    def __init__(self, flowables, lookahead=3):
+        super().__init__()
+        self._source = iter(flowables)
+        self._lookahead = lookahead
+
+    def __len__(self):
+        while list.__len__(self) < self._lookahead:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                break
+        return list.__len__(self)
+
+
+def build_pdf_report(filename, title, bursaries, rows_per_block=25, cache=None):
+    """Render bursaries into filename as a titled, block-streamed table.
+
+    cache, a ParagraphCache, lets reports rendered one after another share
+    the paragraphs of bursaries they have in common.
+    """
+    styles = report_styles()
+    doc = SimpleDocTemplate(filename, pagesize=letter, topMargin=0.5*inch)
+
+    def flowables():
+        yield Paragraph(escape(title), styles['title'])
+        yield Paragraph("<br/>", styles['normal'])
+        yield from table_blocks(unique_by_url(bursaries), rows_per_block, cache)
+
+    doc.build(StreamedFlowables(flowables()))
+    return filename
+
+
+_worker_cache = None
+
+
+def _init_worker():
+    """Pool initializer: build the styles and the paragraph cache once per process."""
+    global _worker_cache
+    report_styles()
+    _worker_cache = ParagraphCache()
+
+
+def _render_job(job):
+    filename, title, bursaries = job
+    return build_pdf_report(filename, title, bursaries, cache=_worker_cache)
+
+
+def build_pdf_reports(jobs, workers=None):
+    """Render (filename, title, bursaries) jobs, in parallel when there are cores.
+
+    Up to workers processes (default one per core) render the reports,
+    largest first so the combined report does not finish last on its own.
+    bursaries must be lists of picklable rows (see renderers.report_row).
+    With one worker the reports are rendered here, sharing one cache.
+    Returns (filename, error) pairs in job order; error is None on success.
+    """
+    jobs = list(jobs)
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        cache = ParagraphCache()
+        results = []
+        for filename, title, bursaries in jobs:
+            try:
+                build_pdf_report(filename, title, bursaries, cache=cache)
+                results.append((filename, None))
+            except Exception as e:
+                results.append((filename, e))
+        return results
+
+    largest_first = sorted(range(len(jobs)), key=lambda i: len(jobs[i][2]), reverse=True)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = {i: pool.submit(_render_job, jobs[i]) for i in largest_first}
+        results = []
+        for i, (filename, _, _) in enumerate(jobs):
+            try:
+                futures[i].result()
+                results.append((filename, None))
+            except Exception as e:
+                results.append((filename, e))
+    return results
@@ -0,0 +1,246 @@
+"""In-memory index over bursary records for fast compound queries.
+
+Every record gets a small integer id. Fields and statuses map to bitsets
+(Python ints with bit i set for record i), deadlines are kept in a sorted
+list of (date ordinal, id) pairs, and an inverted index maps each word of
+the name and requirements to the set of ids using it. A query turns each
+condition into a bitset and ANDs them together,
+so "Open engineering bursaries closing in the next 14 days that mention
+matric" touches only the matching ids. Updates are incremental: upserting a
+record only changes the entries for that record.
+"""
+import bisect
+import heapq
+import re
+import threading
+from datetime import date, timedelta
+
+from bursary_record import BursaryRecord
+from closing_dates import closing_date_to_date
+
+
+WORD = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text):
+    return set(WORD.findall(text.lower())) if text else set()
+
+
+def iter_bits(mask):
+    """Yield the positions of the set bits in mask, lowest first."""
+    # Scanning the binary string is much faster than peeling bits off a large int
+    bits = bin(mask)[:1:-1]
+    position = bits.find('1')
+    while position != -1:
+        yield position
+        position = bits.find('1', position + 1)
+
+
+def to_mask(ids, size):
+    """Bitset with the given ids set; linear in size/8 rather than ids x size."""
+    bits = bytearray((size + 7) // 8)
+    for i in ids:
+        bits[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(bits, 'little')
+
+
+class BursaryIndex:
+    """Record index with field/status bitsets, a deadline index and word search."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._ids = {}  # url -> id
+        self._records = []  # id -> record, None once removed
+        self._free = []  # ids of removed records, reused first
+        self._live = 0  # bitset of ids holding a record
+        self._by_field = {}
+        self._by_status = {}
+        self._words = {}  # word -> set of ids; sets keep per-word updates cheap
+        self._word_masks = {}  # word -> bitset, built on first query after a change
+        self._deadlines = []  # sorted (ordinal, id)
+        self._entries = {}  # id -> (fields, status, words, ordinal) for cheap removal
+        self._order = {}  # id -> (ordinal or inf, name), the result sort key
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, url):
+        return url in self._ids
+
+    def get(self, url):
+        with self._lock:
+            doc = self._ids.get(url)
+            return None if doc is None else self._records[doc]
+
+    def fields_for(self, url):
+        with self._lock:
+            doc = self._ids.get(url)
+            return set(self._entries[doc][0]) if doc is not None else set()
+
+    @staticmethod
+    def _set_bit(table, key, doc):
+        table[key] = table.get(key, 0) | (1 << doc)
+
+    @staticmethod
+    def _clear_bit(table, key, doc):
+        mask = table.get(key, 0) & ~(1 << doc)
+        if mask:
+            table[key] = mask
+        else:
+            table.pop(key, None)
+
+    def _unindex(self, doc):
+        fields, status, words, ordinal = self._entries.pop(doc)
+        del self._order[doc]
+        for field in fields:
+            self._clear_bit(self._by_field, field, doc)
+        self._clear_bit(self._by_status, status, doc)
+        for word in words:
+            self._word_masks.pop(word, None)
+            postings = self._words[word]
+            postings.discard(doc)
+            if not postings:
+                del self._words[word]
+        if ordinal is not None:
+            del self._deadlines[bisect.bisect_left(self._deadlines, (ordinal, doc))]
+        return fields
+
+    def _index(self, doc, record, fields):
+        status = record['status'].lower()
+        words = tokenize(record['name']) | tokenize(record.get('details'))
+        if isinstance(record, BursaryRecord):
+            ordinal = record.deadline or None
+        else:
+            deadline = closing_date_to_date(record.get('closing_date'))
+            ordinal = deadline.toordinal() if deadline else None
+        for field in fields:
+            self._set_bit(self._by_field, field, doc)
+        self._set_bit(self._by_status, status, doc)
+        for word in words:
+            self._words.setdefault(word, set()).add(doc)
+            self._word_masks.pop(word, None)
+        if ordinal is not None:
+            bisect.insort(self._deadlines, (ordinal, doc))
+        self._entries[doc] = (frozenset(fields), status, words, ordinal)
+        self._order[doc] = (ordinal if ordinal is not None else float('inf'), record['name'])
+
+    def upsert(self, record, fields=()):
+        """Add or replace the record for record['url'], adding it to fields."""
+        with self._lock:
+            url = record['url']
+            doc = self._ids.get(url)
+            if doc is None:
+                doc = self._free.pop() if self._free else len(self._records)
+                if doc == len(self._records):
+                    self._records.append(None)
+                self._ids[url] = doc
+                self._live |= 1 << doc
+                previous_fields = frozenset()
+            else:
+                previous_fields = self._unindex(doc)
+            self._records[doc] = record
+            self._index(doc, record, previous_fields | set(fields))
+
+    def records(self):
+        """All indexed records, in id order."""
+        with self._lock:
+            return [record for record in self._records if record is not None]
+
+    def upsert_many(self, records, field=None):
+        fields = (field,) if field else ()
+        with self._lock:
+            for record in records:
+                self.upsert(record, fields)
+
+    def remove(self, url):
+        with self._lock:
+            doc = self._ids.pop(url, None)
+            if doc is None:
+                return False
+            self._unindex(doc)
+            self._records[doc] = None
+            self._live &= ~(1 << doc)
+            self._free.append(doc)
+            return True
+
+    def set_field(self, field, records):
+        """Make records the complete membership of field.
+
+        Records that were filed only under field and are no longer listed
+        are dropped from the index.
+        """
+        with self._lock:
+            urls = set()
+            for record in records:
+                self.upsert(record, (field,))
+                urls.add(record['url'])
+            for doc in list(iter_bits(self._by_field.get(field, 0))):
+                record = self._records[doc]
+                if record['url'] in urls:
+                    continue
+                fields = self._entries[doc][0] - {field}
+                if fields:
+                    self._unindex(doc)
+                    self._index(doc, record, fields)
+                else:
+                    self.remove(record['url'])
+
+    def _word_mask(self, word):
+        mask = self._word_masks.get(word)
+        if mask is None:
+            mask = self._word_masks[word] = to_mask(self._words.get(word, ()), len(self._records))
+        return mask
+
+    def _deadline_mask(self, after, before):
+        lo = bisect.bisect_left(self._deadlines, (after.toordinal(),)) if after else 0
+        hi = (bisect.bisect_left(self._deadlines, (before.toordinal() + 1,)) if before
+              else len(self._deadlines))
+        return to_mask((doc for _, doc in self._deadlines[lo:hi]), len(self._records))
+
+    def query(self, fields=None, all_fields=False, status=None, closing_after=None,
+              closing_before=None, within_days=None, text=None, limit=None):
+        """Return records matching every given condition.
+
+        fields matches records filed under any of them (all of them with
+        all_fields=True). within_days restricts to deadlines from today up to
+        that many days ahead. text matches records whose name or requirements
+        contain every word. Results are ordered by deadline (undated last),
+        then name.
+        """
+        if within_days is not None:
+            closing_after = max(closing_after or date.today(), date.today())
+            end = date.today() + timedelta(days=within_days)
+            closing_before = min(closing_before, end) if closing_before else end
+
+        with self._lock:
+            mask = self._live
+            if fields:
+                masks = [self._by_field.get(field, 0) for field in fields]
+                combined = masks[0]
+                for other in masks[1:]:
+                    combined = combined & other if all_fields else combined | other
+                mask &= combined
+            if status:
+                mask &= self._by_status.get(status.lower(), 0)
+            for word in tokenize(text):
+                mask &= self._word_mask(word)
+                if not mask:
+                    break
+            if mask and (closing_after or closing_before):
+                mask &= self._deadline_mask(closing_after, closing_before)
+            if not mask:
+                return []
+
+            if limit:
+                docs = heapq.nsmallest(limit, iter_bits(mask), key=self._order.__getitem__)
+            else:
+                docs = sorted(iter_bits(mask), key=self._order.__getitem__)
+            return [self._records[doc] for doc in docs]
+
+    @classmethod
+    def from_store(cls, store, fields, include_expired=True):
+        """Build an index from a BursaryStore, filing records under fields."""
+        index = cls()
+        for field in fields:
+            index.upsert_many(store.load(category=field, include_expired=include_expired), field)
+        return index
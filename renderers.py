@@ -0,0 +1,386 @@
+"""Render bursary records into several output formats in one pass.
+
+render() walks the records once, drops repeated URLs, turns each
+record into a plain row and hands the row to every writer. All writers
+share one small interface (open, write(row), close), so a report run can
+produce PDF, CSV, JSON Lines, HTML and Parquet files and the console
+summary from the same pass. ReportLab, pyarrow and rich are only imported
+by the writers that need them.
+"""
+import csv
+import importlib.util
+import json
+import logging
+import os
+import queue
+import threading
+from datetime import datetime
+from html import escape
+
+from closing_dates import parse_deadline
+
+
+ROW_FIELDS = ('name', 'url', 'status', 'closing_date', 'closing_on', 'schedule',
+              'last_updated', 'details')
+
+logger = logging.getLogger(__name__)
+
+
+def report_row(record):
+    """The flat, JSON-ready row every writer receives."""
+    deadline = parse_deadline(record['closing_date'])
+    closes_on = deadline.closes_on()
+    last_updated = record.get('last_updated')
+    if isinstance(last_updated, datetime):
+        last_updated = last_updated.isoformat()
+    return {
+        'name': record['name'],
+        'url': record['url'],
+        'status': record['status'],
+        'closing_date': record['closing_date'],
+        'closing_on': closes_on.isoformat() if closes_on else None,
+        'schedule': deadline.schedule,
+        'last_updated': last_updated,
+        'details': record.get('details'),
+    }
+
+
+def _remove_partial(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def output_filename(label, fmt):
+    """e.g. ('Computer Science & IT', 'csv') -> 'computer_science_&_it_bursaries_report.csv'."""
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown output format: {fmt}")
+    return f"{label.lower().replace(' ', '_')}_bursaries_report.{WRITERS[fmt].extension}"
+
+
+class Writer:
+    """Base writer. target is a path, or an open text stream that is left open."""
+
+    extension = None
+
+    def __init__(self, target, title=''):
+        self.target = target
+        self.title = title
+        self._file = None
+
+    def open(self):
+        if hasattr(self.target, 'write'):
+            self._file = self.target
+        else:
+            self._file = open(self.target, 'w', encoding='utf-8', newline='')
+
+    def write(self, row):
+        raise NotImplementedError
+
+    def close(self):
+        """Finish the output; returns the path written, or None for a stream."""
+        if self._file is not self.target:
+            self._file.close()
+            return self.target
+        self._file.flush()
+        return None
+
+    def abort(self):
+        """Give up after an error: release the output and remove a partial file."""
+        if self._file is not None and self._file is not self.target:
+            self._file.close()
+            _remove_partial(self.target)
+
+
+class TextWriter(Writer):
+    """Tab-separated name, status, closing date and URL."""
+
+    extension = 'txt'
+
+    def write(self, row):
+        self._file.write(f"{row['name']}\t{row['status']}\t"
+                         f"{row['closing_date'] or 'Not specified'}\t{row['url']}\n")
+
+
+class CSVWriter(Writer):
+    extension = 'csv'
+
+    def open(self):
+        super().open()
+        self._csv = csv.DictWriter(self._file, fieldnames=ROW_FIELDS)
+        self._csv.writeheader()
+
+    def write(self, row):
+        self._csv.writerow(row)
+
+
+class JSONLinesWriter(Writer):
+    extension = 'jsonl'
+
+    def write(self, row):
+        self._file.write(json.dumps(row, ensure_ascii=False) + '\n')
+
+
+class JSONWriter(Writer):
+    """A single JSON array, written element by element."""
+
+    extension = 'json'
+
+    def open(self):
+        super().open()
+        self._separator = '[\n'
+
+    def write(self, row):
+        self._file.write(self._separator + json.dumps(row, ensure_ascii=False))
+        self._separator = ',\n'
+
+    def close(self):
+        self._file.write('[]\n' if self._separator == '[\n' else '\n]\n')
+        return super().close()
+
+
+class HTMLWriter(Writer):
+    """A static, self-contained HTML page with one table row per bursary."""
+
+    extension = 'html'
+
+    STYLE = ('body{font-family:sans-serif;margin:2em}table{border-collapse:collapse;width:100%}'
+             'th,td{border:1px solid #999;padding:6px;text-align:left;vertical-align:top}'
+             'th{background:#333;color:#fff}tr:nth-child(even) td{background:#f5f5f5}')
+
+    def open(self):
+        super().open()
+        title = escape(self.title)
+        self._file.write(
+            f'<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>{title}</title>'
+            f'<style>{self.STYLE}</style></head><body>\n<h1>{title}</h1>\n<table>\n'
+            '<tr><th>Bursary Name</th><th>Closing Date</th><th>Status</th><th>Requirements</th></tr>\n'
+        )
+
+    def write(self, row):
+        details = escape(row['details'] or '').replace('\n', '<br>')
+        self._file.write(
+            f'<tr><td><a href="{escape(row["url"])}">{escape(row["name"])}</a></td>'
+            f'<td>{escape(str(row["closing_date"] or "Not specified"))}</td>'
+            f'<td>{escape(row["status"])}</td><td>{details}</td></tr>\n'
+        )
+
+    def close(self):
+        self._file.write('</table>\n</body></html>\n')
+        return super().close()
+
+
+class ParquetWriter(Writer):
+    """Columnar Parquet file written in row groups of batch_size rows (needs pyarrow)."""
+
+    extension = 'parquet'
+
+    def __init__(self, target, title='', batch_size=4096):
+        if not self.available():
+            raise ImportError("pyarrow is required for Parquet output (pip install pyarrow)")
+        if hasattr(target, 'write'):
+            raise ValueError("Parquet output must be written to a file")
+        super().__init__(target, title)
+        self.batch_size = batch_size
+
+    @staticmethod
+    def available():
+        return importlib.util.find_spec('pyarrow') is not None
+
+    def open(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self._pa = pa
+        self._schema = pa.schema([(name, pa.string()) for name in ROW_FIELDS])
+        self._file = pq.ParquetWriter(self.target, self._schema)
+        self._columns = {name: [] for name in ROW_FIELDS}
+
+    def _flush(self):
+        self._file.write_table(self._pa.table(self._columns, schema=self._schema))
+        self._columns = {name: [] for name in ROW_FIELDS}
+
+    def write(self, row):
+        for name in ROW_FIELDS:
+            self._columns[name].append(row[name])
+        if len(self._columns['url']) >= self.batch_size:
+            self._flush()
+
+    def close(self):
+        if self._columns['url']:
+            self._flush()
+        self._file.close()
+        return self.target
+
+
+_END = object()
+_ABORT = object()
+
+
+class PDFWriter(Writer):
+    """The streamed ReportLab report, fed row by row.
+
+    ReportLab pulls flowables as it lays out pages, so the build runs on its
+    own thread and reads rows from a small bounded queue.
+    """
+
+    extension = 'pdf'
+
+    def __init__(self, target, title='', queue_size=256):
+        super().__init__(target, title)
+        self.queue_size = queue_size
+
+    def open(self):
+        from pdf_report import build_pdf_report
+        self._rows = queue.Queue(maxsize=self.queue_size)
+        self._error = None
+
+        def rows():
+            while True:
+                row = self._rows.get()
+                if row is _END:
+                    return
+                if row is _ABORT:
+                    raise RuntimeError("PDF rendering aborted")
+                yield row
+
+        def build():
+            try:
+                build_pdf_report(self.target, self.title, rows())
+            except Exception as e:
+                self._error = e
+
+        self._thread = threading.Thread(target=build, daemon=True)
+        self._thread.start()
+
+    def _put(self, item):
+        while self._thread.is_alive():
+            try:
+                self._rows.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+        raise self._error or RuntimeError("PDF rendering stopped early")
+
+    def write(self, row):
+        self._put(row)
+
+    def close(self):
+        self._put(_END)
+        self._thread.join()
+        if self._error:
+            raise self._error
+        return self.target if not hasattr(self.target, 'write') else None
+
+    def abort(self):
+        # Only this thread puts rows, so once the queue is drained _ABORT fits
+        while True:
+            try:
+                self._rows.get_nowait()
+            except queue.Empty:
+                break
+        self._rows.put(_ABORT)
+        self._thread.join()
+        if not hasattr(self.target, 'write'):
+            _remove_partial(self.target)
+
+
+class ConsoleTableWriter(Writer):
+    """The rich summary table, printed when the pass finishes."""
+
+    def __init__(self, console, title="Open Bursaries Summary"):
+        super().__init__(None, title)
+        self.console = console
+
+    def open(self):
+        from rich.table import Table
+        self._table = Table(title=self.title, show_header=True, header_style="bold magenta")
+        self._table.add_column("Bursary Name", style="cyan", no_wrap=False)
+        self._table.add_column("Closing Date", style="green")
+        self._table.add_column("Status", style="yellow")
+
+    def write(self, row):
+        self._table.add_row(row['name'], row['closing_date'] or 'Not specified', row['status'])
+
+    def close(self):
+        self.console.print("\n[bold]Summary of Open Bursaries[/bold]")
+        self.console.print(self._table)
+        self.console.print(f"\nTotal open bursaries found: [green]{self._table.row_count}[/green]")
+        return None
+
+
+WRITERS = {
+    'pdf': PDFWriter,
+    'csv': CSVWriter,
+    'jsonl': JSONLinesWriter,
+    'json': JSONWriter,
+    'html': HTMLWriter,
+    'parquet': ParquetWriter,
+    'text': TextWriter,
+}
+
+# Formats that can be written to stdout
+TEXT_FORMATS = ('text', 'csv', 'jsonl', 'json', 'html')
+
+
+def make_writer(fmt, target, title=''):
+    """Writer for fmt; raises ValueError for an unknown format and
+    ImportError when its optional dependency is missing."""
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown output format: {fmt}")
+    return WRITERS[fmt](target, title)
+
+
+def render(records, writers):
+    """Stream records once through every writer.
+
+    Repeated URLs are dropped; near-duplicate pages are collapsed earlier,
+    by near_duplicates. A writer that fails is logged, aborted (its partial
+    file removed) and left out; the others carry on. Returns the paths
+    written.
+    """
+    active = []
+    for writer in writers:
+        try:
+            writer.open()
+            active.append(writer)
+        except Exception as e:
+            logger.error(f"Error opening {type(writer).__name__}: {e}")
+
+    def abort(writer):
+        try:
+            writer.abort()
+        except Exception as e:
+            logger.error(f"Error aborting {type(writer).__name__}: {e}")
+
+    seen = set()
+    try:
+        for record in records:
+            if record['url'] in seen:
+                continue
+            seen.add(record['url'])
+            row = report_row(record)
+            for writer in list(active):
+                try:
+                    writer.write(row)
+                except Exception as e:
+                    logger.error(f"Error writing with {type(writer).__name__}: {e}")
+                    active.remove(writer)
+                    abort(writer)
+    except BaseException:
+        # The records could not be read to the end: no output is complete
+        for writer in active:
+            abort(writer)
+        raise
+
+    paths = []
+    for writer in active:
+        try:
+            path = writer.close()
+        except Exception as e:
+            logger.error(f"Error finishing {type(writer).__name__}: {e}")
+            abort(writer)
+            continue
+        if path:
+            paths.append(path)
+    return paths
@@ -0,0 +1,283 @@
+"""Long-running service mode: scheduled refresh plus a JSON query API.
+
+One BursaryReportGenerator stays warm for the life of the process. A
+background thread re-crawls every field on a schedule (incrementally, so
+unchanged bursaries come from the record store), and queries are answered
+from an in-memory BursaryIndex without touching the network.
+
+    python bursary_checker.py --serve --port 8080 --refresh-hours 6
+
+    GET  /health
+    GET  /fields
+    GET  /bursaries?field=Engineering&status=Open&closing_after=2025-03-01&closing_before=2025-06-30&q=eskom
+    GET  /bursaries?field=Engineering,Postgraduate&match=all&within_days=14&q=matric
+    GET  /report?field=Engineering          PDF rendered from the snapshot
+    POST /refresh[?field=Law]               start a refresh now
+"""
+import http.server
+import io
+import json
+import os
+import threading
+import time
+from datetime import date, datetime
+from urllib.parse import parse_qs, urlparse
+
+from rich.console import Console
+
+from closing_dates import parse_deadline
+from bursary_record import RecordColumns, new_bullet_pool
+from record_index import BursaryIndex
+
+
+class BursaryService:
+    """Keep crawled bursaries in memory and refresh them in the background."""
+
+    def __init__(self, generator, fields, refresh_interval=6 * 3600, host='127.0.0.1', port=8080,
+                 snapshot_path='bursary_snapshot.bin'):
+        self.generator = generator
+        self.fields = list(fields)
+        self.refresh_interval = refresh_interval
+        self.host = host
+        self.port = port
+        # Columnar copy of the index written after each refresh, for fast restarts
+        self.snapshot_path = snapshot_path
+        self.console = Console()
+        self.logger = generator.logger
+        # Updated in place as refreshes complete; queries never scan every record
+        self.index = BursaryIndex()
+        self._pending_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refresh_requested = threading.Event()
+        self._pending_fields = set()
+        self._stopping = threading.Event()
+        self.last_refresh = None
+        self.httpd = None
+
+    def load_from_store(self):
+        """Fill the index from the record store, including expired records."""
+        self.index = BursaryIndex.from_store(self.generator.store, self.fields)
+        return len(self.index)
+
+    def load_snapshot(self):
+        """Fill the index from the columnar snapshot file."""
+        with open(self.snapshot_path, 'rb') as f:
+            columns = RecordColumns.from_bytes(f.read())
+        index = BursaryIndex()
+        for i in range(len(columns)):
+            fields = [field for field in columns.fields(i) if field in self.fields]
+            if fields:
+                index.upsert(columns.record(i), fields)
+        self.index = index
+        return len(index)
+
+    def save_snapshot(self):
+        """Write the index as RecordColumns, replacing the file atomically."""
+        index = self.index
+        columns = RecordColumns.from_records(
+            index.records(), lambda record: sorted(index.fields_for(record['url'])))
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(columns.to_bytes())
+        os.replace(tmp_path, self.snapshot_path)
+
+    def refresh(self, fields=None):
+        """Re-crawl fields (default: all) and update the index."""
+        fields = list(fields or self.fields)
+        with self._refresh_lock:
+            start = time.time()
+            # Share bullets within this refresh only, so the pool does not
+            # grow for the life of the service
+            new_bullet_pool()
+            try:
+                records_by_field = self.generator.refresh_fields(fields)
+            except Exception as e:
+                self.logger.error(f"Error refreshing {', '.join(fields)}: {e}")
+                return
+            for field, records in records_by_field.items():
+                self.index.set_field(field, records)
+            self.last_refresh = datetime.now()
+            if self.snapshot_path:
+                try:
+                    self.save_snapshot()
+                except Exception as e:
+                    self.logger.error(f"Error writing snapshot: {e}")
+            self.console.print(
+                f"[green]Refreshed {len(records_by_field)} fields, "
+                f"{len(self.index)} bursaries in {time.time() - start:.1f}s"
+            )
+
+    def request_refresh(self, fields=None):
+        with self._pending_lock:
+            self._pending_fields.update(fields or self.fields)
+        self._refresh_requested.set()
+
+    def _refresh_loop(self):
+        while not self._stopping.is_set():
+            self._refresh_requested.wait(self.refresh_interval)
+            if self._stopping.is_set():
+                return
+            self._refresh_requested.clear()
+            with self._pending_lock:
+                fields = [f for f in self.fields if f in self._pending_fields] or self.fields
+                self._pending_fields.clear()
+            self.refresh(fields)
+
+    def query(self, **conditions):
+        """Return matching records as JSON-ready dicts; see BursaryIndex.query."""
+        results = []
+        for record in self.index.query(**conditions):
+            deadline = parse_deadline(record['closing_date'])
+            closes_on = deadline.closes_on()
+            results.append(dict(self._public(record),
+                                fields=sorted(self.index.fields_for(record['url'])),
+                                schedule=deadline.schedule,
+                                closing_on=closes_on.isoformat() if closes_on else None))
+        return results
+
+    @staticmethod
+    def _public(record):
+        return {
+            'name': record['name'],
+            'url': record['url'],
+            'status': record['status'],
+            'closing_date': record['closing_date'],
+            'details': record['details'],
+            'last_updated': record['last_updated'].isoformat()
+            if isinstance(record['last_updated'], datetime) else record['last_updated'],
+        }
+
+    def render_report(self, field=None, **filters):
+        """Render a PDF of matching records from the snapshot; returns bytes."""
+        from pdf_report import build_pdf_report
+        filters.setdefault('status', 'Open')
+        records = self.query(fields=[field] if field else None, **filters)
+        buffer = io.BytesIO()
+        title = f"Open Bursaries Report - {field or 'All Categories'}"
+        build_pdf_report(buffer, title, records)
+        return buffer.getvalue()
+
+    def _handler_class(self):
+        service = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                service.logger.info(f"{self.address_string()} {format % args}")
+
+            def _send(self, status, body, content_type='application/json'):
+                if not isinstance(body, bytes):
+                    body = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _params(self):
+                query = parse_qs(urlparse(self.path).query)
+                fields = [f.strip() for value in query.get('field', []) for f in value.split(',')]
+                unknown = [f for f in fields if f not in service.fields]
+                if unknown:
+                    raise ValueError(f"Unknown field of study: {', '.join(unknown)}")
+
+                def one(name):
+                    return query.get(name, [None])[0]
+
+                def day(name):
+                    return date.fromisoformat(one(name)) if one(name) else None
+
+                return {
+                    'fields': [f for f in fields if f],
+                    'status': one('status'),
+                    'closing_after': day('closing_after'),
+                    'closing_before': day('closing_before'),
+                    'text': one('q'),
+                    'within_days': int(one('within_days')) if one('within_days') else None,
+                    'all_fields': one('match') == 'all',
+                    'limit': int(one('limit')) if one('limit') else None,
+                }
+
+            def do_GET(self):
+                path = urlparse(self.path).path.rstrip('/')
+                try:
+                    if path == '/health':
+                        self._send(200, {
+                            'status': 'ok',
+                            'bursaries': len(service.index),
+                            'last_refresh': service.last_refresh.isoformat()
+                            if service.last_refresh else None,
+                        })
+                    elif path == '/fields':
+                        self._send(200, service.fields)
+                    elif path == '/bursaries':
+                        results = service.query(**self._params())
+                        self._send(200, {'count': len(results), 'bursaries': results})
+                    elif path == '/report':
+                        params = self._params()
+                        fields = params.pop('fields')
+                        if len(fields) > 1:
+                            raise ValueError("A report covers one field or all of them")
+                        pdf = service.render_report(fields[0] if fields else None, **params)
+                        self._send(200, pdf, 'application/pdf')
+                    else:
+                        self._send(404, {'error': 'not found'})
+                except ValueError as e:
+                    self._send(400, {'error': str(e)})
+                except Exception as e:
+                    service.logger.error(f"Error handling {self.path}: {e}")
+                    self._send(500, {'error': 'internal error'})
+
+            def do_POST(self):
+                path = urlparse(self.path).path.rstrip('/')
+                if path != '/refresh':
+                    self._send(404, {'error': 'not found'})
+                    return
+                try:
+                    fields = self._params()['fields']
+                except ValueError as e:
+                    self._send(400, {'error': str(e)})
+                    return
+                service.request_refresh(fields)
+                self._send(202, {'refreshing': fields or service.fields})
+
+        return Handler
+
+    def serve_forever(self, refresh_on_start=None):
+        """Load the snapshot, start the refresh thread and serve until interrupted.
+
+        refresh_on_start defaults to True when the store had no records.
+        """
+        loaded = None
+        if self.snapshot_path and os.path.exists(self.snapshot_path):
+            try:
+                loaded = self.load_snapshot()
+                self.console.print(f"Loaded [green]{loaded}[/green] bursaries from {self.snapshot_path}")
+            except Exception as e:
+                self.logger.error(f"Error reading snapshot, falling back to the store: {e}")
+        if loaded is None:
+            loaded = self.load_from_store()
+            self.console.print(f"Loaded [green]{loaded}[/green] bursaries from the store")
+        if refresh_on_start is None:
+            refresh_on_start = not loaded
+        if refresh_on_start:
+            self.request_refresh()
+
+        refresher = threading.Thread(target=self._refresh_loop, daemon=True)
+        refresher.start()
+        self.httpd = http.server.ThreadingHTTPServer((self.host, self.port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.console.print(f"Serving bursaries at [cyan]http://{self.host}:{self.httpd.server_address[1]}")
+        try:
+            self.httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self):
+        self._stopping.set()
+        self._refresh_requested.set()
+        if self.httpd:
+            self.httpd.server_close()
@@ -0,0 +1,136 @@
+"""Response cache shared by several checker processes.
+
+Several checkers (one per field, or on several machines behind the same
+egress) can point at one cache directory. SharedResponseCache extends the
+on-disk HTTPResponseCache so they cooperate instead of racing:
+
+- entries are written atomically (see http_cache.write_atomic);
+- every body is kept, not only those with validators, and a body fetched
+  less than fresh_for seconds ago is used without any request;
+- before fetching a URL a worker takes a lease on it. A worker that finds
+  the URL leased waits for the holder to store the body instead of
+  downloading it again. Leases expire after lease_ttl seconds, so the URLs
+  of a worker that died are picked up by the others.
+
+Lease files are created and removed under an exclusive lock on
+leases.lock. For workers that do not share a filesystem, cache_server
+serves the same cache over HTTP.
+"""
+import hashlib
+import json
+import os
+import socket
+import time
+import uuid
+from contextlib import contextmanager
+
+from http_cache import HTTPResponseCache, write_atomic
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def file_lock(path):
+    """Hold an exclusive lock on path (created if missing) across processes."""
+    with open(path, 'a+b') as f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def worker_id():
+    """Identifies this process in leases, e.g. 'host:1234:9f1c2a7e'."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class SharedResponseCache(HTTPResponseCache):
+    """HTTP response cache that processes can share, with per-URL fetch leases."""
+
+    shared = True
+
+    def __init__(self, directory='http_cache', fresh_for=600, lease_ttl=60, owner=None):
+        super().__init__(directory)
+        self.fresh_for = fresh_for
+        self.lease_ttl = lease_ttl
+        self.owner = owner or worker_id()
+        self._lock_path = os.path.join(directory, 'leases.lock')
+
+    def store(self, url, body, headers):
+        """Keep every body, with or without validators, for the other workers."""
+        self._write_entry(url, body, headers.get('ETag'), headers.get('Last-Modified'))
+
+    def _is_fresh(self, url, max_age=None):
+        entry = self.get(url)
+        max_age = self.fresh_for if max_age is None else max_age
+        return bool(entry) and time.time() - entry.get('fetched_at', 0) <= max_age
+
+    def fresh_body(self, url, max_age=None):
+        """The stored body if it was fetched within max_age (default fresh_for) seconds."""
+        return self.load_body(url) if self._is_fresh(url, max_age) else None
+
+    def _lease_path(self, url):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, key + '.lease')
+
+    def _read_lease(self, url):
+        try:
+            with open(self._lease_path(url), 'r', encoding='utf-8') as f:
+                lease = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return lease if lease.get('expires', 0) > time.time() else None
+
+    def holder(self, url):
+        """The worker holding an unexpired lease on url, or None."""
+        lease = self._read_lease(url)
+        return lease['owner'] if lease else None
+
+    def acquire(self, url, owner=None):
+        """Lease url for fetching.
+
+        False while any worker (even this one) holds the lease, or when a
+        fresh body is already stored; wait() then returns that body.
+        """
+        with file_lock(self._lock_path):
+            if self._read_lease(url) or self._is_fresh(url):
+                return False
+            write_atomic(self._lease_path(url), json.dumps({
+                'owner': owner or self.owner,
+                'expires': time.time() + self.lease_ttl
+            }))
+            return True
+
+    def release(self, url, owner=None):
+        """End a lease taken by owner (default this worker)."""
+        with file_lock(self._lock_path):
+            lease = self._read_lease(url)
+            if lease and lease['owner'] == (owner or self.owner):
+                try:
+                    os.remove(self._lease_path(url))
+                except OSError as e:
+                    self.logger.error(f"Error releasing lease for {url}: {e}")
+
+    def wait(self, url, timeout=None, interval=0.05):
+        """Wait while another worker holds the lease on url.
+
+        Returns the body it stored, or None if the lease ran out (or timeout
+        seconds passed, default lease_ttl) without a fresh body.
+        """
+        deadline = time.monotonic() + (self.lease_ttl if timeout is None else timeout)
+        while self.holder(url) and time.monotonic() < deadline:
+            time.sleep(interval)
+        return self.fresh_body(url)